@@ -0,0 +1,146 @@
+# background_tasks.py
+from PyQt5.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+
+"""
+Esecuzione in background delle operazioni lente (caricamento del WordNet, costruzione
+della rete) su un QThreadPool, con i risultati restituiti al thread della GUI tramite segnali.
+
+Le operazioni sono raggruppate per tipo: una nuova richiesta dello stesso tipo annulla
+quella precedente, il cui risultato viene scartato.
+
+Il pool è privato: il pool globale di Qt è usato anche da Qt stesso (es. conversione delle
+immagini in setWindowIcon), e con un solo thread un'operazione Python in corso lo
+bloccherebbe mentre il thread della GUI attende quel lavoro.
+"""
+
+# Thread minimi del pool, anche sulle macchine con un solo core: un caricamento lungo
+# non deve impedire l'avvio delle altre operazioni
+MIN_WORKERS = 2
+
+
+class TaskCancelled(Exception):
+    """
+    Sollevata dentro un'operazione annullata, al primo aggiornamento di avanzamento.
+    """
+
+
+class _TaskSignals(QObject):
+    """
+    Segnali emessi dal thread di lavoro e ricevuti (in coda) dal thread della GUI.
+    """
+    progress = pyqtSignal(float)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+
+class _Task(QRunnable):
+    """
+    Operazione eseguita sul QThreadPool. La funzione riceve come unico argomento una
+    callback di avanzamento, che solleva TaskCancelled se l'operazione è stata annullata.
+    """
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.signals = _TaskSignals()
+        self.cancelled = False
+
+    def report_progress(self, fraction):
+        if self.cancelled:
+            raise TaskCancelled()
+        self.signals.progress.emit(fraction)
+
+    def run(self):
+        try:
+            result = self.fn(self.report_progress)
+        except TaskCancelled:
+            return
+        except Exception as e:
+            if not self.cancelled:
+                self.signals.failed.emit(e)
+            return
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+
+class TaskRunner:
+    """
+    Avvia operazioni in background e consegna al thread della GUI solo i risultati
+    dell'ultima richiesta di ciascun tipo.
+    """
+    def __init__(self, pool: QThreadPool = None):
+        """
+        :param pool: QThreadPool da usare (di default uno nuovo, riservato alle operazioni).
+        """
+        if pool is None:
+            pool = QThreadPool()
+            pool.setMaxThreadCount(max(MIN_WORKERS, QThread.idealThreadCount()))
+        self.pool = pool
+        self._latest = {}
+
+    def submit(self, kind: str, fn, on_finished, on_failed=None, on_progress=None):
+        """
+        Avvia un'operazione, annullando quella ancora in corso dello stesso tipo.
+
+        :param kind: Tipo dell'operazione (es. "load", "network").
+        :param fn: Funzione da eseguire in background; riceve la callback di avanzamento.
+        :param on_finished: Chiamata nel thread della GUI con il risultato.
+        :param on_failed: Chiamata nel thread della GUI con l'eccezione sollevata.
+        :param on_progress: Chiamata nel thread della GUI con la frazione completata.
+        """
+        self.cancel(kind)
+        task = _Task(fn)
+        self._latest[kind] = task
+
+        def current():
+            return self._latest.get(kind) is task
+
+        def finished(result):
+            if current():
+                del self._latest[kind]
+                on_finished(result)
+
+        def failed(error):
+            if current():
+                del self._latest[kind]
+                if on_failed is not None:
+                    on_failed(error)
+
+        task.signals.finished.connect(finished)
+        task.signals.failed.connect(failed)
+        if on_progress is not None:
+            task.signals.progress.connect(lambda fraction: current() and on_progress(fraction))
+        self.pool.start(task)
+
+    def is_running(self, kind: str) -> bool:
+        """
+        Indica se c'è un'operazione del tipo indicato ancora in corso.
+        """
+        return kind in self._latest
+
+    def cancel(self, kind: str):
+        """
+        Annulla l'operazione in corso del tipo indicato (il suo risultato verrà scartato).
+        Se non è ancora partita viene tolta dalla coda; altrimenti si ferma al primo
+        aggiornamento di avanzamento.
+        """
+        task = self._latest.pop(kind, None)
+        if task is not None:
+            task.cancelled = True
+            self.pool.tryTake(task)
+
+    def cancel_all(self):
+        """
+        Annulla tutte le operazioni in corso.
+        """
+        for kind in list(self._latest):
+            self.cancel(kind)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """
+        Attende la fine delle operazioni avviate sul pool.
+
+        :param timeout_ms: Attesa massima in millisecondi (-1 = senza limite).
+        :return: True se tutte le operazioni sono terminate.
+        """
+        return self.pool.waitForDone(timeout_ms)
@@ -0,0 +1,206 @@
+# load_test.py
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlsplit, quote
+
+
+"""
+Test di carico del servizio di rete (network_service.py): molti client contemporanei,
+ognuno con la propria connessione keep-alive, richiedono reti di selezioni casuali e
+misurano la latenza di ogni risposta. Alla fine sono riportati i percentili (p50, p90,
+p99), il massimo, le richieste al secondo e gli eventuali errori.
+
+Senza --url il servizio viene avviato in un processo separato su una porta libera.
+
+Esempio (dalla cartella dell'applicazione):
+    python -m benchmarks.load_test --clients 200 --requests 20
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --depth 2 --format json
+"""
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVICE_SCRIPT = os.path.join(APP_DIR, "network_service.py")
+
+DEFAULT_CLIENTS = 200
+DEFAULT_REQUESTS = 20
+# Numero massimo di emozioni in una selezione casuale
+MAX_SELECTION = 3
+
+
+class ServiceClient:
+    """
+    Connessione HTTP/1.1 keep-alive minimale verso il servizio.
+    """
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def get(self, target: str):
+        """
+        Esegue una GET, riaprendo la connessione se il server l'ha chiusa.
+
+        :return: Coppia (stato, corpo).
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(f"GET {target} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode("latin-1"))
+        await self._writer.drain()
+
+        head = (await self._reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split()[1])
+        headers = {}
+        for line in head[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        body = await self._reader.readexactly(int(headers.get("content-length", "0")))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, body
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = self._reader = None
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """
+    Percentile (con il metodo del rango più vicino) di una lista già ordinata.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def random_targets(emotions, n: int, depth: int, fmt: str, rng: random.Random):
+    """
+    Percorsi /network di `n` selezioni casuali di 1-MAX_SELECTION emozioni.
+    """
+    targets = []
+    for _ in range(n):
+        selection = rng.sample(emotions, rng.randint(1, min(MAX_SELECTION, len(emotions))))
+        targets.append(f"/network?emotions={quote(','.join(selection))}&depth={depth}&format={fmt}")
+    return targets
+
+
+async def run_load(host: str, port: int, clients: int, requests: int, depth: int = 1, fmt: str = "html",
+                   seed: int = 0) -> dict:
+    """
+    Esegue il test di carico.
+
+    :param clients: Numero di client contemporanei.
+    :param requests: Richieste per client.
+    :return: Dizionario con latenze (ms), richieste al secondo, errori e stati HTTP.
+    """
+    rng = random.Random(seed)
+    probe = ServiceClient(host, port)
+    status, body = await probe.get("/emotions")
+    await probe.close()
+    if status != 200:
+        raise RuntimeError(f"/emotions ha risposto {status}")
+    emotions = json.loads(body)
+
+    latencies = []
+    statuses = {}
+    errors = []
+
+    async def client_loop(targets):
+        client = ServiceClient(host, port)
+        try:
+            for target in targets:
+                start = time.perf_counter()
+                try:
+                    status, _ = await client.get(target)
+                except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                    errors.append(repr(e))
+                    await client.close()
+                    continue
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            await client.close()
+
+    workloads = [random_targets(emotions, requests, depth, fmt, rng) for _ in range(clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(targets) for targets in workloads))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "first_errors": errors[:5],
+        "statuses": statuses,
+        "elapsed_s": elapsed,
+        "requests_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def start_service(lexicon=None):
+    """
+    Avvia network_service.py su una porta libera.
+
+    :return: Coppia (processo, URL di base).
+    """
+    command = [sys.executable, SERVICE_SCRIPT, "--port", "0"]
+    if lexicon:
+        command += ["--lexicon", lexicon]
+    process = subprocess.Popen(command, cwd=APP_DIR, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Servizio avviato su "):
+        process.kill()
+        raise RuntimeError("Il servizio non si è avviato.")
+    return process, line[len("Servizio avviato su "):].strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test di carico del servizio di rete.")
+    parser.add_argument("--url", default=None, help="URL del servizio (di default ne viene avviato uno).")
+    parser.add_argument("-l", "--lexicon", default=None, help="Lessico del servizio avviato.")
+    parser.add_argument("-c", "--clients", type=int, default=DEFAULT_CLIENTS, help="Client contemporanei.")
+    parser.add_argument("-n", "--requests", type=int, default=DEFAULT_REQUESTS, help="Richieste per client.")
+    parser.add_argument("-d", "--depth", type=int, default=1, help="Profondità delle reti richieste.")
+    parser.add_argument("-f", "--format", default="html", help="Formato delle reti richieste.")
+    parser.add_argument("--seed", type=int, default=0, help="Seme per le selezioni casuali.")
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if url is None:
+        process, url = start_service(args.lexicon)
+    try:
+        parts = urlsplit(url)
+        result = asyncio.run(run_load(parts.hostname, parts.port or 80, args.clients, args.requests,
+                                      args.depth, args.format, args.seed))
+    except (OSError, RuntimeError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(f"{result['requests']} richieste da {args.clients} client in {result['elapsed_s']:.2f} s "
+          f"({result['requests_per_s']:.0f} richieste/s), {result['errors']} errori, stati {result['statuses']}")
+    print(f"latenza p50 {result['p50_ms']:.1f} ms, p90 {result['p90_ms']:.1f} ms, "
+          f"p99 {result['p99_ms']:.1f} ms, max {result['max_ms']:.1f} ms")
+    for error in result["first_errors"]:
+        print(f"  {error}", file=sys.stderr)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+# run_benchmarks.py
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+import random
+import http.client
+import tempfile
+
+from benchmarks.synthetic_lexicon import write_lexicon, lexicon_file_name
+from model.emotion_model import EmotionModel
+from model.lexicon_search import LexiconSearch
+from model.network_builder import build_selected_network, build_details_html, build_subtree_network
+from model.hierarchy import Hierarchy
+from model.layout import compute_layout
+from model.graph_analytics import GraphAnalytics
+from model.search_index import SearchIndex
+from model.snapshot import snapshot_path
+from view.network_html import render_network_html, to_js_literal
+from network_server import NetworkServerManager, PAGE_PATH
+
+
+"""
+Benchmark dei percorsi principali dell'applicazione su lessici sintetici di dimensione
+crescente: caricamento del JSON (in streaming e dallo snapshot), costruzione della rete
+come in `generate_selected_network`, layout, generazione della pagina e dello script di
+aggiornamento incrementale, servizio HTTP di pagina e asset, ricerca sui nodi e sul lessico.
+
+Ogni misura è ripetuta finché non si raggiunge un tempo minimo e se ne riportano mediana e
+minimo. I risultati di ogni esecuzione sono aggiunti a `benchmarks/history.jsonl` e
+confrontati con la mediana delle ultime esecuzioni sulla stessa macchina: le misure più
+lente della soglia sono segnalate come regressioni.
+
+Esempio (dalla cartella dell'applicazione):
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1000,1000000 --fan-out 5 --filter load
+"""
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(APP_DIR, "benchmarks", "history.jsonl")
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Tempo minimo (s) dedicato a ciascuna misura
+MIN_TIME = 0.5
+MAX_ROUNDS = 1000
+# Rallentamento oltre il quale una misura è segnalata (0.2 = 20% più lenta)
+REGRESSION_THRESHOLD = 0.2
+# Numero di esecuzioni precedenti usate come riferimento
+HISTORY_WINDOW = 5
+
+# Asset servito nella misura HTTP (il più grande fra quelli della pagina)
+BENCHMARK_ASSET = "/lib/vis-9.1.2/vis-network.min.js"
+
+
+def time_call(fn, setup=None, min_time: float = MIN_TIME, max_rounds: int = MAX_ROUNDS) -> dict:
+    """
+    Misura `fn` ripetendola finché il tempo totale non supera `min_time` (almeno una volta).
+
+    :param fn: Funzione da misurare; riceve il valore restituito da `setup`, se indicato.
+    :param setup: Funzione eseguita prima di ogni ripetizione, fuori dalla misura.
+    :return: Dizionario con mediana, minimo e media (ms) e numero di ripetizioni.
+    """
+    times = []
+    total = 0.0
+    clock = time.perf_counter
+    while not times or (len(times) < max_rounds and total < min_time):
+        argument = setup() if setup is not None else None
+        start = clock()
+        if setup is not None:
+            fn(argument)
+        else:
+            fn()
+        times.append(clock() - start)
+        total += times[-1]
+    return {
+        "median_ms": statistics.median(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "mean_ms": statistics.fmean(times) * 1000,
+        "rounds": len(times),
+    }
+
+
+def _typo(word: str) -> str:
+    # Sostituisce una lettera centrale, per le ricerche con errori di battitura
+    middle = len(word) // 2
+    return word[:middle] + ("a" if word[middle] != "a" else "e") + word[middle + 1:]
+
+
+def _get(conn, path, headers):
+    conn.request("GET", path, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response
+
+
+def lexicon_cases(path: str, server: NetworkServerManager):
+    """
+    Misure che dipendono dal lessico, nell'ordine in cui sono eseguite.
+
+    :param path: File JSON del lessico sintetico.
+    :param server: Server HTTP avviato, per la misura della pagina.
+    :return: Generatore di coppie (nome della misura, funzione che riceve il tempo minimo
+             e restituisce i risultati di time_call).
+    """
+    def remove_snapshot():
+        if os.path.exists(snapshot_path(path)):
+            os.remove(snapshot_path(path))
+
+    yield "load.stream", lambda min_time: time_call(
+        lambda _: EmotionModel().load_from_json(path), setup=remove_snapshot, min_time=min_time)
+    # L'ultima ripetizione precedente ha scritto lo snapshot
+    yield "load.snapshot", lambda min_time: time_call(
+        lambda: EmotionModel().load_from_json(path), min_time=min_time)
+
+    model = EmotionModel()
+    model.load_from_json(path)
+    emotions = list(model.emotions)
+    selection = emotions[:3]
+    other_selection = emotions[1:4]
+
+    def build(depth):
+        network = build_selected_network(model, selection, depth)
+        build_details_html(model, selection)
+        return network
+
+    yield "build.depth1", lambda min_time: time_call(lambda: build(1), min_time=min_time)
+    yield "build.depth2", lambda min_time: time_call(lambda: build(2), min_time=min_time)
+    yield "build.depth2_incoming", lambda min_time: time_call(
+        lambda: build_selected_network(model, selection, 2, include_incoming=True), min_time=min_time)
+
+    network = build(2)
+    other = build_selected_network(model, other_selection, 2)
+    yield "layout.depth2", lambda min_time: time_call(
+        lambda: compute_layout(tuple(network.nodes), tuple(network.edges)), min_time=min_time)
+    yield "render.html", lambda min_time: time_call(
+        lambda: render_network_html(network.node_list(), network.edge_list(), network.options).encode("utf-8"),
+        min_time=min_time)
+    yield "render.patch", lambda min_time: time_call(
+        lambda: f"window.applyNetworkDiff({to_js_literal(network.diff(other))});", min_time=min_time)
+
+    html = render_network_html(network.node_list(), network.edge_list(), network.options).encode("utf-8")
+
+    def serve_page(conn):
+        # Nuova pagina a ogni ripetizione: include la compressione alla prima richiesta
+        server.set_page(html + b" ")
+        _get(conn, PAGE_PATH, {"Accept-Encoding": "gzip"})
+
+    def serve_page_case(min_time):
+        conn = http.client.HTTPConnection(*server.address)
+        try:
+            return time_call(serve_page, setup=lambda: conn, min_time=min_time)
+        finally:
+            conn.close()
+
+    yield "http.page", serve_page_case
+
+    node_index = SearchIndex(network.nodes)
+    terms = list(network.nodes)
+    queries = [terms[-1], terms[-1][:4], _typo(terms[-1])]
+    yield "search.network_index", lambda min_time: time_call(lambda: SearchIndex(network.nodes), min_time=min_time)
+    yield "search.network_lookup", lambda min_time: time_call(
+        lambda: [node_index.lookup(query) for query in queries], min_time=min_time)
+    yield "search.lexicon_index", lambda min_time: time_call(lambda: LexiconSearch(model.index), min_time=min_time)
+    lexicon_search = model.lexicon_search
+    yield "search.lexicon_related", lambda min_time: time_call(
+        lambda: [lexicon_search.related_emotions(query) for query in queries], min_time=min_time)
+
+    yield "graph.index", lambda min_time: time_call(lambda: GraphAnalytics(model.index), min_time=min_time)
+    analytics = GraphAnalytics(model.index)
+    # Una coppia diversa a ogni ripetizione: i cammini già calcolati sono in cache
+    rng = random.Random(0)
+
+    def pair():
+        return model.index.term(rng.randrange(len(model.index))), model.index.term(rng.randrange(len(model.index)))
+
+    yield "graph.path", lambda min_time: time_call(
+        lambda terms: analytics.shortest_path(*terms), setup=pair, min_time=min_time)
+    yield "graph.path_weighted", lambda min_time: time_call(
+        lambda terms: analytics.shortest_path(*terms, weighted=True), setup=pair, min_time=min_time)
+
+    yield "hierarchy.build", lambda min_time: time_call(lambda: Hierarchy(model.index), min_time=min_time)
+    hierarchy = model.hierarchy
+    yield "hierarchy.subtree", lambda min_time: time_call(
+        lambda: build_subtree_network(model, selection), min_time=min_time)
+    yield "hierarchy.is_a", lambda min_time: time_call(
+        lambda terms: hierarchy.is_a(*terms), setup=pair, min_time=min_time)
+
+
+def asset_cases(server: NetworkServerManager):
+    """
+    Misure indipendenti dal lessico (asset statici serviti dal server).
+    """
+    def serve_case(headers):
+        def case(min_time):
+            conn = http.client.HTTPConnection(*server.address)
+            try:
+                return time_call(lambda: _get(conn, BENCHMARK_ASSET, headers), min_time=min_time)
+            finally:
+                conn.close()
+        return case
+
+    yield "http.asset_gzip", serve_case({"Accept-Encoding": "gzip"})
+    conn = http.client.HTTPConnection(*server.address)
+    try:
+        etag = _get(conn, BENCHMARK_ASSET, {}).getheader("ETag")
+    finally:
+        conn.close()
+    yield "http.asset_not_modified", serve_case({"If-None-Match": etag})
+
+
+def run_suite(sizes, data_dir: str, fan_out: int = 3, min_time: float = MIN_TIME, name_filter: str = ""):
+    """
+    Esegue tutte le misure sui lessici sintetici delle dimensioni indicate.
+
+    :param sizes: Numeri di termini dei lessici.
+    :param data_dir: Cartella in cui generare (o riusare) i lessici.
+    :param fan_out: Termini per tipo di relazione di ogni emozione.
+    :param min_time: Tempo minimo (s) per ciascuna misura.
+    :param name_filter: Se non vuoto, solo le misure il cui nome lo contiene.
+    :return: Dizionario nome della misura ("build.depth2[10000]") -> risultati di time_call.
+    """
+    results = {}
+    server = NetworkServerManager(root=APP_DIR)
+    server.start()
+    try:
+        for name, case in asset_cases(server):
+            if name_filter in name:
+                results[name] = _report(name, case(min_time))
+        for size in sizes:
+            path = write_lexicon(os.path.join(data_dir, lexicon_file_name(size, fan_out)), size, fan_out)
+            for name, case in lexicon_cases(path, server):
+                name = f"{name}[{size}]"
+                if name_filter in name:
+                    results[name] = _report(name, case(min_time))
+    finally:
+        server.stop()
+    return results
+
+
+def _report(name, result):
+    print(f"{name:40s} {result['median_ms']:10.3f} ms  (min {result['min_ms']:.3f}, {result['rounds']} ripetizioni)",
+          flush=True)
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str = HISTORY_PATH):
+    """
+    Legge le esecuzioni precedenti (una per riga), ignorando le righe non valide.
+    """
+    history = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    history.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return history
+
+
+def append_history(record: dict, path: str = HISTORY_PATH):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def find_regressions(results: dict, history, machine: str, threshold: float = REGRESSION_THRESHOLD,
+                     window: int = HISTORY_WINDOW):
+    """
+    Confronta i risultati con la mediana delle ultime `window` esecuzioni sulla stessa macchina.
+
+    :return: Lista di tuple (nome, mediana attuale in ms, riferimento in ms), una per misura
+             più lenta del riferimento di oltre `threshold`.
+    """
+    regressions = []
+    previous = [record for record in history if record.get("machine") == machine]
+    for name, result in results.items():
+        baseline = [record["results"][name]["median_ms"]
+                    for record in previous if name in record.get("results", {})][-window:]
+        if not baseline:
+            continue
+        reference = statistics.median(baseline)
+        if result["median_ms"] > reference * (1 + threshold):
+            regressions.append((name, result["median_ms"], reference))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark di caricamento, reti, pagina, server e ricerca.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Numeri di termini dei lessici sintetici, separati da virgola.")
+    parser.add_argument("--fan-out", type=int, default=3, help="Termini per tipo di relazione di ogni emozione.")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="Tempo minimo per misura (s).")
+    parser.add_argument("--filter", default="", help="Esegue solo le misure il cui nome contiene il testo.")
+    parser.add_argument("--data-dir", default=None,
+                        help="Cartella in cui conservare i lessici generati (di default una temporanea).")
+    parser.add_argument("--history", default=HISTORY_PATH, help="File dello storico dei risultati.")
+    parser.add_argument("--no-save", action="store_true", help="Non aggiunge i risultati allo storico.")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="Rallentamento relativo segnalato come regressione.")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Termina con codice 1 se ci sono regressioni.")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        results = run_suite(sizes, args.data_dir, args.fan_out, args.min_time, args.filter)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = run_suite(sizes, data_dir, args.fan_out, args.min_time, args.filter)
+
+    machine = platform.node()
+    regressions = find_regressions(results, load_history(args.history), machine, args.threshold)
+    for name, current, reference in regressions:
+        print(f"REGRESSIONE {name}: {current:.3f} ms (riferimento {reference:.3f} ms)", file=sys.stderr)
+
+    if not args.no_save:
+        append_history({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "machine": machine,
+            "python": platform.python_version(),
+            "fan_out": args.fan_out,
+            "results": results,
+        }, args.history)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
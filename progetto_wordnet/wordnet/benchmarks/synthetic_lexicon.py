@@ -0,0 +1,88 @@
+# synthetic_lexicon.py
+import os
+import json
+import random
+
+from model.emotion_index import RELATIONS
+
+
+"""
+Generatore di lessici sintetici nel formato di `data/default_wordnet.json`, per misurare
+caricamento, costruzione delle reti e ricerca su lessici molto più grandi di quello reale.
+
+I termini sono parole pronunciabili formate da sillabe (unici e ordinabili, così la ricerca
+per prefisso e con errori di battitura lavora su chiavi realistiche). Una parte dei termini
+è un'emozione con le proprie relazioni: per ogni tipo di relazione si scelgono `fan_out`
+termini, metà dei quali fra le emozioni, così le espansioni su più livelli proseguono.
+Lo stesso seme produce sempre lo stesso lessico.
+"""
+
+_SYLLABLES = (
+    "ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru",
+    "sa", "te", "vi", "zo", "ca", "de", "fi", "go", "lu", "ma",
+    "ne", "pi", "ro", "su", "ta", "ve", "zi", "bo", "cu", "da",
+)
+
+
+def term_name(i: int) -> str:
+    """
+    Termine sintetico di indice `i` (almeno tre sillabe, unico per ogni indice).
+    """
+    base = len(_SYLLABLES)
+    syllables = []
+    while True:
+        i, digit = divmod(i, base)
+        syllables.append(_SYLLABLES[digit])
+        if not i and len(syllables) >= 3:
+            break
+    return "".join(reversed(syllables))
+
+
+def generate_lexicon(n_terms: int, fan_out: int = 3, emotion_ratio: float = 0.1, seed: int = 0) -> dict:
+    """
+    Genera un lessico sintetico.
+
+    :param n_terms: Numero di termini del vocabolario da cui sono prese le relazioni.
+    :param fan_out: Numero di termini per ciascun tipo di relazione di un'emozione.
+    :param emotion_ratio: Frazione dei termini che sono emozioni (con relazioni proprie).
+    :param seed: Seme del generatore casuale.
+    :return: Dizionario {"emozioni": {...}} pronto per essere scritto in JSON.
+    """
+    rng = random.Random(seed)
+    terms = [term_name(i) for i in range(n_terms)]
+    n_emotions = max(1, int(n_terms * emotion_ratio))
+    emotions = {}
+    for i in range(n_emotions):
+        data = {}
+        for relation in RELATIONS:
+            targets = []
+            for j in range(fan_out):
+                pool = n_emotions if j % 2 == 0 else n_terms
+                target = rng.randrange(pool)
+                if target != i:
+                    targets.append(terms[target])
+            data[relation] = targets
+        data["details"] = f"Emozione sintetica numero {i}."
+        emotions[terms[i]] = data
+    return {"emozioni": emotions}
+
+
+def write_lexicon(path: str, n_terms: int, fan_out: int = 3, emotion_ratio: float = 0.1, seed: int = 0) -> str:
+    """
+    Scrive un lessico sintetico in `path`, se non esiste già (la generazione è deterministica).
+
+    :return: Percorso del file.
+    """
+    if not os.path.exists(path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(generate_lexicon(n_terms, fan_out, emotion_ratio, seed), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    return path
+
+
+def lexicon_file_name(n_terms: int, fan_out: int = 3, emotion_ratio: float = 0.1, seed: int = 0) -> str:
+    """
+    Nome del file di un lessico sintetico, che ne identifica i parametri.
+    """
+    return f"synthetic_{n_terms}_f{fan_out}_e{emotion_ratio:g}_s{seed}.json"
@@ -0,0 +1,161 @@
+# check_startup.py
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+
+"""
+Controllo del tempo di avvio dell'applicazione, da eseguire dopo ogni modifica alle
+importazioni di main.py e controller_model.py.
+
+Verifica tre cose, ognuna in un interprete nuovo:
+- il tempo cumulativo di `import main` misurato con `python -X importtime` resta entro
+  il budget;
+- il tempo fino alla prima visualizzazione dello splash screen (avvio dell'interprete,
+  importazioni, tema, creazione e disegno dello splash) resta entro il budget;
+- a splash visibile non sono ancora stati importati i moduli pesanti (FORBIDDEN_MODULES),
+  che devono essere caricati solo alla pressione di "Avvia".
+
+Esempio (dalla cartella dell'applicazione):
+    python check_startup.py
+    python check_startup.py --import-budget-ms 200 --paint-budget-ms 1500
+Il codice di uscita è 1 se uno dei controlli non è superato.
+"""
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Budget di default, con margine rispetto ai tempi misurati su una macchina di sviluppo
+IMPORT_BUDGET_MS = 250
+PAINT_BUDGET_MS = 1500
+
+# Moduli che non devono essere importati prima che lo splash sia visibile
+FORBIDDEN_MODULES = (
+    "PyQt5.QtWebEngineWidgets",
+    "numpy",
+    "http.server",
+    "network_server",
+    "model.layout",
+    "model.entity_index",
+    "view.emotion_view",
+)
+
+# Eseguito nel processo figlio: crea lo splash, lo disegna ed elenca i moduli importati
+_FIRST_PAINT_SCRIPT = """
+import sys
+import main
+app, controller = main.create_app(sys.argv[:1])
+controller.splash_view.repaint()
+app.processEvents()
+print("\\n".join(sorted(sys.modules)))
+controller.close_app()
+"""
+
+
+def _child_env():
+    env = dict(os.environ)
+    # Senza display (es. in CI) si usa la piattaforma Qt senza finestre
+    if not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY") and sys.platform.startswith("linux"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def parse_importtime(output: str):
+    """
+    Legge l'output di `-X importtime`.
+
+    :return: Lista di tuple (modulo, tempo proprio in µs, tempo cumulativo in µs, profondità).
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Riga di intestazione
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def measure_import(module: str = "main"):
+    """
+    Importa `module` in un nuovo interprete con `-X importtime`.
+
+    :return: Tupla (tempo cumulativo in ms, voci di parse_importtime).
+    :raises RuntimeError: Se l'importazione fallisce.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR, env=_child_env(), capture_output=True, text=True,
+    )
+    entries = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} non riuscito:\n{result.stderr[-2000:]}")
+    total = next((cumulative for name, _, cumulative, depth in entries if name == module and depth == 0), 0)
+    return total / 1000, entries
+
+
+def measure_first_paint():
+    """
+    Avvia l'applicazione fino al primo disegno dello splash screen in un nuovo interprete.
+
+    :return: Tupla (tempo in ms dall'avvio del processo, insieme dei moduli importati).
+    :raises RuntimeError: Se l'avvio fallisce.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", _FIRST_PAINT_SCRIPT],
+        cwd=APP_DIR, env=_child_env(), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    # Il tempo è preso alla prima riga stampata, cioè a splash disegnato
+    first_line = process.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000
+    rest, errors = process.communicate()
+    if process.returncode != 0 or not first_line:
+        raise RuntimeError(f"Avvio non riuscito:\n{errors[-2000:]}")
+    return elapsed, set((first_line + rest).split())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Controlla il tempo di avvio dell'applicazione.")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help="Tempo massimo di 'import main' (ms).")
+    parser.add_argument("--paint-budget-ms", type=float, default=PAINT_BUDGET_MS,
+                        help="Tempo massimo fino al disegno dello splash screen (ms).")
+    parser.add_argument("--top", type=int, default=10, help="Numero di importazioni più lente da mostrare.")
+    args = parser.parse_args(argv)
+
+    failures = []
+    try:
+        import_ms, entries = measure_import()
+        paint_ms, modules = measure_first_paint()
+    except RuntimeError as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 1
+
+    print(f"import main: {import_ms:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    for name, _, cumulative, depth in sorted(
+            (entry for entry in entries if entry[3] <= 1), key=lambda entry: -entry[2])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+    print(f"splash disegnato dopo {paint_ms:.0f} ms (budget {args.paint_budget_ms:.0f} ms)")
+
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import main oltre il budget ({import_ms:.1f} > {args.import_budget_ms:.0f} ms)")
+    if paint_ms > args.paint_budget_ms:
+        failures.append(f"splash oltre il budget ({paint_ms:.0f} > {args.paint_budget_ms:.0f} ms)")
+    loaded = [name for name in FORBIDDEN_MODULES if name in modules]
+    if loaded:
+        failures.append(f"moduli importati prima di 'Avvia': {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"NON SUPERATO: {failure}", file=sys.stderr)
+    if not failures:
+        print("Avvio entro i limiti.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
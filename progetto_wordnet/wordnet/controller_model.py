@@ -1,16 +1,22 @@
 # controller_model.py
 import os
-import json
-import threading
-import http.server
-import socketserver
 from PyQt5.QtCore import QUrl
 from PyQt5.QtWidgets import QFileDialog, QMessageBox
 
-from pyvis.network import Network
-
 from view.splash_view import SplashScreenView
-from view.emotion_view import EmotionAppView
+from model.emotion_model import EmotionModel
+from model.network_cache import NetworkCache, network_key
+from model.search_index import SearchIndex
+from background_tasks import TaskRunner
+from instrumentation import tracer, span, traced
+
+# I moduli pesanti (QtWebEngine, NumPy per il layout, server HTTP) non sono importati qui:
+# lo splash screen deve comparire subito. Sono caricati in background alla pressione di
+# "Avvia" (vedi preload_modules) e importati dove servono.
+
+
+# Attesa massima delle operazioni in background alla chiusura
+CLOSE_TIMEOUT_MS = 5000
 
 
 class MainController:
@@ -18,8 +24,6 @@ class MainController:
     Classe principale che funge da controller per l'applicazione. Coordina il modello dei dati
     (EmotionModel) e le viste (SplashScreenView, EmotionAppView).
     """
-    
-    PORT = 8000  # Porta di default per il server HTTP
 
     def __init__(self, app):
         """
@@ -28,14 +32,31 @@ class MainController:
         :param app: Oggetto QApplication per la gestione dell'interfaccia grafica.
         """
         self.app = app
-        self.model = MainController.EmotionModel()
+        self.model = EmotionModel()
         
         # Percorso predefinito al file JSON contenente i dati del WordNet
         self.json_file = os.path.join("data", "default_wordnet.json")
 
-        # Riferimenti per il server HTTP e il suo thread
-        self.http_server = None
-        self.server_thread = None
+        # Server HTTP locale, creato alla prima rete mostrata (vedi la proprietà server)
+        self._server = None
+
+        # Operazioni lente eseguite in background (caricamento, costruzione della rete)
+        self.tasks = TaskRunner()
+        # True se "Avvia" è stato premuto mentre un caricamento era in corso
+        self._start_after_load = False
+        # True se la finestra principale attende la fine del precaricamento dei moduli
+        self._open_after_preload = False
+
+        # Pagina HTML della rete corrente, servita direttamente dalla memoria,
+        # e nodi/archi attualmente mostrati (per gli aggiornamenti incrementali)
+        self.network_html = b""
+        self.current_network = None
+        # Reti già generate, per selezione (svuotata a ogni nuovo caricamento)
+        self.network_cache = NetworkCache()
+        # Indice di ricerca sui nodi della rete corrente
+        self.search_index = SearchIndex()
+        # Sinonimi inglesi delle emozioni (entity.json), caricati alla prima ricerca
+        self._entity_index = None
 
         # Creazione e visualizzazione dello splash screen
         self.splash_view = SplashScreenView(controller=self)
@@ -45,43 +66,54 @@ class MainController:
         self.emotion_view = None
 
 
-    class EmotionModel:
+    # Il modello vive in model/emotion_model.py; il nome resta disponibile anche qui
+    EmotionModel = EmotionModel
+
+
+    @property
+    def server(self):
         """
-        Modello interno per gestire i dati delle emozioni. Carica e memorizza le emozioni 
-        e le loro relazioni a partire da un file JSON.
+        Server HTTP locale, creato al primo utilizzo (associato a una porta effimera al primo avvio).
         """
-        def __init__(self):
-            self.emotions = {}
+        if self._server is None:
+            from network_server import NetworkServerManager
+            self._server = NetworkServerManager()
+        return self._server
 
-        def load_from_json(self, file_path: str):
-            """
-            Carica il file JSON specificato e aggiorna il dizionario delle emozioni.
 
-            :param file_path: Percorso al file JSON contenente i dati delle emozioni.
-            :raises ValueError: Se il file JSON non contiene il formato atteso.
-            """
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                if "emozioni" not in data or not isinstance(data["emozioni"], dict):
-                    raise ValueError("Il file JSON non contiene la chiave 'emozioni' valida.")
-                self.emotions = data["emozioni"]
+    @property
+    def entity_index(self):
+        """
+        Indice dei sinonimi inglesi di entity.json, caricato al primo utilizzo.
+        """
+        if self._entity_index is None:
+            from model.entity_index import load_entity_index
+            self._entity_index = load_entity_index()
+        return self._entity_index
 
 
     def close_app(self):
         """
         Chiude l'applicazione correttamente, interrompendo il server HTTP se attivo.
         """
-    
-        if self.http_server:
-            try:
-                self.http_server.shutdown()      # Interrompe serve_forever()
-                self.http_server.server_close()  # Rilascia la socket
+        self.tasks.cancel_all()
+        # Le operazioni annullate si fermano al primo aggiornamento di avanzamento
+        if not self.tasks.wait(CLOSE_TIMEOUT_MS):
+            print("Operazioni in background ancora in corso alla chiusura.")
+
+        # Trace e profili richiesti con --trace/--profile (vedi main.py)
+        try:
+            for path in tracer.shutdown():
+                print(f"Misure salvate in {path}")
+        except OSError as e:
+            print(f"Impossibile salvare le misure: {e}")
+
+        try:
+            if self._server is not None and self._server.is_running():
+                self._server.stop()
                 print("Server HTTP chiuso correttamente.")
-            except Exception as e:
-                print(f"Si è verificato un errore durante la chiusura del server: {e}")
-            finally:
-                self.http_server = None
+        except Exception as e:
+            print(f"Si è verificato un errore durante la chiusura del server: {e}")
 
         self.app.quit()
 
@@ -102,32 +134,106 @@ class MainController:
         file_name = os.path.normpath(file_name)  # Normalizza il percorso
 
         if file_name:
-            try:
-                self.model.load_from_json(file_name)
-                # Salva il percorso del file caricato
-                self.json_file = file_name
-            except Exception as e:
-                self.splash_view.show_error_message("Errore", f"Il file selezionato non è compatibile:\n{str(e)}")
+            self._load_in_background(file_name)
 
 
     def start_app(self):
         """
         Avvia la finestra principale dell'applicazione e chiude lo splash screen.
+        Se i dati non sono ancora caricati, la finestra viene aperta al termine del
+        caricamento in background.
         """
-        try:
-            # Carica i dati dal file JSON predefinito se non già caricati
-            if not self.model.emotions:
-                self.model.load_from_json(self.json_file)
-        except Exception as e:
-            self.splash_view.show_error_message("Errore", f"Impossibile caricare {self.json_file}:\n{str(e)}")
+        if self.tasks.is_running("load"):
+            self._start_after_load = True
+            self._preload()
+            return
+
+        # Carica i dati dal file JSON predefinito se non già caricati
+        if not self.model.emotions:
+            self._start_after_load = True
+            self._preload()
+            self._load_in_background(self.json_file)
+            return
+
+        self._open_main_window()
+
+
+    def _preload(self):
+        """
+        Importa i moduli della finestra principale su un thread di lavoro mentre si
+        attendono i dati. Con i dati già pronti la finestra viene creata subito e il
+        precaricamento non serve.
+        """
+        if self.emotion_view or self.tasks.is_running("preload"):
+            return
+
+        def done(_):
+            if self._open_after_preload:
+                self._open_after_preload = False
+                self._open_main_window()
+
+        self.tasks.submit("preload", preload_modules, done, done)
+
+
+    def _open_main_window(self):
+        """
+        Crea e visualizza la finestra principale e chiude lo splash screen. Se il
+        precaricamento dei moduli è ancora in corso, la finestra viene creata al suo
+        termine per non importare gli stessi moduli da due thread.
+        """
+        if self.tasks.is_running("preload"):
+            self._open_after_preload = True
             return
 
-        # Crea e visualizza la finestra principale
+        # QtWebEngine va importato nel thread della GUI
+        from view.emotion_view import EmotionAppView
+
         self.emotion_view = EmotionAppView(controller=self, model=self.model)
         self.emotion_view.show()
         self.splash_view.close()
 
 
+    def _load_in_background(self, file_path: str):
+        """
+        Carica un file WordNet in un nuovo modello su un thread di lavoro. Il modello
+        corrente viene sostituito solo se il caricamento va a buon fine; una nuova
+        richiesta di caricamento annulla quella in corso.
+
+        :param file_path: Percorso al file JSON da caricare.
+        """
+        def load(progress):
+            model = EmotionModel()
+            with span("load.json", file=os.path.basename(file_path)) as load_span:
+                model.load_from_json(file_path, progress=progress)
+                load_span.set(emotions=len(model.emotions))
+            with span("load.lexicon_search"):
+                model.lexicon_search  # Indice di ricerca pronto prima di aprire la finestra
+            with span("load.hierarchy"):
+                model.hierarchy  # Chiusura della gerarchia per i sottoalberi
+            return model
+
+        def loaded(model):
+            self.splash_view.hide_progress()
+            self.model = model
+            self.network_cache.clear()
+            # Salva il percorso del file caricato
+            self.json_file = file_path
+            if self._start_after_load:
+                self._start_after_load = False
+                self._open_main_window()
+
+        def failed(error):
+            self.splash_view.hide_progress()
+            self._start_after_load = False
+            if file_path == self.json_file:
+                self.splash_view.show_error_message("Errore", f"Impossibile caricare {file_path}:\n{str(error)}")
+            else:
+                self.splash_view.show_error_message("Errore", f"Il file selezionato non è compatibile:\n{str(error)}")
+
+        self.splash_view.show_progress(0.0)
+        self.tasks.submit("load", load, loaded, failed, self.splash_view.show_progress)
+
+
     def show_info(self):
         """
         Mostra le informazioni sull'applicazione in un messaggio modale.
@@ -141,10 +247,15 @@ class MainController:
         self.splash_view.show_info_message("Informazioni", info_text)
 
 
+    @traced("network.request")
     def generate_selected_network(self):
         """
         Genera una rete interattiva basata sulle emozioni selezionate.
-        La rete è salvata come file HTML e caricata nella vista principale.
+        La pagina HTML della rete è generata in memoria, su un thread di lavoro, e servita
+        dal server HTTP locale alla vista principale, senza passare dal filesystem. Se una
+        rete è già caricata, alla pagina vengono inviate solo le differenze (nodi e archi
+        aggiunti o rimossi). Le reti già generate per la stessa selezione sono riprese
+        dalla cache senza ricalcolo. Una nuova richiesta annulla quella ancora in corso.
 
         Funzionamento:
         - I nodi rappresentano emozioni.
@@ -159,116 +270,127 @@ class MainController:
             self.emotion_view.alert_no_emotions_selected()
             return
 
-        # Creazione della rete utilizzando PyVis
-        net = Network(height="100%", width="100%", directed=False)
-        net.set_options('''{
-            "physics": { "enabled": true },
-            "layout": { "improvedLayout": true },
-            "interaction": { "hover": true }
-        }''')
-
-        # Colori per i vari tipi di relazioni
-        MAIN_COLOR = "#CDB4DB"
-        SYN_COLOR = "#A7C957"
-        ANT_COLOR = "#BF3100"
-        HYPONYM_COLOR = "#F5BB00"
-        HYPERNYM_COLOR = "#1982C4"
-        RELATED_COLOR = "#E2E2E2"
-
-        details_text = "<h2>Dettagli delle emozioni selezionate:</h2><br><br>"
-
-        # Aggiunta di nodi e archi alla rete
-        for emotion in selected_emotions:
-            net.add_node(emotion, label=emotion.capitalize(), color=MAIN_COLOR)
-            emotion_data = self.model.emotions.get(emotion, {})
-            details_text += f"<b>{emotion.capitalize()}:</b> {emotion_data.get('details', 'N/A')}<br><br>"
-
-            # Sinonimi
-            for syn in emotion_data.get("synonyms", []):
-                net.add_node(syn, label=syn.capitalize(), color=MAIN_COLOR)
-                net.add_edge(emotion, syn, color=SYN_COLOR, width=3)
-
-            # Contrari
-            for ant in emotion_data.get("antonyms", []):
-                net.add_node(ant, label=ant.capitalize(), color=MAIN_COLOR)
-                net.add_edge(emotion, ant, color=ANT_COLOR, width=3)
-
-            # Iponimi
-            for hypo in emotion_data.get("hyponyms", []):
-                net.add_node(hypo, label=hypo.capitalize(), color=MAIN_COLOR)
-                net.add_edge(emotion, hypo, color=HYPONYM_COLOR, width=3)
-
-            # Iperonimi
-            for hyper in emotion_data.get("hypernyms", []):
-                net.add_node(hyper, label=hyper.capitalize(), color=MAIN_COLOR)
-                net.add_edge(emotion, hyper, color=HYPERNYM_COLOR, width=3)
-
-            # Relazionati
-            for rel in emotion_data.get("related", []):
-                net.add_node(rel, label=rel.capitalize(), color=MAIN_COLOR)
-                net.add_edge(emotion, rel, color=RELATED_COLOR, width=3)
-
-        # Salva la rete in un file HTML
-        net.save_graph("emotion_network.html")
-
-        # Legge l'HTML generato e lo modifica per l'integrazione con PyQt
-        with open("emotion_network.html", "r", encoding="utf-8") as f:
-            html_content = f.read()
-
-        # Patch (in emotion_view o dove preferisci) per permettere un embedding corretto
-        html_content = self.emotion_view.patch_html_for_javascript_globals(html_content)
-        html_content = html_content.replace("height:600px;", "height:100%;")
-
-        # Stile personalizzato per adattare la rete alla finestra
-        custom_style = """
-        <style>
-        html, body {
-            margin: 0;
-            padding: 0;
-            height: 100vh;
-            overflow: hidden;
-        }
-        #mynetwork {
-            width: 100% !important;
-            height: calc(100vh - 10px) !important;
-            background-color: white;
-        }
-        </style>
-        """
-        html_content = html_content.replace("<head>", "<head>\n" + custom_style + "\n")
-
-        # Riscrive il file HTML con lo stile aggiornato
-        with open("emotion_network.html", "w", encoding="utf-8") as f:
-            f.write(html_content)
-
-        # Handler che non mostra alcun log
-        class QuietHandler(http.server.SimpleHTTPRequestHandler):
-            def log_message(self, format, *args):
-                pass  # Non stampiamo nulla
-
-        def start_http_server():
-            port = self.PORT
-            while True:
-                try:
-                    self.http_server = socketserver.TCPServer(("", port), QuietHandler)
-                    print(f"Server avviato su http://localhost:{port}")
-                    self.PORT = port  # Salva la porta effettivamente usata
-                    break
-                except OSError:
-                    print(f"⚠️ Porta {port} già in uso. Provo la successiva...")
-                    port += 1
-
-            # serve_forever() rimane bloccante finché non viene chiamato shutdown()
-            self.http_server.serve_forever()
-
-
-        # Avvia il server in un thread separato UNA VOLTA SOLA (se non è già in esecuzione)
-        if not self.server_thread or not self.server_thread.is_alive():
-            self.server_thread = threading.Thread(target=start_http_server, daemon=True)
-            self.server_thread.start()
-
-        # Usa l'URL locale con la porta trovata
-        url = QUrl(f"http://localhost:{self.PORT}/emotion_network.html")
+        depth, include_incoming = self.emotion_view.get_expansion_options()
+        model = self.model
+
+        def make(progress):
+            from model.network_builder import build_selected_network, build_details_html
+
+            with span("network.build", depth=depth) as build_span:
+                network = build_selected_network(model, selected_emotions, depth, include_incoming,
+                                                 progress=progress)
+                build_span.set(nodes=len(network.nodes), edges=len(network.edges))
+            details_text = build_details_html(model, selected_emotions)
+            if network.truncated:
+                details_text += (
+                    f"<i>Rete limitata a {len(network.nodes)} nodi e {len(network.edges)} archi: "
+                    "riduci la profondità per vederla completa.</i>"
+                )
+            return network, details_text
+
+        self._submit_network(network_key(model.version, selected_emotions, depth, include_incoming), make)
+
+
+    @traced("network.subtree_request")
+    def show_subtree(self):
+        """
+        Mostra il sottoalbero completo delle emozioni selezionate: tutti i loro iponimi, a
+        ogni livello, con gli archi della gerarchia. I discendenti sono letti dalla chiusura
+        transitiva calcolata al caricamento (vedi model/hierarchy.py), senza visite del grafo.
+        """
+        if not self.emotion_view:
+            return
+
+        selected_emotions = self.emotion_view.get_selected_emotions()
+        if not selected_emotions:
+            self.emotion_view.alert_no_emotions_selected()
+            return
+        model = self.model
+
+        def make(progress):
+            from model.network_builder import build_subtree_network, build_details_html
+
+            with span("network.subtree") as build_span:
+                network = build_subtree_network(model, selected_emotions, progress=progress)
+                build_span.set(nodes=len(network.nodes), edges=len(network.edges))
+            details_text = build_details_html(model, selected_emotions)
+            if network.truncated:
+                details_text += (
+                    f"<i>Sottoalbero limitato a {len(network.nodes)} nodi e {len(network.edges)} archi.</i>"
+                )
+            return network, details_text
+
+        self._submit_network(("subtree", model.version, frozenset(selected_emotions)), make)
+
+
+    def _submit_network(self, key, make):
+        """
+        Mostra la rete associata alla chiave, dalla cache oppure costruendola su un thread
+        di lavoro insieme alla sua pagina HTML. Il modello non viene modificato dopo il
+        caricamento e può essere letto in sicurezza; una nuova richiesta annulla quella in corso.
+
+        :param key: Chiave della rete nella cache delle reti.
+        :param make: Funzione eseguita in background che restituisce (rete, dettagli HTML);
+                     riceve la callback di avanzamento, che interrompe le richieste superate.
+        """
+        # Stessa rete già generata con questo modello: nessun ricalcolo
+        cached = self.network_cache.get(key)
+        if cached is not None:
+            self.tasks.cancel("network")
+            self._show_network(cached)
+            return
+
+        def build(progress):
+            from model.layout import apply_layout
+            from view.network_html import render_network_html
+
+            # La costruzione vale metà dell'avanzamento, disposizione e pagina il resto
+            network, details_text = make(lambda fraction: progress(fraction / 2))
+            progress(0.5)
+            # Reti grandi: posizioni calcolate qui e fisica disattivata nella pagina
+            with span("network.layout"):
+                apply_layout(network)
+            progress(0.9)
+            with span("network.render"):
+                html_content = render_network_html(network.node_list(), network.edge_list(), network.options)
+            result = (network, details_text, SearchIndex(network.nodes), html_content.encode("utf-8"))
+            self.network_cache.put(key, result)
+            return result
+
+        def failed(error):
+            self.emotion_view.set_busy(False)
+            QMessageBox.critical(self.emotion_view, "Errore", f"Impossibile generare la rete:\n{str(error)}")
+
+        self.emotion_view.set_busy(True)
+        self.tasks.submit("network", build, self._show_network, failed, self.emotion_view.set_progress)
+
+
+    @traced("network.show")
+    def _show_network(self, result):
+        """
+        Mostra nella vista la rete costruita in background.
+
+        :param result: Tupla (rete, dettagli HTML, indice di ricerca, pagina HTML).
+        """
+        network, details_text, search_index, network_html = result
+        self.emotion_view.set_busy(False)
+        self.search_index = search_index
+
+        # Pagina già caricata: aggiornamento incrementale senza ricaricare la vista
+        if self.current_network is not None and self.emotion_view.network_ready:
+            self.emotion_view.apply_network_diff(self.current_network.diff(network))
+            self.current_network = network
+            self.emotion_view.set_details_html(details_text)
+            return
+        self.current_network = network
+
+        # Pagina HTML generata in memoria dal template
+        self.network_html = network_html
+        self.server.set_page(self.network_html)
+
+        # Avvia il server UNA VOLTA SOLA: la porta è già associata quando start() ritorna
+        self.server.start()
+        url = QUrl(self.server.url())
 
         # Carica l'HTML nel componente webview dell'interfaccia
         self.emotion_view.load_html_in_view(url)
@@ -277,9 +399,33 @@ class MainController:
         self.emotion_view.set_details_html(details_text)
 
 
+    @traced("search.filter")
+    def filter_emotions(self, text: str):
+        """
+        Filtra la lista delle emozioni con la ricerca sull'intero lessico: restano visibili
+        le emozioni trovate e quelle che hanno fra le relazioni un termine trovato,
+        ignorando maiuscole, accenti ed errori di battitura. I sinonimi inglesi di
+        entity.json (es. "pissed off") mostrano l'emozione corrispondente.
+
+        :param text: Testo inserito nel filtro (vuoto per mostrare tutte le emozioni).
+        """
+        if not self.emotion_view:
+            return
+        if not text.strip():
+            self.emotion_view.show_emotions(None)
+            return
+        emotions = self.entity_index.emotions_for(text, self.model)
+        emotions.extend(self.model.lexicon_search.related_emotions(text))
+        self.emotion_view.show_emotions(emotions)
+
+
+    @traced("search.word")
     def search_word(self):
         """
         Evidenzia il nodo corrispondente alla parola cercata nella rete generata.
+        La ricerca ignora maiuscole e accenti e tollera prefissi ed errori di battitura.
+        Un sinonimo inglese di entity.json assente dalla rete porta al nodo dell'emozione
+        corrispondente (es. "pissed off" -> rabbia).
         """
         if not self.emotion_view:
             return
@@ -295,5 +441,93 @@ class MainController:
             self.emotion_view.alert_no_network()
             return
 
+        # Parola assente: lo dice l'indice Python, senza interrogare la pagina
+        if not self.search_index.lookup(word_to_search):
+            # Sinonimo inglese di un'emozione presente nella rete: si evidenzia quella
+            entity_emotions = self.entity_index.emotions_for(word_to_search, self.model)
+            in_network = [e for e in entity_emotions if self.search_index.exact(e)]
+            if in_network:
+                self.emotion_view.highlight_word_in_view(in_network[0])
+                return
+            # Altrimenti si suggeriscono le emozioni legate alla parola
+            suggestions = entity_emotions + self.model.lexicon_search.related_emotions(word_to_search)
+            self.emotion_view.alert_word_not_found(word_to_search, list(dict.fromkeys(suggestions)))
+            return
+
         # Esegui il codice JavaScript per evidenziare il nodo
         self.emotion_view.highlight_word_in_view(word_to_search)
+
+
+    def find_path(self):
+        """
+        Cerca il percorso minimo fra le due parole indicate nell'intero lessico e lo
+        evidenzia nella rete mostrata, aggiungendo i nodi e gli archi che mancano.
+        Il calcolo avviene su un thread di lavoro con le analisi del grafo del modello
+        (vedi model/graph_analytics.py), costruite una sola volta per lessico caricato.
+        """
+        if not self.emotion_view:
+            return
+
+        source, target, weighted = self.emotion_view.get_path_endpoints()
+        if not source or not target:
+            QMessageBox.warning(self.emotion_view, "Attenzione", "Inserisci le due parole del percorso!")
+            return
+
+        # Il percorso viene mostrato sulla rete: deve essere già stata generata
+        current_url = self.emotion_view.web_view.url().toString()
+        if not current_url.endswith("emotion_network.html") or self.current_network is None:
+            self.emotion_view.alert_no_network()
+            return
+
+        model = self.model
+
+        def compute(progress):
+            # NumPy è importato solo al primo percorso richiesto
+            from model.graph_analytics import analytics_for
+            with span("graph.path", weighted=weighted):
+                return analytics_for(model).shortest_path(source, target, weighted=weighted)
+
+        def found(path):
+            self.emotion_view.set_busy(False)
+            if path is None:
+                self.emotion_view.alert_path_not_found(source, target)
+                return
+            self._show_path(path)
+
+        def failed(error):
+            self.emotion_view.set_busy(False)
+            QMessageBox.information(self.emotion_view, "Info", str(error))
+
+        self.emotion_view.set_busy(True)
+        self.tasks.submit("path", compute, found, failed)
+
+
+    @traced("graph.show_path")
+    def _show_path(self, path):
+        """
+        Aggiunge alla rete mostrata i nodi e gli archi del percorso e lo evidenzia.
+
+        :param path: GraphPath trovato da find_path.
+        """
+        from model.network_builder import add_path_to_network, path_edge_ids, build_path_html
+
+        network = add_path_to_network(self.current_network, path)
+        self.emotion_view.apply_network_diff(self.current_network.diff(network))
+        self.current_network = network
+        self.search_index = SearchIndex(network.nodes)
+        self.emotion_view.highlight_path(path.terms, path_edge_ids(path))
+        self.emotion_view.set_details_html(build_path_html(path))
+
+
+def preload_modules(progress=None):
+    """
+    Importa i moduli necessari alla finestra principale e alla generazione delle reti
+    (NumPy, server HTTP, template della pagina), così che il primo utilizzo non attenda
+    le importazioni. Pensata per essere eseguita su un thread di lavoro.
+
+    :param progress: Callback di avanzamento (non usata, richiesta da TaskRunner).
+    """
+    import model.layout
+    import model.network_builder
+    import view.network_html
+    import network_server
@@ -0,0 +1,165 @@
+# export_network.py
+import os
+import re
+import sys
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from model.emotion_model import EmotionModel
+from model.network_builder import build_selected_network
+from model.layout import apply_layout
+from model.network_export import FORMATS
+
+
+"""
+Esportazione delle reti da riga di comando, senza interfaccia grafica (e senza PyQt5).
+
+Ogni argomento è una selezione di emozioni separate da virgola; "all" indica una rete
+per ciascuna emozione del lessico. Le selezioni sono elaborate in parallelo su un pool
+di processi, ognuno dei quali carica il lessico una sola volta (dallo snapshot, se
+presente).
+
+Esempio (dalla cartella dell'applicazione):
+    python export_network.py gioia,tristezza rabbia --format graphml --out-dir reti
+    python export_network.py all --format json --depth 2 --workers 8
+"""
+
+DEFAULT_LEXICON = os.path.join("data", "default_wordnet.json")
+
+# Modello caricato in ogni processo del pool
+_worker_model = None
+
+
+def parse_selections(arguments, emotions):
+    """
+    Converte gli argomenti in selezioni.
+
+    :param arguments: Argomenti da riga di comando ("gioia,tristezza", "all", ...).
+    :param emotions: Emozioni del lessico, nell'ordine del file.
+    :return: Lista di selezioni (liste di emozioni in minuscolo), senza ripetizioni.
+    :raises ValueError: Se una selezione contiene un'emozione non presente nel lessico.
+    """
+    selections = []
+    for argument in arguments:
+        if argument.strip().lower() == "all":
+            selections.extend([emotion] for emotion in emotions)
+            continue
+        selection = [name.strip().lower() for name in argument.split(",") if name.strip()]
+        unknown = [name for name in selection if name not in emotions]
+        if unknown:
+            raise ValueError(f"Emozioni non presenti nel lessico: {', '.join(unknown)}")
+        if selection:
+            selections.append(selection)
+    return list({tuple(selection): selection for selection in selections}.values())
+
+
+def output_name(selection, depth: int, extension: str) -> str:
+    """
+    Nome del file di una selezione ("gioia-tristezza.json", "gioia_d2.json" se depth > 1).
+    """
+    stem = "-".join(re.sub(r"[^\w]+", "_", emotion) for emotion in selection)
+    if depth > 1:
+        stem += f"_d{depth}"
+    return stem + extension
+
+
+def export_selection(model, selection, fmt: str, out_dir: str, depth: int = 1, include_incoming: bool = False):
+    """
+    Costruisce ed esporta la rete di una selezione.
+
+    :return: Tupla (percorso scritto, numero di nodi, numero di archi).
+    """
+    extension, serialize = FORMATS[fmt]
+    network = build_selected_network(model, selection, depth, include_incoming)
+    apply_layout(network)
+    path = os.path.join(out_dir, output_name(selection, depth, extension))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(serialize(network))
+    return path, len(network.nodes), len(network.edges)
+
+
+def _init_worker(lexicon_path):
+    global _worker_model
+    _worker_model = EmotionModel()
+    _worker_model.load_from_json(lexicon_path)
+
+
+def _export_in_worker(task):
+    selection, fmt, out_dir, depth, include_incoming = task
+    return export_selection(_worker_model, selection, fmt, out_dir, depth, include_incoming)
+
+
+def export_networks(lexicon_path: str, selections, fmt: str = "json", out_dir: str = ".",
+                    depth: int = 1, include_incoming: bool = False, workers: int = None):
+    """
+    Esporta le reti di più selezioni, in parallelo se `workers` > 1.
+
+    :param lexicon_path: Percorso al file JSON del lessico.
+    :param selections: Lista di selezioni (liste di emozioni).
+    :param fmt: Formato di uscita (chiave di FORMATS).
+    :param out_dir: Cartella di destinazione (creata se non esiste).
+    :param depth: Livelli di relazioni da espandere.
+    :param include_incoming: Se seguire anche gli archi entranti.
+    :param workers: Numero di processi (di default il numero di CPU).
+    :return: Generatore di tuple (percorso, nodi, archi) nell'ordine delle selezioni.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(selection, fmt, out_dir, depth, include_incoming) for selection in selections]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) <= 1:
+        _init_worker(lexicon_path)
+        yield from map(_export_in_worker, tasks)
+        return
+
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(lexicon_path,)) as pool:
+        yield from pool.map(_export_in_worker, tasks, chunksize=chunksize)
+
+
+def copy_assets(out_dir: str, root: str = os.path.dirname(os.path.abspath(__file__))):
+    """
+    Copia le librerie JS richieste dalle pagine HTML nella cartella di destinazione.
+    """
+    from network_server import ASSET_DIRS
+    for asset_dir in ASSET_DIRS:
+        source = os.path.join(root, asset_dir)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(out_dir, asset_dir), dirs_exist_ok=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Esporta le reti delle emozioni senza interfaccia grafica.")
+    parser.add_argument("selections", nargs="+",
+                        help="Selezioni di emozioni separate da virgola, oppure 'all' (una rete per emozione).")
+    parser.add_argument("-l", "--lexicon", default=DEFAULT_LEXICON, help="File JSON del lessico.")
+    parser.add_argument("-f", "--format", choices=sorted(FORMATS), default="json", help="Formato di uscita.")
+    parser.add_argument("-o", "--out-dir", default="export", help="Cartella di destinazione.")
+    parser.add_argument("-d", "--depth", type=int, default=1, help="Livelli di relazioni da espandere.")
+    parser.add_argument("--incoming", action="store_true", help="Segue anche gli archi entranti.")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Numero di processi (default: numero di CPU).")
+    parser.add_argument("--with-assets", action="store_true", help="Copia lib/ accanto alle pagine HTML.")
+    args = parser.parse_args(argv)
+
+    model = EmotionModel()
+    try:
+        model.load_from_json(args.lexicon)
+        selections = parse_selections(args.selections, list(model.emotions))
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+
+    count = 0
+    for path, n_nodes, n_edges in export_networks(args.lexicon, selections, args.format, args.out_dir,
+                                                  args.depth, args.incoming, args.workers):
+        count += 1
+        print(f"{path}: {n_nodes} nodi, {n_edges} archi")
+    if args.with_assets and args.format == "html":
+        copy_assets(args.out_dir)
+    print(f"{count} reti esportate in {args.out_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
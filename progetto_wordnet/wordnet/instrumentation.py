@@ -0,0 +1,375 @@
+# instrumentation.py
+import os
+import json
+import functools
+import time
+import threading
+from collections import deque
+
+
+"""
+Misura dei tempi delle fasi principali dell'applicazione (span): caricamento del lessico,
+costruzione, layout e generazione della rete, aggiornamento e caricamento della pagina,
+ricerche e richieste al server HTTP locale.
+
+Le misure sono disattivate di default: span() restituisce allora un contesto vuoto
+condiviso e il costo si riduce a una chiamata di funzione. Una volta attivate (enable(),
+oppure `python main.py --trace FILE`), ogni span registra durata, thread e attributi:
+- come evento del trace in formato Chrome (chrome://tracing, ui.perfetto.dev), scritto
+  su file da write_chrome_trace() o alla chiusura dell'applicazione;
+- in un istogramma per nome, esposto in formato Prometheus da prometheus_text()
+  (endpoint /metrics del server locale).
+
+Modalità di profilazione opzionali (`--profile`):
+- "cpu": cProfile sul thread della GUI, salvato in un file .prof (vedi pstats, snakeviz);
+- "memory": tracemalloc, con la memoria allocata da ogni span fra gli attributi e le
+  righe che allocano di più salvate in un file di testo.
+"""
+
+# Eventi mantenuti per il trace (i più vecchi vengono scartati)
+MAX_EVENTS = 100_000
+# Limiti superiori (in secondi) degli intervalli degli istogrammi
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_MODES = ("cpu", "memory")
+# Righe riportate nel riepilogo di tracemalloc
+MEMORY_TOP_LINES = 30
+
+
+class _NullSpan:
+    """
+    Span che non misura nulla, restituito quando le misure sono disattivate.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+    def end(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """
+    Intervallo di tempo misurato. Si usa come context manager, oppure (per le fasi
+    asincrone, come il caricamento della pagina) si avvia con start_span() e si chiude con end().
+    """
+    __slots__ = ("tracer", "name", "attrs", "start", "memory", "_ended")
+
+    def __init__(self, tracer, name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self._ended = False
+        self.memory = tracer._traced_memory()
+        self.start = time.perf_counter_ns()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.end()
+        return False
+
+    def set(self, **attrs):
+        """
+        Aggiunge attributi allo span (es. numero di nodi, esito della cache).
+        """
+        self.attrs.update(attrs)
+
+    def end(self, **attrs):
+        """
+        Chiude lo span e lo registra (le chiamate successive non hanno effetto).
+        """
+        if self._ended:
+            return
+        self._ended = True
+        end = time.perf_counter_ns()
+        self.attrs.update(attrs)
+        if self.memory is not None:
+            self.attrs["memory_kb"] = round((self.tracer._traced_memory() - self.memory) / 1024, 1)
+        self.tracer._record(self.name, self.start, end - self.start, self.attrs)
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "max", "errors", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.buckets = [0] * len(HISTOGRAM_BUCKETS)
+
+
+class Tracer:
+    """
+    Raccoglie gli span di tutti i thread (le registrazioni sono protette da un lock).
+    """
+    def __init__(self):
+        self.enabled = False
+        self.profile_mode = None
+        # File su cui scrivere trace e profili alla chiusura (None = solo in memoria)
+        self.output_path = None
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=MAX_EVENTS)
+        self._histograms = {}
+        self._thread_names = {}
+        self._origin = time.perf_counter_ns()
+        self._profiler = None
+
+    # --- Attivazione ---
+    def enable(self, output_path: str = None, profile: str = None):
+        """
+        Attiva le misure e, se richiesta, una modalità di profilazione.
+
+        :param output_path: File del trace Chrome scritto da shutdown() (None = nessun file).
+        :param profile: None, "cpu" o "memory".
+        :raises ValueError: Se la modalità di profilazione non esiste.
+        """
+        if profile is not None and profile not in PROFILE_MODES:
+            raise ValueError(f"Modalità di profilazione non valida: {profile}")
+        self.output_path = output_path
+        self.profile_mode = profile
+        if profile == "cpu":
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif profile == "memory":
+            import tracemalloc
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        """
+        Disattiva le misure e la profilazione (i dati raccolti restano disponibili).
+        """
+        self.enabled = False
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.profile_mode == "memory":
+            import tracemalloc
+            tracemalloc.stop()
+
+    def reset(self):
+        """
+        Scarta gli span registrati.
+        """
+        with self._lock:
+            self._events.clear()
+            self._histograms.clear()
+
+    def shutdown(self):
+        """
+        Chiude le misure scrivendo trace e profili sui file configurati.
+
+        :return: Lista dei file scritti.
+        """
+        written = []
+        if not self.enabled:
+            return written
+        if self.output_path:
+            base = os.path.splitext(self.output_path)[0]
+            if self.profile_mode == "cpu":
+                self._profiler.disable()
+                self._profiler.dump_stats(base + ".prof")
+                written.append(base + ".prof")
+            elif self.profile_mode == "memory":
+                _atomic_write(base + ".memory.txt", self.memory_report())
+                written.append(base + ".memory.txt")
+            self.write_chrome_trace(self.output_path)
+            written.append(self.output_path)
+        self.disable()
+        return written
+
+    # --- Span ---
+    def span(self, name: str, **attrs):
+        """
+        Span da usare con `with`. Con le misure disattivate non viene creato nulla.
+
+        :param name: Nome della fase (es. "network.build"); è l'etichetta delle metriche.
+        :param attrs: Attributi registrati nel trace.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attrs)
+
+    start_span = span
+
+    def traced(self, name: str = None):
+        """
+        Decoratore che misura ogni chiamata della funzione in uno span.
+
+        Il wrapper inoltra tutti gli argomenti: un metodo decorato collegato a un segnale
+        Qt che ne passa altri (es. `clicked(checked)`) va collegato tramite una lambda.
+
+        :param name: Nome dello span (di default il nome qualificato della funzione).
+        """
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with Span(self, span_name, {}):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _traced_memory(self):
+        if self.profile_mode != "memory" or not self.enabled:
+            return None
+        import tracemalloc
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+    def _record(self, name, start, duration, attrs):
+        thread = threading.current_thread()
+        seconds = duration / 1e9
+        with self._lock:
+            self._events.append((name, start, duration, thread.ident, attrs))
+            self._thread_names.setdefault(thread.ident, thread.name)
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram()
+            histogram.count += 1
+            histogram.total += seconds
+            histogram.max = max(histogram.max, seconds)
+            if "error" in attrs:
+                histogram.errors += 1
+            for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                if seconds <= bound:
+                    histogram.buckets[i] += 1
+                    break
+
+    # --- Esportazione ---
+    def summary(self) -> dict:
+        """
+        Riepilogo per nome di span: numero, tempo totale, medio e massimo (ms), errori.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "count": h.count,
+                    "total_ms": h.total * 1000,
+                    "mean_ms": h.total * 1000 / h.count,
+                    "max_ms": h.max * 1000,
+                    "errors": h.errors,
+                }
+                for name, h in sorted(self._histograms.items())
+            }
+
+    def chrome_trace(self) -> dict:
+        """
+        Span registrati nel formato JSON dei trace di Chrome (eventi completi "X",
+        tempi in microsecondi dall'avvio), con il riepilogo in `otherData`.
+        """
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+        trace_events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+            for tid, thread_name in thread_names.items()
+        ]
+        for name, start, duration, tid, attrs in events:
+            trace_events.append({
+                "name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid, "tid": tid,
+                "ts": (start - self._origin) / 1000, "dur": duration / 1000,
+                "args": {key: _json_value(value) for key, value in attrs.items()},
+            })
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {"summary": self.summary(), "profile": self.profile_mode},
+        }
+
+    def write_chrome_trace(self, path: str):
+        """
+        Scrive il trace Chrome su file (in modo atomico).
+        """
+        _atomic_write(path, json.dumps(self.chrome_trace(), ensure_ascii=False))
+
+    def prometheus_text(self) -> str:
+        """
+        Metriche nel formato di esposizione testuale di Prometheus: un istogramma delle
+        durate per nome di span, il conteggio degli errori e, in modalità "memory",
+        la memoria allocata corrente e di picco.
+        """
+        lines = [
+            "# HELP emotion_span_duration_seconds Durata delle fasi dell'applicazione.",
+            "# TYPE emotion_span_duration_seconds histogram",
+        ]
+        with self._lock:
+            histograms = sorted((name, h.count, h.total, h.errors, list(h.buckets))
+                                for name, h in self._histograms.items())
+        for name, count, total, _, buckets in histograms:
+            label = _label(name)
+            cumulative = 0
+            for bound, bucket in zip(HISTOGRAM_BUCKETS, buckets):
+                cumulative += bucket
+                lines.append(f'emotion_span_duration_seconds_bucket{{span="{label}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'emotion_span_duration_seconds_bucket{{span="{label}",le="+Inf"}} {count}')
+            lines.append(f'emotion_span_duration_seconds_sum{{span="{label}"}} {total:.9f}')
+            lines.append(f'emotion_span_duration_seconds_count{{span="{label}"}} {count}')
+        lines.append("# HELP emotion_span_errors_total Fasi terminate con un'eccezione.")
+        lines.append("# TYPE emotion_span_errors_total counter")
+        for name, _, _, errors, _ in histograms:
+            lines.append(f'emotion_span_errors_total{{span="{_label(name)}"}} {errors}')
+        lines.append("# HELP emotion_tracing_enabled 1 se le misure sono attive.")
+        lines.append("# TYPE emotion_tracing_enabled gauge")
+        lines.append(f"emotion_tracing_enabled {int(self.enabled)}")
+        if self.profile_mode == "memory" and self.enabled:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                lines.append("# TYPE emotion_traced_memory_bytes gauge")
+                lines.append(f"emotion_traced_memory_bytes {current}")
+                lines.append("# TYPE emotion_traced_memory_peak_bytes gauge")
+                lines.append(f"emotion_traced_memory_peak_bytes {peak}")
+        return "\n".join(lines) + "\n"
+
+    def memory_report(self, limit: int = MEMORY_TOP_LINES) -> str:
+        """
+        Righe di codice che hanno allocato più memoria ancora in uso (modalità "memory").
+        """
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return "tracemalloc non attivo.\n"
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [f"Memoria allocata: {current / 2**20:.1f} MiB (picco {peak / 2**20:.1f} MiB)", ""]
+        for stat in tracemalloc.take_snapshot().statistics("lineno")[:limit]:
+            lines.append(str(stat))
+        return "\n".join(lines) + "\n"
+
+
+def _label(name: str) -> str:
+    return name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _json_value(value):
+    return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+def _atomic_write(path: str, text: str):
+    temporary = path + ".tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temporary, path)
+
+
+# Tracer dell'applicazione, condiviso da controller, vista e server
+tracer = Tracer()
+span = tracer.span
+start_span = tracer.start_span
+traced = tracer.traced
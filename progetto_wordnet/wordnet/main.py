@@ -1,19 +1,69 @@
 # main.py
 import sys
 import os
+from PyQt5.QtCore import Qt, QCoreApplication
 from PyQt5.QtWidgets import QApplication
 from qt_material import apply_stylesheet
 from controller_model import MainController
 
 """
 Main script per avviare l'applicazione.
+
+All'avvio vengono importati solo i moduli necessari allo splash screen: QtWebEngine,
+NumPy e il server HTTP sono caricati alla pressione di "Avvia" (vedi controller_model.py).
+Il tempo di avvio è controllato da check_startup.py.
+
+Opzioni (gli altri argomenti sono passati a Qt):
+    --trace FILE       misura le fasi principali e scrive il trace Chrome alla chiusura
+    --profile MODE     profilazione "cpu" (cProfile) o "memory" (tracemalloc), salvata
+                       accanto al trace
 """
 
-def main():
-    app = QApplication(sys.argv)
-    apply_stylesheet(app, theme="dark_teal.xml")
+THEME = "dark_teal.xml"
+# File del trace usato se è richiesta solo la profilazione
+DEFAULT_TRACE_FILE = "emotion_trace.json"
+
+
+def create_app(argv):
+    """
+    Crea la QApplication, applica il tema e mostra lo splash screen.
+
+    :param argv: Argomenti da riga di comando per la QApplication.
+    :return: Tupla (QApplication, MainController).
+    """
+    # QtWebEngineWidgets è importato dopo la creazione della QApplication:
+    # i contesti OpenGL devono essere condivisi fin dall'inizio
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+    app = QApplication(argv)
+    apply_stylesheet(app, theme=THEME)
 
     controller = MainController(app)
+    return app, controller
+
+
+def parse_options(argv):
+    """
+    Estrae le opzioni di misura dagli argomenti e attiva le misure se richieste.
+
+    :param argv: Argomenti da riga di comando (compreso il nome del programma).
+    :return: Argomenti rimanenti, da passare alla QApplication.
+    """
+    import argparse
+    from instrumentation import tracer, PROFILE_MODES
+
+    parser = argparse.ArgumentParser(description="Emotion Network Visualizer")
+    parser.add_argument("--trace", metavar="FILE", default=None,
+                        help="Misura le fasi principali e scrive il trace Chrome alla chiusura.")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help="Profilazione della CPU (cProfile) o della memoria (tracemalloc).")
+    options, qt_args = parser.parse_known_args(argv[1:])
+    if options.trace or options.profile:
+        tracer.enable(options.trace or DEFAULT_TRACE_FILE, options.profile)
+    return argv[:1] + qt_args
+
+
+def main():
+    app, controller = create_app(parse_options(sys.argv))
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,377 @@
+# dataset_ingest.py
+import os
+import re
+import csv
+import array
+import struct
+import marshal
+import hashlib
+
+
+"""
+Lettura unificata dei dataset CSV di `dataset_DialogFlow`.
+
+I file hanno formati diversi: CSV con intestazione separati da virgola (`Emotion,Text`)
+o da punto e virgola (`Phrase;Sentiment`), file a una colonna con il nome
+dell'etichetta come intestazione (`Depression`) e file senza intestazione, con righe
+vuote, in cui l'etichetta si ricava dal nome del file (`Anxiety_intent_dataset.csv`).
+Il formato di ogni file viene riconosciuto dalle prime righe, le etichette sono
+normalizzate ("Joy" -> "joy", "ansia" -> "anxiety") e le frasi duplicate scartate.
+
+I record sono restituiti a lotti in forma colonnare (RecordBatch): testi concatenati in
+un unico buffer UTF-8 con gli offset di inizio e fine, etichette codificate come indici
+in un dizionario. La stessa forma compatta viene salvata accanto a ogni file (estensione
+`.snapshot`) e riletta finché il file non cambia.
+"""
+
+# Cartella dei dataset, nella radice del repository
+DATASET_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "dataset_DialogFlow"))
+
+# Numero di record per lotto
+BATCH_SIZE = 4096
+
+# Nomi di colonna riconosciuti nelle intestazioni
+TEXT_COLUMNS = ("text", "phrase", "sentence", "utterance")
+LABEL_COLUMNS = ("emotion", "sentiment", "label", "intent")
+
+# Etichette equivalenti ricondotte a un'unica forma
+LABEL_ALIASES = {
+    "ansia": "anxiety",
+    "happiness": "joy",
+    "sad": "sadness",
+}
+
+CACHE_SUFFIX = ".snapshot"
+_MAGIC = b"EWND"
+_FORMAT_VERSION = 2  # 2: testo delle colonne singole letto senza virgolette
+# magic, versione formato, itemsize degli offset, dimensione sorgente, mtime_ns
+_HEADER = struct.Struct("<4sHHQq")
+
+_SPACES = re.compile(r"\s+")
+_SAMPLE_SIZE = 1 << 16
+
+
+def normalize_label(label: str) -> str:
+    """
+    Normalizza un'etichetta: minuscolo, senza spazi esterni e con gli alias risolti.
+    """
+    label = _SPACES.sub(" ", label.strip().lower())
+    return LABEL_ALIASES.get(label, label)
+
+
+def label_from_file_name(path: str) -> str:
+    """
+    Etichetta di un file senza colonna delle etichette, ricavata dal nome
+    ("Suicide_Intent_Phrases.csv" -> "suicide").
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return normalize_label(stem.split("_")[0])
+
+
+def record_key(text: str, label: str) -> int:
+    """
+    Chiave a 64 bit usata per scartare i duplicati: hash del testo (a meno di maiuscole
+    e spazi) e dell'etichetta.
+    """
+    normalized = " ".join(text.split()).casefold() + "\x1f" + label
+    return int.from_bytes(hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class FileFormat:
+    """
+    Formato riconosciuto di un file: delimitatore, presenza dell'intestazione e
+    colonne di testo ed etichetta (label_column None: etichetta fissa `label`).
+    """
+    def __init__(self, delimiter, has_header, text_column, label_column=None, label=None):
+        self.delimiter = delimiter
+        self.has_header = has_header
+        self.text_column = text_column
+        self.label_column = label_column
+        self.label = label
+
+    def __repr__(self):
+        return (f"FileFormat(delimiter={self.delimiter!r}, has_header={self.has_header}, "
+                f"text_column={self.text_column}, label_column={self.label_column}, label={self.label!r})")
+
+
+def sniff_format(path: str):
+    """
+    Riconosce il formato di un file dalle prime righe.
+
+    :param path: Percorso al file CSV.
+    :return: FileFormat, oppure None se il file non contiene frasi etichettate
+             (es. un'intestazione senza colonna di testo).
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        sample = f.read(_SAMPLE_SIZE)
+    lines = [line for line in sample.splitlines() if line.strip()]
+    if not lines:
+        return None
+    first = lines[0]
+
+    # Intestazione con nomi di colonna noti: il delimitatore è quello che li separa
+    try:
+        delimiter = csv.Sniffer().sniff(first, delimiters=",;\t|").delimiter
+    except csv.Error:
+        delimiter = None
+    if delimiter is not None:
+        header = [cell.strip().lower() for cell in next(csv.reader([first], delimiter=delimiter))]
+        text_column = next((i for i, name in enumerate(header) if name in TEXT_COLUMNS), None)
+        label_column = next((i for i, name in enumerate(header) if name in LABEL_COLUMNS), None)
+        if text_column is not None and label_column is not None:
+            return FileFormat(delimiter, True, text_column, label_column)
+        if len(header) > 1 and all(name.isidentifier() for name in header):
+            return None  # Intestazione senza testo ed etichetta (es. meditation.csv)
+
+    # Una sola colonna: la prima riga è l'etichetta se è una sola parola e le altre non lo sono
+    if first.strip().isalpha() and any(" " in line.strip() for line in lines[1:]):
+        return FileFormat(None, True, 0, label=normalize_label(first))
+    return FileFormat(None, False, 0, label=label_from_file_name(path))
+
+
+class RecordBatch:
+    """
+    Lotto di record in forma colonnare: i testi sono concatenati in `data` (UTF-8) e il
+    record i occupa data[offsets[i]:offsets[i + 1]]; `codes[i]` è l'indice della sua
+    etichetta in `label_names` e `keys[i]` la sua chiave di deduplicazione.
+    """
+    def __init__(self, source, label_names, codes, data, offsets, keys):
+        """
+        :param source: Percorso del file di provenienza.
+        :param label_names: Tupla delle etichette.
+        :param codes: array('H') con l'indice dell'etichetta di ogni record.
+        :param data: Buffer con i testi concatenati.
+        :param offsets: array('I') con len(codes) + 1 offset nel buffer.
+        :param keys: array('Q') con la chiave (vedi `record_key`) di ogni record.
+        """
+        self.source = source
+        self.label_names = label_names
+        self.codes = codes
+        self.data = data
+        self.offsets = offsets
+        self.keys = keys
+
+    def __len__(self):
+        return len(self.codes)
+
+    def text(self, i: int) -> str:
+        return self.data[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def texts(self):
+        """
+        Restituisce la lista dei testi del lotto.
+        """
+        start = self.offsets[0]
+        chunk = self.data[start:self.offsets[-1]].decode("utf-8") if self.offsets[-1] > start else ""
+        if chunk.isascii():
+            # Offset in byte e in caratteri coincidono: un solo decode per tutto il lotto
+            bounds = self.offsets
+            return [chunk[bounds[i] - start:bounds[i + 1] - start] for i in range(len(self.codes))]
+        return [self.text(i) for i in range(len(self.codes))]
+
+    def labels(self):
+        """
+        Restituisce la lista delle etichette del lotto.
+        """
+        names = self.label_names
+        return [names[code] for code in self.codes]
+
+    def slice(self, start: int, stop: int):
+        """
+        Sotto-lotto dei record da `start` a `stop` (esclusa), senza copiare il buffer dei testi.
+        """
+        return RecordBatch(self.source, self.label_names, self.codes[start:stop], self.data,
+                           self.offsets[start:stop + 1], self.keys[start:stop])
+
+
+def _parse(path, file_format):
+    """
+    Legge tutti i record di un file nel formato indicato, scartando righe vuote e duplicati.
+
+    :return: RecordBatch con tutti i record del file.
+    """
+    label_ids = {}
+    codes = array.array("H")
+    offsets = array.array("I", [0])
+    keys = array.array("Q")
+    parts = []
+    seen = set()
+    size = 0
+
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if file_format.delimiter is None:
+            # Una sola colonna: le virgole non racchiuse tra virgolette fanno parte del testo
+            rows = ([",".join(row)] for row in csv.reader(f))
+        else:
+            rows = csv.reader(f, delimiter=file_format.delimiter, skipinitialspace=True)
+        if file_format.has_header:
+            next(rows, None)
+
+        for row in rows:
+            if len(row) <= file_format.text_column:
+                continue
+            text = row[file_format.text_column].strip()
+            if file_format.label_column is None:
+                label = file_format.label
+            elif len(row) > file_format.label_column:
+                label = normalize_label(row[file_format.label_column])
+            else:
+                continue
+            if not text or not label:
+                continue
+
+            key = record_key(text, label)
+            if key in seen:
+                continue
+            seen.add(key)
+            keys.append(key)
+
+            encoded = text.encode("utf-8")
+            parts.append(encoded)
+            size += len(encoded)
+            offsets.append(size)
+            codes.append(label_ids.setdefault(label, len(label_ids)))
+
+    return RecordBatch(path, tuple(label_ids), codes, b"".join(parts), offsets, keys)
+
+
+def cache_path(path: str) -> str:
+    """
+    Restituisce il percorso della forma compatta associata a un file CSV.
+    """
+    return path + CACHE_SUFFIX
+
+
+def _load_cached(path, stat):
+    try:
+        with open(cache_path(path), "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+    if len(blob) < _HEADER.size:
+        return None
+    magic, version, itemsize, size, mtime_ns = _HEADER.unpack_from(blob)
+    if (magic != _MAGIC or version != _FORMAT_VERSION or itemsize != array.array("I").itemsize
+            or size != stat.st_size or mtime_ns != stat.st_mtime_ns):
+        return None
+    try:
+        label_names, raw_codes, data, raw_offsets, raw_keys = marshal.loads(memoryview(blob)[_HEADER.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    codes, offsets, keys = array.array("H"), array.array("I"), array.array("Q")
+    codes.frombytes(raw_codes)
+    offsets.frombytes(raw_offsets)
+    keys.frombytes(raw_keys)
+    return RecordBatch(path, label_names, codes, data, offsets, keys)
+
+
+def _save_cached(path, stat, batch):
+    """
+    Scrive la forma compatta in modo atomico; gli errori sono ignorati (è solo una cache).
+    """
+    target = cache_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, array.array("I").itemsize, stat.st_size, stat.st_mtime_ns)
+    payload = marshal.dumps((
+        batch.label_names, batch.codes.tobytes(), batch.data, batch.offsets.tobytes(), batch.keys.tobytes(),
+    ))
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def read_file(path: str, use_cache: bool = True):
+    """
+    Legge tutti i record di un file, dalla forma compatta se ancora valida.
+
+    :param path: Percorso al file CSV.
+    :param use_cache: Se False il file viene sempre riletto (e la cache non viene scritta).
+    :return: RecordBatch con tutti i record, oppure None se il file non contiene frasi etichettate.
+    """
+    stat = os.stat(path)
+    if use_cache:
+        cached = _load_cached(path, stat)
+        if cached is not None:
+            return cached
+
+    file_format = sniff_format(path)
+    if file_format is None:
+        return None
+    batch = _parse(path, file_format)
+    if use_cache:
+        _save_cached(path, stat, batch)
+    return batch
+
+
+def dataset_files(dataset_dir: str = DATASET_DIR):
+    """
+    Restituisce i file CSV di una cartella, in ordine alfabetico.
+    """
+    return [os.path.join(dataset_dir, name) for name in sorted(os.listdir(dataset_dir))
+            if name.lower().endswith(".csv")]
+
+
+def iter_batches(paths=None, batch_size: int = BATCH_SIZE, use_cache: bool = True):
+    """
+    Restituisce i record di più file a lotti, scartando i duplicati anche tra file diversi
+    (stesso testo, a meno di maiuscole e spazi, con la stessa etichetta). I file che non
+    contengono frasi etichettate sono saltati.
+
+    :param paths: Percorsi dei file (di default tutti i CSV di DATASET_DIR).
+    :param batch_size: Numero massimo di record per lotto.
+    :param use_cache: Se usare (e scrivere) la forma compatta dei file.
+    :return: Generatore di RecordBatch.
+    """
+    seen = set()
+    for path in (dataset_files() if paths is None else paths):
+        batch = read_file(path, use_cache)
+        if batch is None or not len(batch):
+            continue
+
+        # Solo i record non già visti in file precedenti
+        if seen.isdisjoint(batch.keys):
+            seen.update(batch.keys)
+        else:
+            keep = [i for i, key in enumerate(batch.keys) if key not in seen]
+            seen.update(batch.keys)
+            batch = _select(batch, keep)
+
+        for start in range(0, len(batch), batch_size):
+            yield batch.slice(start, start + batch_size)
+
+
+def _select(batch, indices):
+    """
+    Nuovo RecordBatch con i soli record indicati.
+    """
+    codes = array.array("H", (batch.codes[i] for i in indices))
+    keys = array.array("Q", (batch.keys[i] for i in indices))
+    offsets = array.array("I", [0])
+    parts = []
+    size = 0
+    for i in indices:
+        part = batch.data[batch.offsets[i]:batch.offsets[i + 1]]
+        parts.append(part)
+        size += len(part)
+        offsets.append(size)
+    return RecordBatch(batch.source, batch.label_names, codes, b"".join(parts), offsets, keys)
+
+
+def load_records(paths=None, use_cache: bool = True):
+    """
+    Legge tutti i record come due liste parallele.
+
+    :return: Coppia (lista dei testi, lista delle etichette normalizzate).
+    """
+    texts, labels = [], []
+    for batch in iter_batches(paths, use_cache=use_cache):
+        texts.extend(batch.texts())
+        labels.extend(batch.labels())
+    return texts, labels
@@ -0,0 +1,346 @@
+# emotion_classifier.py
+import os
+import re
+import csv
+import sys
+import time
+import argparse
+from itertools import repeat
+
+import numpy as np
+
+from model.dataset_ingest import DATASET_DIR, iter_batches
+
+
+"""
+Classificatore testo -> emozione addestrato sui dataset etichettati di `dataset_DialogFlow`.
+
+Le frasi sono rappresentate con feature sparse pesate con l'IDF (parole e coppie di
+parole consecutive, queste ultime con l'hashing trick) e classificate con una regressione
+logistica multinomiale scritta con NumPy. Le etichette dei dataset (in inglese) sono
+ricondotte alle chiavi di EmotionModel tramite LABEL_TO_EMOTION.
+
+La classificazione lavora a lotti: ogni lotto è tokenizzato con un'unica espressione
+regolare sul testo concatenato e il calcolo dei punteggi è vettorizzato sull'intero lotto.
+
+Uso da riga di comando (dalla cartella dell'applicazione):
+    python -m model.emotion_classifier frasi.txt -o etichette.csv
+"""
+
+# File di addestramento (il formato di ciascuno è riconosciuto da model/dataset_ingest.py)
+TRAINING_FILES = ("dataset.csv", "dataset_2.csv", "Anger_Emotion.csv", "Joy_Emotion.csv")
+
+# Etichette dei dataset -> chiavi di EmotionModel (None: nessuna emozione corrispondente)
+LABEL_TO_EMOTION = {
+    "joy": "gioia",
+    "sadness": "tristezza",
+    "fear": "paura",
+    "anger": "rabbia",
+    "surprise": "sorpresa",
+    "disgust": "disgusto",
+    "shame": "vergogna",
+    "love": "amore",
+    "neutral": None,
+}
+
+# Numero di bucket dell'hashing trick per le coppie di parole
+N_BIGRAM_BUCKETS = 1 << 18
+# Frasi elaborate per ogni blocco vettorizzato
+BATCH_SIZE = 16384
+
+# Parole, oppure il separatore tra le frasi di un lotto
+_TOKEN = re.compile(r"\w+(?:'\w+)*|\n")
+_SEPARATOR = -1
+
+
+def load_training_data(dataset_dir: str = DATASET_DIR):
+    """
+    Legge le frasi etichettate dai file di addestramento.
+
+    :param dataset_dir: Cartella che contiene i file CSV.
+    :return: Coppia (lista di frasi, lista di etichette normalizzate), senza duplicati.
+    """
+    texts, labels = [], []
+    for batch in iter_batches([os.path.join(dataset_dir, name) for name in TRAINING_FILES]):
+        for text, label in zip(batch.texts(), batch.labels()):
+            if label in LABEL_TO_EMOTION:
+                texts.append(text)
+                labels.append(label)
+    return texts, labels
+
+
+def _tokenize_batch(texts):
+    """
+    Tokenizza un lotto di frasi con un'unica scansione del testo concatenato: il
+    separatore "\n" precede ogni frase e ne marca l'inizio.
+    """
+    joined = "\n" + "\n".join(texts)
+    if joined.count("\n") != len(texts):
+        joined = "\n" + "\n".join(text.replace("\n", " ") for text in texts)
+    return _TOKEN.findall(joined.lower())
+
+
+class EmotionClassifier:
+    """
+    Regressione logistica multinomiale su feature sparse pesate con l'IDF.
+
+    Le feature sono le parole del vocabolario di addestramento (le parole mai viste sono
+    ignorate) e le coppie di parole consecutive, proiettate con l'hashing trick su
+    N_BIGRAM_BUCKETS bucket. Le coppie sono calcolate in modo vettorizzato dagli id
+    delle parole, senza costruire stringhe.
+    """
+    def __init__(self):
+        self.labels = []
+        self._vocabulary = {"\n": _SEPARATOR}
+        # Pesi per feature (già moltiplicati per l'IDF), bias e IDF al quadrato per la norma;
+        # la feature 0 (parola sconosciuta) ha peso nullo
+        self._weights = np.zeros((1, 0), dtype=np.float32)
+        self._bias = np.zeros(0, dtype=np.float32)
+        self._idf2 = np.zeros(1, dtype=np.float32)
+
+    @property
+    def n_words(self) -> int:
+        return len(self._vocabulary) - 1
+
+    def _encode(self, texts):
+        """
+        Converte un lotto di frasi nelle loro feature.
+
+        :return: Tripla (feature delle parole, feature delle coppie, indice di inizio di
+                 ogni frase). I due array di feature sono allineati: ogni frase inizia
+                 con la feature 0, così nessuna è vuota.
+        """
+        tokens = _tokenize_batch(texts)
+        words = np.fromiter(map(self._vocabulary.get, tokens, repeat(0)), dtype=np.int64, count=len(tokens))
+        starts = np.flatnonzero(words == _SEPARATOR)
+        words[starts] = 0
+
+        following = np.zeros_like(words)
+        following[:-1] = words[1:]
+        pairs = np.where(
+            (words > 0) & (following > 0),
+            self.n_words + 1 + ((words * 1000003) ^ following) % N_BIGRAM_BUCKETS,
+            0,
+        )
+        return words, pairs, starts
+
+    def fit(self, texts, labels, epochs: int = 15, learning_rate: float = 0.2, l2: float = 1e-6):
+        """
+        Addestra il classificatore.
+
+        :param texts: Frasi di addestramento.
+        :param labels: Etichetta di ogni frase.
+        :param epochs: Numero di passi di discesa del gradiente (sull'intero dataset).
+        :param learning_rate: Passo dell'ottimizzatore (Adam).
+        :param l2: Coefficiente di regolarizzazione dei pesi.
+        :return: Il classificatore stesso.
+        """
+        texts = list(texts)
+        self.labels = sorted(set(labels))
+        label_ids = {label: i for i, label in enumerate(self.labels)}
+        y = np.array([label_ids[label] for label in labels], dtype=np.intp)
+        n_docs, n_classes = len(texts), len(self.labels)
+
+        self._vocabulary = {"\n": _SEPARATOR}
+        for token in _tokenize_batch(texts):
+            if token not in self._vocabulary:
+                self._vocabulary[token] = len(self._vocabulary)
+        n_features = self.n_words + 1 + N_BIGRAM_BUCKETS
+
+        words, pairs, starts = self._encode(texts)
+        doc_of = np.repeat(np.arange(n_docs), np.diff(np.append(starts, len(words))))
+        features = np.concatenate((words, pairs))
+        feature_doc = np.concatenate((doc_of, doc_of))
+
+        # IDF (frequenza documentale, con smoothing); la feature 0 non pesa
+        document_frequency = np.bincount(
+            np.unique(feature_doc * n_features + features) % n_features, minlength=n_features,
+        )
+        idf = np.log((1.0 + n_docs) / (1.0 + document_frequency)) + 1.0
+        idf[0] = 0.0
+        values = idf[features]
+        norm = np.sqrt(np.bincount(feature_doc, weights=values * values, minlength=n_docs))
+        values = (values / np.maximum(norm, 1e-12)[feature_doc]).astype(np.float32)
+
+        # Solo le feature presenti hanno un peso; ordine per feature per sommare il
+        # gradiente di ciascuna con un solo reduceat
+        used, local = np.unique(features, return_inverse=True)
+        order = np.argsort(local, kind="stable")
+        first = np.searchsorted(local[order], np.arange(len(used)))
+        n_tokens = len(words)
+        local_words, local_pairs = local[:n_tokens], local[n_tokens:]
+        values_words, values_pairs = values[:n_tokens, None], values[n_tokens:, None]
+        sorted_doc, sorted_values = feature_doc[order], values[order, None]
+
+        weights = np.zeros((len(used), n_classes), dtype=np.float32)
+        bias = np.zeros(n_classes, dtype=np.float32)
+        targets = np.zeros((n_docs, n_classes), dtype=np.float32)
+        targets[np.arange(n_docs), y] = 1.0
+
+        # Adam sull'intero dataset
+        m_w, v_w = np.zeros_like(weights), np.zeros_like(weights)
+        m_b, v_b = np.zeros_like(bias), np.zeros_like(bias)
+        beta1, beta2 = 0.9, 0.999
+        for step in range(1, epochs + 1):
+            logits = np.add.reduceat(weights[local_words] * values_words, starts)
+            logits += np.add.reduceat(weights[local_pairs] * values_pairs, starts)
+            logits += bias
+            logits -= logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits)
+            probabilities /= probabilities.sum(axis=1, keepdims=True)
+            error = (probabilities - targets) / n_docs
+
+            grad_w = np.add.reduceat(error[sorted_doc] * sorted_values, first)
+            grad_w += l2 * weights
+            grad_b = error.sum(axis=0)
+
+            for param, grad, m, v in ((weights, grad_w, m_w, v_w), (bias, grad_b, m_b, v_b)):
+                m *= beta1
+                m += (1 - beta1) * grad
+                v *= beta2
+                v += (1 - beta2) * grad * grad
+                param -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-8)
+
+        self._weights = np.zeros((n_features, n_classes), dtype=np.float32)
+        self._weights[used] = weights * idf[used, None]
+        self._weights[0] = 0.0
+        self._bias = bias
+        self._idf2 = (idf * idf).astype(np.float32)
+        return self
+
+    def decision_function(self, texts):
+        """
+        Punteggi (logit) di ogni classe per un lotto di frasi.
+
+        :return: Matrice (numero di frasi x numero di etichette).
+        """
+        texts = list(texts)
+        scores = np.empty((len(texts), len(self.labels)), dtype=np.float32)
+        for begin in range(0, len(texts), BATCH_SIZE):
+            words, pairs, starts = self._encode(texts[begin:begin + BATCH_SIZE])
+            norm = np.sqrt(np.add.reduceat(self._idf2[words] + self._idf2[pairs], starts))
+            block = np.add.reduceat(self._weights[words], starts)
+            block += np.add.reduceat(self._weights[pairs], starts)
+            block /= np.maximum(norm, 1e-12)[:, None]
+            scores[begin:begin + len(starts)] = block + self._bias
+        return scores
+
+    def predict_proba(self, texts):
+        """
+        Probabilità di ogni etichetta (colonne nell'ordine di `labels`).
+        """
+        scores = self.decision_function(texts)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, texts):
+        """
+        Etichetta più probabile (in inglese, come nei dataset) per ogni frase.
+        """
+        best = self.decision_function(texts).argmax(axis=1)
+        return [self.labels[i] for i in best]
+
+    def predict_emotions(self, texts):
+        """
+        Chiave di EmotionModel corrispondente all'etichetta predetta per ogni frase
+        (None per le etichette senza emozione corrispondente, es. "neutral").
+        """
+        return [LABEL_TO_EMOTION.get(label) for label in self.predict(texts)]
+
+    def save(self, path: str):
+        """
+        Salva il classificatore addestrato in un file .npz (solo le feature con peso non nullo).
+        """
+        words = sorted(self._vocabulary, key=self._vocabulary.get)[1:]  # Senza il separatore
+        used = np.flatnonzero(np.any(self._weights != 0, axis=1))
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels),
+            words=np.array(words, dtype=str),
+            used=used,
+            weights=self._weights[used],
+            bias=self._bias,
+            idf2=self._idf2,
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Carica un classificatore salvato con `save`.
+        """
+        with np.load(path) as data:
+            classifier = cls()
+            classifier.labels = data["labels"].tolist()
+            classifier._vocabulary.update((word, i) for i, word in enumerate(data["words"].tolist(), 1))
+            classifier._idf2 = data["idf2"]
+            classifier._weights = np.zeros((len(classifier._idf2), len(classifier.labels)), dtype=np.float32)
+            classifier._weights[data["used"]] = data["weights"]
+            classifier._bias = data["bias"]
+        return classifier
+
+
+def train_default(dataset_dir: str = DATASET_DIR) -> EmotionClassifier:
+    """
+    Addestra un classificatore sui file di addestramento di `dataset_dir`.
+    """
+    texts, labels = load_training_data(dataset_dir)
+    return EmotionClassifier().fit(texts, labels)
+
+
+def _read_lines(path):
+    """
+    Legge le frasi da etichettare (una per riga, righe vuote escluse); "-" indica lo standard input.
+    """
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        return [line.strip() for line in f if line.strip()]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def main(argv=None):
+    """
+    Etichetta in blocco le frasi di uno o più file, scrivendo un CSV con
+    frase, etichetta, emozione (chiave di EmotionModel) e probabilità.
+    """
+    parser = argparse.ArgumentParser(description="Etichetta frasi con l'emozione prevalente.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="File di testo, una frase per riga ('-' = stdin).")
+    parser.add_argument("-o", "--output", help="File CSV di destinazione (default: stdout).")
+    parser.add_argument("-m", "--model", help="Classificatore salvato (.npz); se non esiste viene addestrato e salvato.")
+    parser.add_argument("--dataset-dir", default=DATASET_DIR, help="Cartella dei dataset di addestramento.")
+    args = parser.parse_args(argv)
+
+    if args.model and os.path.exists(args.model):
+        classifier = EmotionClassifier.load(args.model)
+    else:
+        classifier = train_default(args.dataset_dir)
+        if args.model:
+            classifier.save(args.model)
+
+    texts = [text for path in args.inputs for text in _read_lines(path)]
+    start = time.perf_counter()
+    probabilities = classifier.predict_proba(texts)
+    elapsed = time.perf_counter() - start
+    best = probabilities.argmax(axis=1)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.writer(out)
+        writer.writerow(["text", "label", "emotion", "probability"])
+        for text, i, row in zip(texts, best, probabilities):
+            label = classifier.labels[i]
+            writer.writerow([text, label, LABEL_TO_EMOTION.get(label) or "", f"{row[i]:.3f}"])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if texts:
+        print(f"{len(texts)} frasi classificate in {elapsed:.3f} s "
+              f"({len(texts) / max(elapsed, 1e-9):.0f} frasi/s).", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
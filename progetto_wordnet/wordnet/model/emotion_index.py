@@ -0,0 +1,284 @@
+# emotion_index.py
+from array import array
+
+
+# Tipi di relazione presenti nel WordNet, nell'ordine in cui vengono indicizzati
+RELATIONS = ("synonyms", "antonyms", "hyponyms", "hypernyms", "related")
+
+
+class EmotionIndex:
+    """
+    Indice compilato delle emozioni e delle loro relazioni.
+
+    Ogni termine (emozione o destinazione di una relazione) viene internato con un id
+    intero: le emozioni occupano gli id 0..n_emotions-1 nell'ordine del file, gli altri
+    termini seguono. Per ogni tipo di relazione le adiacenze sono memorizzate in formato
+    CSR (array di offset + array di destinazioni), sia in avanti sia all'indietro,
+    così vicini, archi entranti e gradi si ottengono in O(1)/O(k).
+    """
+
+    def __init__(self, terms, n_emotions, forward, backward):
+        """
+        Inizializza l'indice a partire da strutture già compilate.
+        Usare `from_emotions` per costruirlo da un dizionario di emozioni.
+
+        :param terms: Lista dei termini internati (id -> termine).
+        :param n_emotions: Numero di emozioni (i primi `n_emotions` id).
+        :param forward: Dizionario relazione -> (offsets, targets) degli archi uscenti.
+        :param backward: Dizionario relazione -> (offsets, sources) degli archi entranti.
+        """
+        self.terms = terms
+        self.n_emotions = n_emotions
+        self.ids = {term: i for i, term in enumerate(terms)}
+        self._forward = forward
+        self._backward = backward
+        # Viste senza copia sugli array delle destinazioni
+        self._forward_views = {r: memoryview(t) for r, (_, t) in forward.items()}
+        self._backward_views = {r: memoryview(s) for r, (_, s) in backward.items()}
+
+    @classmethod
+    def from_emotions(cls, emotions: dict):
+        """
+        Costruisce l'indice dal dizionario delle emozioni caricato dal JSON.
+
+        :param emotions: Dizionario emozione -> dati (liste di relazioni e dettagli).
+        :return: Nuova istanza di EmotionIndex.
+        """
+        builder = EmotionIndexBuilder()
+        for name, data in emotions.items():
+            builder.add(name, data)
+        return builder.build()
+
+    def to_state(self):
+        """
+        Restituisce lo stato compilato dell'indice in forma serializzabile
+        (solo tipi primitivi), usato dagli snapshot su disco.
+
+        :return: Tupla (terms, n_emotions, forward, backward) con gli array come bytes.
+        """
+        forward = {r: (o.tobytes(), t.tobytes()) for r, (o, t) in self._forward.items()}
+        backward = {r: (o.tobytes(), s.tobytes()) for r, (o, s) in self._backward.items()}
+        return self.terms, self.n_emotions, forward, backward
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Ricostruisce l'indice da uno stato prodotto da `to_state`, senza ricompilarlo.
+
+        :param state: Tupla (terms, n_emotions, forward, backward).
+        :return: Nuova istanza di EmotionIndex.
+        """
+        terms, n_emotions, forward, backward = state
+        return cls(
+            terms,
+            n_emotions,
+            {r: (_array_from_bytes(o), _array_from_bytes(t)) for r, (o, t) in forward.items()},
+            {r: (_array_from_bytes(o), _array_from_bytes(s)) for r, (o, s) in backward.items()},
+        )
+
+    # --- Interrogazioni ---
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return term in self.ids
+
+    def id_of(self, term: str):
+        """
+        Restituisce l'id del termine, oppure None se non è presente.
+        """
+        return self.ids.get(term)
+
+    def term(self, node_id: int) -> str:
+        """
+        Restituisce il termine associato all'id.
+        """
+        return self.terms[node_id]
+
+    def is_emotion(self, node_id: int) -> bool:
+        """
+        Indica se l'id corrisponde a un'emozione (e non solo a una destinazione).
+        """
+        return node_id < self.n_emotions
+
+    def neighbours(self, node_id: int, relation: str):
+        """
+        Restituisce gli id delle destinazioni degli archi uscenti di un tipo di relazione.
+
+        :param node_id: Id del nodo sorgente.
+        :param relation: Uno dei tipi in RELATIONS.
+        :return: memoryview (senza copia) sugli id delle destinazioni.
+        """
+        offsets = self._forward[relation][0]
+        return self._forward_views[relation][offsets[node_id]:offsets[node_id + 1]]
+
+    def predecessors(self, node_id: int, relation: str):
+        """
+        Restituisce gli id delle sorgenti degli archi entranti di un tipo di relazione.
+
+        :param node_id: Id del nodo destinazione.
+        :param relation: Uno dei tipi in RELATIONS.
+        :return: memoryview (senza copia) sugli id delle sorgenti.
+        """
+        offsets = self._backward[relation][0]
+        return self._backward_views[relation][offsets[node_id]:offsets[node_id + 1]]
+
+    def forward_csr(self, relation: str):
+        """
+        Restituisce la rappresentazione CSR degli archi uscenti di un tipo di relazione,
+        per le elaborazioni vettoriali sull'intero grafo (vedi model/graph_analytics.py).
+
+        :param relation: Uno dei tipi in RELATIONS.
+        :return: Coppia (offsets, targets) di array di interi senza segno (da non modificare).
+        """
+        return self._forward[relation]
+
+    def out_edges(self, node_id: int):
+        """
+        Itera su tutti gli archi uscenti del nodo come coppie (relazione, id destinazione).
+        """
+        for relation in RELATIONS:
+            for target in self.neighbours(node_id, relation):
+                yield relation, target
+
+    def in_edges(self, node_id: int):
+        """
+        Itera su tutti gli archi entranti del nodo come coppie (relazione, id sorgente).
+        """
+        for relation in RELATIONS:
+            for source in self.predecessors(node_id, relation):
+                yield relation, source
+
+    def out_degree(self, node_id: int, relation: str = None) -> int:
+        """
+        Grado uscente del nodo, per una relazione o complessivo. O(1) per relazione.
+        """
+        relations = RELATIONS if relation is None else (relation,)
+        degree = 0
+        for r in relations:
+            offsets = self._forward[r][0]
+            degree += offsets[node_id + 1] - offsets[node_id]
+        return degree
+
+    def in_degree(self, node_id: int, relation: str = None) -> int:
+        """
+        Grado entrante del nodo, per una relazione o complessivo. O(1) per relazione.
+        """
+        relations = RELATIONS if relation is None else (relation,)
+        degree = 0
+        for r in relations:
+            offsets = self._backward[r][0]
+            degree += offsets[node_id + 1] - offsets[node_id]
+        return degree
+
+    def edge_count(self, relation: str = None) -> int:
+        """
+        Numero totale di archi, per una relazione o complessivo.
+        """
+        relations = RELATIONS if relation is None else (relation,)
+        return sum(len(self._forward[r][1]) for r in relations)
+
+
+class EmotionIndexBuilder:
+    """
+    Costruisce un EmotionIndex un'emozione alla volta, ad esempio mentre il file
+    viene letto in streaming. Gli archi grezzi sono tenuti in array compatti; gli id
+    sono rinumerati in `build` in modo che le emozioni precedano gli altri termini.
+    """
+    def __init__(self):
+        self._ids = {}
+        self._terms = []
+        self._is_emotion = bytearray()
+        self._emotion_order = array("I")
+        self._edges = {r: (array("I"), array("I")) for r in RELATIONS}
+
+    def __len__(self):
+        return len(self._emotion_order)
+
+    def _intern(self, term):
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = self._ids[term] = len(self._terms)
+            self._terms.append(term)
+            self._is_emotion.append(0)
+        return term_id
+
+    def add(self, name: str, data: dict):
+        """
+        Aggiunge un'emozione e i suoi archi uscenti.
+
+        :param name: Nome dell'emozione.
+        :param data: Dati dell'emozione (liste di relazioni e dettagli).
+        :raises ValueError: Se l'emozione è già stata aggiunta o i dati non sono validi.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"I dati dell'emozione '{name}' non sono un oggetto JSON.")
+        source = self._intern(name)
+        if self._is_emotion[source]:
+            raise ValueError(f"L'emozione '{name}' è presente più volte.")
+        self._is_emotion[source] = 1
+        self._emotion_order.append(source)
+
+        for relation in RELATIONS:
+            sources, targets = self._edges[relation]
+            for target in data.get(relation, ()):
+                sources.append(source)
+                targets.append(self._intern(target))
+
+    def build(self) -> EmotionIndex:
+        """
+        Compila l'indice: emozioni nell'ordine di inserimento, poi gli altri termini
+        nell'ordine in cui sono comparsi. Il builder non è più utilizzabile dopo la chiamata.
+        """
+        n_terms = len(self._terms)
+        order = list(self._emotion_order)
+        order.extend(i for i in range(n_terms) if not self._is_emotion[i])
+        new_ids = array("I", [0]) * n_terms
+        for new_id, old_id in enumerate(order):
+            new_ids[old_id] = new_id
+        terms = [self._terms[old_id] for old_id in order]
+
+        forward = {}
+        backward = {}
+        # Gli archi grezzi vengono liberati relazione per relazione, per contenere il picco di memoria
+        for relation in RELATIONS:
+            sources, targets = self._edges.pop(relation)
+            sources = array("I", (new_ids[s] for s in sources))
+            targets = array("I", (new_ids[t] for t in targets))
+            forward[relation] = _build_csr(n_terms, sources, targets)
+            backward[relation] = _build_csr(n_terms, targets, sources)
+
+        return EmotionIndex(terms, len(self._emotion_order), forward, backward)
+
+
+def _build_csr(n_nodes, sources, targets):
+    """
+    Costruisce una rappresentazione CSR con un counting sort sugli id sorgente,
+    mantenendo l'ordine originale degli archi di ciascun nodo.
+
+    :param n_nodes: Numero totale di nodi.
+    :param sources: Lista degli id sorgente.
+    :param targets: Lista degli id destinazione (parallela a `sources`).
+    :return: Coppia (offsets, targets) di array di interi senza segno.
+    """
+    offsets = array("I", [0]) * (n_nodes + 1)
+    for s in sources:
+        offsets[s + 1] += 1
+    for i in range(n_nodes):
+        offsets[i + 1] += offsets[i]
+
+    cursor = array("I", offsets[:-1])
+    ordered = array("I", [0]) * len(targets)
+    for s, t in zip(sources, targets):
+        ordered[cursor[s]] = t
+        cursor[s] += 1
+    return offsets, ordered
+
+
+def _array_from_bytes(raw):
+    """
+    Converte i bytes di uno snapshot in un array di interi senza segno.
+    """
+    values = array("I")
+    values.frombytes(raw)
+    return values
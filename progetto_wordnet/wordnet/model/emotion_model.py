@@ -0,0 +1,82 @@
+# emotion_model.py
+import os
+import itertools
+
+from model.emotion_index import EmotionIndex, EmotionIndexBuilder
+from model.json_stream import iter_emotions
+from model.snapshot import load_snapshot, save_snapshot, new_hasher
+from model.lexicon_search import LexiconSearch
+from model.hierarchy import Hierarchy
+
+
+"""
+Modello dei dati delle emozioni, indipendente dall'interfaccia grafica: può essere usato
+anche senza PyQt5 (es. dall'esportazione da riga di comando).
+"""
+
+
+class EmotionModel:
+    """
+    Modello per gestire i dati delle emozioni. Carica e memorizza le emozioni 
+    e le loro relazioni a partire da un file JSON, compilandole in un EmotionIndex
+    per interrogare vicini e archi entranti senza scorrere le liste di relazioni.
+    La versione cambia a ogni caricamento ed è usata come parte delle chiavi di cache.
+    """
+    _versions = itertools.count(1)
+
+    def __init__(self):
+        self.emotions = {}
+        self.index = EmotionIndex.from_emotions(self.emotions)
+        self._lexicon_search = None
+        self._hierarchy = None
+        self.version = next(self._versions)
+
+    @property
+    def lexicon_search(self) -> LexiconSearch:
+        """
+        Motore di ricerca sull'intero lessico, costruito alla prima richiesta.
+        """
+        if self._lexicon_search is None or self._lexicon_search.index is not self.index:
+            self._lexicon_search = LexiconSearch(self.index)
+        return self._lexicon_search
+
+    @property
+    def hierarchy(self) -> Hierarchy:
+        """
+        Gerarchia iperonimi/iponimi con la chiusura transitiva, costruita alla prima richiesta
+        (il controller la prepara durante il caricamento, sul thread di lavoro).
+        """
+        if self._hierarchy is None or self._hierarchy.index is not self.index:
+            self._hierarchy = Hierarchy(self.index)
+        return self._hierarchy
+
+    def load_from_json(self, file_path: str, progress=None):
+        """
+        Carica il file JSON specificato e aggiorna il dizionario delle emozioni.
+        Se accanto al file esiste uno snapshot compilato ancora valido, viene usato
+        quello e parsing e validazione vengono saltati. Altrimenti il file è letto in
+        streaming: ogni emozione viene validata e indicizzata appena letta.
+
+        :param file_path: Percorso al file JSON contenente i dati delle emozioni.
+        :param progress: Funzione chiamata con la frazione di file letta (0.0 - 1.0).
+        :raises ValueError: Se il file JSON non contiene il formato atteso.
+        """
+        self.version = next(self._versions)
+        cached = load_snapshot(file_path)
+        if cached is not None:
+            self.emotions, self.index = cached
+            return
+
+        stat = os.stat(file_path)
+        hasher = new_hasher()
+        emotions = {}
+        builder = EmotionIndexBuilder()
+        for name, data in iter_emotions(file_path, on_chunk=hasher.update, progress=progress):
+            builder.add(name, data)
+            emotions[name] = data
+
+        self.index = builder.build()
+        self.emotions = emotions
+
+        # Salva lo snapshot per i prossimi avvii
+        save_snapshot(file_path, stat, hasher.digest(), self.emotions, self.index)
@@ -0,0 +1,140 @@
+# entity_index.py
+import os
+import json
+
+from model.dataset_ingest import DATASET_DIR, normalize_label
+from model.phrase_matcher import ENTITY_FILE, normalize_words
+
+
+"""
+Indice dei sinonimi di `entity.json` per riconoscere le menzioni di emozioni in inglese.
+
+Ogni sinonimo (anche di più parole, es. "pissed off", "gives me the creeps") è indicizzato
+come tupla di parole normalizzate in un dizionario: il testo viene scorso una sola volta e
+in ogni posizione si prova prima il sinonimo più lungo possibile, con una ricerca in tempo
+costante per ciascuna lunghezza. Le categorie (Anger, Disgust, ...) sono ricondotte alle
+emozioni di EmotionModel tramite ENTITY_EMOTIONS.
+"""
+
+ENTITY_PATH = os.path.join(DATASET_DIR, ENTITY_FILE)
+
+# Categorie di entity.json -> emozioni di EmotionModel, in ordine di preferenza
+ENTITY_EMOTIONS = {
+    "anger": ("rabbia",),
+    "disgust": ("disgusto",),
+    "fear": ("paura", "terrore"),
+    "joy": ("gioia", "felicità", "allegria"),
+    "proud": ("orgoglio",),
+    "shame": ("vergogna", "imbarazzo"),
+    "excited": ("entusiasmo", "euforia", "allegria"),
+    "envy": ("invidia", "gelosia"),
+    "sadness": ("tristezza",),
+}
+
+
+class EntityMention:
+    """
+    Menzione di una categoria nel testo: categoria, sinonimo riconosciuto (normalizzato)
+    e posizione in parole della prima e dell'ultima parola più uno.
+    """
+    __slots__ = ("label", "phrase", "start", "end")
+
+    def __init__(self, label, phrase, start, end):
+        self.label = label
+        self.phrase = phrase
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"EntityMention({self.label!r}, {self.phrase!r}, {self.start}, {self.end})"
+
+
+class EntityIndex:
+    """
+    Dizionario tupla di parole -> categoria, con la lunghezza massima dei sinonimi.
+    """
+    def __init__(self, entities=None):
+        """
+        :param entities: Dizionario categoria -> {"synonyms": [...]} nel formato di entity.json.
+        """
+        self._phrases = {}
+        self.max_length = 0
+        for category, data in (entities or {}).items():
+            label = normalize_label(category)
+            for synonym in data.get("synonyms", []):
+                words = tuple(normalize_words(synonym))
+                if words:
+                    # A parità di sinonimo vale la prima categoria in cui compare
+                    self._phrases.setdefault(words, label)
+                    self.max_length = max(self.max_length, len(words))
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def tag(self, text: str):
+        """
+        Riconosce le menzioni nel testo, preferendo in ogni posizione il sinonimo più lungo.
+        Le menzioni restituite non si sovrappongono.
+
+        :return: Lista di EntityMention nell'ordine in cui compaiono.
+        """
+        words = normalize_words(text)
+        phrases = self._phrases
+        mentions = []
+        i = 0
+        while i < len(words):
+            for length in range(min(self.max_length, len(words) - i), 0, -1):
+                key = tuple(words[i:i + length])
+                label = phrases.get(key)
+                if label is not None:
+                    mentions.append(EntityMention(label, " ".join(key), i, i + length))
+                    i += length
+                    break
+            else:
+                i += 1
+        return mentions
+
+    def emotions_for(self, text: str, model):
+        """
+        Emozioni di EmotionModel corrispondenti alle menzioni nel testo (senza ripetizioni,
+        nell'ordine delle menzioni). Per ogni categoria si sceglie la prima emozione di
+        ENTITY_EMOTIONS presente fra le emozioni del modello, altrimenti fra i suoi termini.
+
+        :param text: Testo in inglese (es. "pissed off").
+        :param model: EmotionModel su cui risolvere le categorie.
+        :return: Lista delle chiavi delle emozioni.
+        """
+        emotions = []
+        for mention in self.tag(text):
+            emotion = emotion_for_label(mention.label, model)
+            if emotion is not None and emotion not in emotions:
+                emotions.append(emotion)
+        return emotions
+
+
+def emotion_for_label(label: str, model):
+    """
+    Risolve una categoria di entity.json nell'emozione corrispondente del modello.
+
+    :return: Chiave dell'emozione (o termine del WordNet), oppure None se non presente.
+    """
+    candidates = ENTITY_EMOTIONS.get(label, ())
+    for candidate in candidates:
+        if candidate in model.emotions:
+            return candidate
+    for candidate in candidates:
+        if candidate in model.index:
+            return candidate
+    return None
+
+
+def load_entity_index(path: str = ENTITY_PATH) -> EntityIndex:
+    """
+    Carica l'indice da entity.json. Se il file manca o non è valido l'indice è vuoto:
+    le menzioni in inglese sono solo un aiuto alla ricerca.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return EntityIndex(json.load(f))
+    except (OSError, ValueError, AttributeError):
+        return EntityIndex()
@@ -0,0 +1,578 @@
+# graph_analytics.py
+import os
+import sys
+import argparse
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from model.emotion_index import RELATIONS
+from model.network_cache import NetworkCache
+
+
+"""
+Analisi del grafo delle emozioni: cammini minimi fra due termini, componenti connesse
+e misure di centralità (grado, PageRank, betweenness).
+
+Il grafo è quello dell'EmotionIndex reso non orientato: per ogni relazione "a -> b" esiste
+anche l'arco inverso (con iperonimi e iponimi scambiati), e fra due termini si tiene un solo
+arco, quello della relazione più forte. Nodi e archi sono memorizzati come matrice di
+adiacenza sparsa in formato CSR con array NumPy, così le visite in ampiezza procedono un
+livello alla volta con operazioni vettoriali e le centralità sono prodotti matrice-vettore.
+
+Le analisi sono calcolate una sola volta per versione del modello (vedi analytics_for).
+
+Uso da riga di comando (dalla cartella dell'applicazione):
+    python -m model.graph_analytics --path ansia gioia --weighted
+    python -m model.graph_analytics --central 10 --measure betweenness
+    python -m model.graph_analytics --components
+"""
+
+DEFAULT_LEXICON = os.path.join("data", "default_wordnet.json")
+
+# Costo di un passo per tipo di relazione nei cammini pesati (più basso = legame più stretto)
+RELATION_WEIGHTS = {
+    "synonyms": 1.0,
+    "hypernyms": 1.5,
+    "hyponyms": 1.5,
+    "related": 2.0,
+    "antonyms": 3.0,
+}
+# Relazione letta nel verso opposto dell'arco
+_REVERSE_RELATION = {"hypernyms": "hyponyms", "hyponyms": "hypernyms"}
+
+# Oltre questo numero di nodi la betweenness è stimata da un campione di sorgenti
+EXACT_BETWEENNESS_LIMIT = 2000
+BETWEENNESS_SAMPLES = 256
+MIN_BETWEENNESS_SAMPLES = 16
+# Archi visitati al massimo dalla stima (numero di sorgenti x archi del grafo)
+BETWEENNESS_EDGE_BUDGET = 20_000_000
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-10
+PAGERANK_MAX_ITERATIONS = 200
+
+# Versioni del modello e cammini mantenuti in cache
+ANALYTICS_CACHE_SIZE = 4
+PATH_CACHE_SIZE = 1024
+
+_ROOT = -2
+_UNSEEN = -1
+
+
+class GraphPath:
+    """
+    Cammino fra due termini: termini attraversati, relazione di ogni passo ("b è un
+    <relazione> di a" per il passo a -> b) e costo totale (numero di passi se non pesato).
+    """
+    __slots__ = ("terms", "relations", "cost")
+
+    def __init__(self, terms, relations, cost):
+        self.terms = terms
+        self.relations = relations
+        self.cost = cost
+
+    def __len__(self):
+        return len(self.relations)
+
+    def edges(self):
+        """
+        Restituisce i passi del cammino come tuple (termine, termine successivo, relazione).
+        """
+        return list(zip(self.terms, self.terms[1:], self.relations))
+
+    def __repr__(self):
+        return f"GraphPath({self.terms!r}, {self.relations!r}, {self.cost!r})"
+
+
+class GraphAnalytics:
+    """
+    Grafo non orientato dell'EmotionIndex in formato CSR, con le analisi calcolate su
+    richiesta e memorizzate. L'indice non deve essere modificato dopo la costruzione.
+    """
+    def __init__(self, index):
+        """
+        :param index: EmotionIndex del modello caricato.
+        """
+        self.index = index
+        n = len(index)
+        relation_weights = np.array([RELATION_WEIGHTS[r] for r in RELATIONS])
+        reverse_codes = np.array([RELATIONS.index(_REVERSE_RELATION.get(r, r)) for r in RELATIONS], dtype=np.int8)
+
+        sources, targets, codes = [], [], []
+        for code, relation in enumerate(RELATIONS):
+            offsets, destinations = index.forward_csr(relation)
+            offsets = np.asarray(offsets, dtype=np.int64)
+            sources.append(np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets)))
+            targets.append(np.asarray(destinations, dtype=np.int64))
+            codes.append(np.full(len(destinations), code, dtype=np.int8))
+        sources = np.concatenate(sources) if sources else np.zeros(0, dtype=np.int64)
+        targets = np.concatenate(targets) if targets else np.zeros(0, dtype=np.int64)
+        codes = np.concatenate(codes) if codes else np.zeros(0, dtype=np.int8)
+
+        # Senza anelli; fra due termini resta la relazione più forte, scelta una volta per
+        # coppia (letta dal termine con l'id minore) così i due versi dell'arco concordano
+        keep = sources != targets
+        sources, targets, codes = sources[keep], targets[keep], codes[keep]
+        flip = sources > targets
+        low = np.where(flip, targets, sources)
+        high = np.where(flip, sources, targets)
+        codes = np.where(flip, reverse_codes[codes], codes)
+        keys = low * max(n, 1) + high
+        order = np.lexsort((codes, relation_weights[codes], keys))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[order][1:] != keys[order][:-1]
+        order = order[first]
+        low, high, codes = low[order], high[order], codes[order]
+
+        # Archi in entrambi i versi, ordinati per sorgente e destinazione
+        all_sources = np.concatenate((low, high))
+        all_targets = np.concatenate((high, low))
+        all_codes = np.concatenate((codes, reverse_codes[codes]))
+        order = np.lexsort((all_targets, all_sources))
+
+        self._sources = all_sources[order]
+        self._targets = all_targets[order]
+        self._codes = all_codes[order]
+        # Codice della relazione dell'arco gemello (stessi estremi, verso opposto)
+        self._reverse_codes = reverse_codes
+        self._weights = relation_weights[self._codes]
+        self._degree = np.bincount(self._sources, minlength=n)
+        self._offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(self._degree, out=self._offsets[1:])
+
+        self._results = {}
+        self._lock = threading.Lock()
+        self._paths = NetworkCache(PATH_CACHE_SIZE)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        Numero di archi non orientati del grafo.
+        """
+        return len(self._targets) // 2
+
+    def _memo(self, key, compute):
+        with self._lock:
+            if key in self._results:
+                return self._results[key]
+        value = compute()
+        with self._lock:
+            return self._results.setdefault(key, value)
+
+    def _id(self, term: str) -> int:
+        term_id = self.index.id_of(term)
+        if term_id is None:
+            raise ValueError(f"Termine non presente nel lessico: {term}")
+        return term_id
+
+    def _allowed(self, relations):
+        if relations is None:
+            return None
+        unknown = set(relations) - set(RELATIONS)
+        if unknown:
+            raise ValueError(f"Relazioni non valide: {', '.join(sorted(unknown))}")
+        return np.array([r in relations for r in RELATIONS])
+
+    def _expand(self, frontier, allowed=None, backward: bool = False):
+        """
+        Posizioni nel CSR di tutti gli archi uscenti dai nodi della frontiera.
+
+        :param allowed: Maschera delle relazioni ammesse (None = tutte).
+        :param backward: Se la visita procede dalla destinazione: il cammino percorre
+                         l'arco gemello, quindi il filtro si applica alla sua relazione.
+        """
+        starts = self._offsets[frontier]
+        lengths = self._offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64)
+        positions = np.arange(total, dtype=np.int64) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        if allowed is not None:
+            codes = self._codes[positions]
+            if backward:
+                codes = self._reverse_codes[codes]
+            positions = positions[allowed[codes]]
+        return positions
+
+    # --- Cammini minimi ---
+    def shortest_path(self, source: str, target: str, relations=None, weighted: bool = False):
+        """
+        Cammino minimo fra due termini.
+
+        Senza pesi è una visita in ampiezza bidirezionale (si espande ogni volta il lato con
+        la frontiera più piccola); con i pesi di RELATION_WEIGHTS è l'algoritmo di Dijkstra
+        nella variante a secchi.
+
+        :param source: Termine di partenza.
+        :param target: Termine di arrivo.
+        :param relations: Tipi di relazione ammessi (di default tutti).
+        :param weighted: Se usare i costi delle relazioni invece del numero di passi.
+        :return: GraphPath, oppure None se i termini non sono collegati.
+        :raises ValueError: Se un termine o una relazione non esistono.
+        """
+        source_id, target_id = self._id(source), self._id(target)
+        allowed = self._allowed(relations)
+        key = (source_id, target_id, None if relations is None else frozenset(relations), weighted)
+        cached = self._paths.get(key)
+        if cached is not None:
+            return cached[0]
+
+        if weighted:
+            path = self._dijkstra(source_id, target_id, allowed)
+        else:
+            path = self._bidirectional_bfs(source_id, target_id, allowed)
+        self._paths.put(key, (path,))
+        return path
+
+    def _make_path(self, node_ids, positions, cost):
+        terms = [self.index.term(int(node_id)) for node_id in node_ids]
+        relations = [RELATIONS[self._codes[position]] for position in positions]
+        return GraphPath(terms, relations, cost)
+
+    def _bidirectional_bfs(self, source_id, target_id, allowed):
+        if source_id == target_id:
+            return GraphPath([self.index.term(source_id)], [], 0)
+        n = len(self.index)
+        # Per ogni lato: posizione dell'arco con cui il nodo è stato raggiunto e distanza
+        reached = [np.full(n, _UNSEEN, dtype=np.int64), np.full(n, _UNSEEN, dtype=np.int64)]
+        distance = [np.zeros(n, dtype=np.int32), np.zeros(n, dtype=np.int32)]
+        reached[0][source_id] = reached[1][target_id] = _ROOT
+        frontiers = [np.array([source_id]), np.array([target_id])]
+        levels = [0, 0]
+
+        while len(frontiers[0]) and len(frontiers[1]):
+            side = 0 if self._degree[frontiers[0]].sum() <= self._degree[frontiers[1]].sum() else 1
+            other = 1 - side
+            positions = self._expand(frontiers[side], allowed, backward=side == 1)
+            nodes = self._targets[positions]
+            new = reached[side][nodes] == _UNSEEN
+            nodes, first = np.unique(nodes[new], return_index=True)
+            positions = positions[new][first]
+            levels[side] += 1
+            reached[side][nodes] = positions
+            distance[side][nodes] = levels[side]
+            frontiers[side] = nodes
+
+            meeting = nodes[reached[other][nodes] != _UNSEEN]
+            if len(meeting):
+                middle = int(meeting[np.argmin(distance[other][meeting])])
+                return self._join(middle, reached, levels[side] + int(distance[other][middle]))
+        return None
+
+    def _join(self, middle, reached, length):
+        # Dal nodo d'incontro indietro fino alla sorgente, poi avanti fino alla destinazione
+        nodes, positions = [middle], []
+        node = middle
+        while reached[0][node] != _ROOT:
+            position = int(reached[0][node])
+            positions.append(position)
+            node = int(self._sources[position])
+            nodes.append(node)
+        nodes.reverse()
+        positions.reverse()
+        node = middle
+        while reached[1][node] != _ROOT:
+            position = int(reached[1][node])
+            # L'arco raggiunto dalla destinazione va percorso al contrario: si usa quello gemello
+            parent = int(self._sources[position])
+            positions.append(self._position(node, parent))
+            node = parent
+            nodes.append(node)
+        return self._make_path(nodes, positions, length)
+
+    def _position(self, a, b):
+        """
+        Posizione nel CSR dell'arco a -> b (i vicini di ogni nodo sono ordinati).
+        """
+        start, end = self._offsets[a], self._offsets[a + 1]
+        return int(start + np.searchsorted(self._targets[start:end], b))
+
+    def _dijkstra(self, source_id, target_id, allowed):
+        # Dijkstra a secchi (delta-stepping) con passo pari al peso minimo: i nodi con
+        # distanza provvisoria in [k*passo, (k+1)*passo) sono definitivi e vengono
+        # espansi tutti insieme, con operazioni vettoriali.
+        n = len(self.index)
+        step = float(self._weights.min()) if len(self._weights) else 1.0
+        best = np.full(n, np.inf)
+        previous = np.full(n, _ROOT, dtype=np.int64)
+        settled = np.zeros(n, dtype=bool)
+        best[source_id] = 0.0
+        pending = np.array([source_id])
+        while len(pending) and not settled[target_id]:
+            pending = np.unique(pending[~settled[pending]])
+            if not len(pending):
+                break
+            bound = (np.floor(best[pending].min() / step) + 1) * step
+            bucket = pending[best[pending] < bound]
+            settled[bucket] = True
+            positions = self._expand(bucket, allowed)
+            nodes = self._targets[positions]
+            costs = best[self._sources[positions]] + self._weights[positions]
+            better = costs < best[nodes]
+            positions, nodes, costs = positions[better], nodes[better], costs[better]
+            # Per ogni nodo raggiunto si tiene l'arco più conveniente
+            order = np.lexsort((costs, nodes))
+            first = np.ones(len(order), dtype=bool)
+            first[1:] = nodes[order][1:] != nodes[order][:-1]
+            order = order[first]
+            best[nodes[order]] = costs[order]
+            previous[nodes[order]] = positions[order]
+            pending = np.concatenate((pending[~settled[pending]], nodes[order]))
+        if not np.isfinite(best[target_id]):
+            return None
+
+        node_ids, positions = [target_id], []
+        node = target_id
+        while node != source_id:
+            position = int(previous[node])
+            positions.append(position)
+            node = int(self._sources[position])
+            node_ids.append(node)
+        node_ids.reverse()
+        positions.reverse()
+        return self._make_path(node_ids, positions, float(best[target_id]))
+
+    # --- Componenti connesse ---
+    def component_labels(self):
+        """
+        Etichetta della componente connessa di ogni nodo (l'id più piccolo della componente).
+
+        Propagazione del minimo fra vicini alternata al salto dei puntatori
+        (etichetta dell'etichetta), finché le etichette non cambiano più.
+        """
+        def compute():
+            n = len(self.index)
+            labels = np.arange(n, dtype=np.int64)
+            has_edges = self._degree > 0
+            starts = self._offsets[:-1][has_edges]
+            while True:
+                neighbour_min = np.minimum.reduceat(labels[self._targets], starts) if len(starts) else starts
+                updated = labels.copy()
+                updated[has_edges] = np.minimum(labels[has_edges], neighbour_min)
+                # Propagazione anche verso l'etichetta stessa, poi salto dei puntatori
+                np.minimum.at(updated, labels, updated)
+                updated = updated[updated]
+                if np.array_equal(updated, labels):
+                    return labels
+                labels = updated
+        return self._memo("components", compute)
+
+    def components(self, min_size: int = 1):
+        """
+        Componenti connesse con almeno `min_size` termini, dalla più grande.
+
+        :return: Lista di liste di termini.
+        """
+        labels = self.component_labels()
+        order = np.argsort(labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+        groups = [group for group in np.split(order, boundaries) if len(group) >= min_size]
+        groups.sort(key=len, reverse=True)
+        return [[self.index.term(int(i)) for i in group] for group in groups]
+
+    def component_of(self, term: str):
+        """
+        Termini della componente connessa del termine indicato.
+        """
+        labels = self.component_labels()
+        members = np.flatnonzero(labels == labels[self._id(term)])
+        return [self.index.term(int(i)) for i in members]
+
+    # --- Centralità ---
+    def degree_centrality(self):
+        """
+        Grado di ogni nodo diviso per il grado massimo possibile (n - 1).
+        """
+        def compute():
+            n = len(self.index)
+            return self._degree / max(n - 1, 1)
+        return self._memo("degree", compute)
+
+    def pagerank(self, damping: float = PAGERANK_DAMPING):
+        """
+        PageRank sul grafo non orientato, con il metodo delle potenze. La probabilità dei
+        nodi senza archi è ridistribuita uniformemente.
+
+        :return: Array con il punteggio di ogni nodo (somma 1).
+        """
+        def compute():
+            n = len(self.index)
+            if not n:
+                return np.zeros(0)
+            degree = self._degree.astype(float)
+            dangling = degree == 0
+            inverse_degree = np.divide(1.0, degree, out=np.zeros(n), where=~dangling)
+            rank = np.full(n, 1.0 / n)
+            for _ in range(PAGERANK_MAX_ITERATIONS):
+                spread = np.bincount(self._targets, weights=(rank * inverse_degree)[self._sources], minlength=n)
+                updated = (1.0 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+                converged = np.abs(updated - rank).sum() < PAGERANK_TOLERANCE
+                rank = updated
+                if converged:
+                    break
+            return rank
+        return self._memo(("pagerank", damping), compute)
+
+    def betweenness(self, samples: int = None, seed: int = 0):
+        """
+        Betweenness (algoritmo di Brandes, cammini non pesati), normalizzata in [0, 1].
+
+        Ogni visita in ampiezza procede un livello alla volta con operazioni vettoriali.
+        Oltre EXACT_BETWEENNESS_LIMIT nodi (o se `samples` è indicato) la misura è stimata
+        da un campione casuale di sorgenti e riportata alla scala dell'intero grafo.
+
+        :param samples: Numero di sorgenti del campione (None = automatico).
+        :param seed: Seme per la scelta del campione.
+        :return: Array con il punteggio di ogni nodo.
+        """
+        n = len(self.index)
+        if samples is None and n > EXACT_BETWEENNESS_LIMIT:
+            # Il costo di ogni sorgente è proporzionale al numero di archi
+            samples = max(MIN_BETWEENNESS_SAMPLES,
+                          min(BETWEENNESS_SAMPLES, BETWEENNESS_EDGE_BUDGET // max(len(self._targets), 1)))
+        if samples is not None and samples >= n:
+            samples = None
+
+        def compute():
+            if samples is None:
+                sources = np.arange(n)
+            else:
+                sources = np.random.default_rng(seed).choice(n, size=samples, replace=False)
+            centrality = np.zeros(n)
+            for source in sources:
+                self._accumulate_dependencies(int(source), centrality)
+            if samples is not None:
+                centrality *= n / samples
+            # Grafo non orientato: ogni coppia è contata due volte
+            scale = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 0.0
+            return centrality * scale
+        return self._memo(("betweenness", samples, seed), compute)
+
+    def _accumulate_dependencies(self, source, centrality):
+        n = len(self.index)
+        distance = np.full(n, -1, dtype=np.int64)
+        paths = np.zeros(n)
+        distance[source] = 0
+        paths[source] = 1.0
+        frontier = np.array([source])
+        levels = []  # Per ogni livello: archi (genitore, figlio) sui cammini minimi
+        level = 0
+        while len(frontier):
+            positions = self._expand(frontier)
+            children = self._targets[positions]
+            unseen = distance[children] == -1
+            frontier = np.unique(children[unseen])
+            distance[frontier] = level + 1
+            on_path = distance[children] == level + 1
+            parents, children = self._sources[positions[on_path]], children[on_path]
+            paths += np.bincount(children, weights=paths[parents], minlength=n)
+            levels.append((parents, children))
+            level += 1
+
+        dependency = np.zeros(n)
+        for parents, children in reversed(levels):
+            dependency += np.bincount(parents, weights=paths[parents] / paths[children] * (1.0 + dependency[children]),
+                                      minlength=n)
+        dependency[source] = 0.0
+        centrality += dependency
+
+    def top(self, scores, k: int = 10, emotions_only: bool = True):
+        """
+        I `k` termini con il punteggio più alto.
+
+        :param scores: Array di punteggi per nodo (es. pagerank()).
+        :param emotions_only: Se considerare solo le emozioni del lessico.
+        :return: Lista di coppie (termine, punteggio), dal punteggio più alto.
+        """
+        if emotions_only:
+            scores = scores[:self.index.n_emotions]
+        k = min(k, len(scores))
+        if not k:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self.index.term(int(i)), float(scores[i])) for i in best]
+
+
+_analytics = OrderedDict()
+_analytics_lock = threading.Lock()
+
+
+def analytics_for(model) -> GraphAnalytics:
+    """
+    Restituisce le analisi del grafo del modello, costruite una sola volta per versione
+    (le ultime ANALYTICS_CACHE_SIZE versioni restano in memoria).
+
+    :param model: EmotionModel caricato.
+    """
+    with _analytics_lock:
+        analytics = _analytics.get(model.version)
+        if analytics is not None and analytics.index is model.index:
+            _analytics.move_to_end(model.version)
+            return analytics
+    analytics = GraphAnalytics(model.index)
+    with _analytics_lock:
+        _analytics[model.version] = analytics
+        while len(_analytics) > ANALYTICS_CACHE_SIZE:
+            _analytics.popitem(last=False)
+    return analytics
+
+
+def describe_path(path: GraphPath) -> str:
+    """
+    Descrizione testuale di un cammino ("ansia -[related]-> paura -[antonyms]-> ...").
+    """
+    parts = [path.terms[0]]
+    for _, term, relation in path.edges():
+        parts.append(f"-[{relation}]-> {term}")
+    return " ".join(parts)
+
+
+def main(argv=None):
+    from model.emotion_model import EmotionModel
+
+    parser = argparse.ArgumentParser(description="Cammini, componenti e centralità del grafo delle emozioni.")
+    parser.add_argument("-l", "--lexicon", default=DEFAULT_LEXICON, help="File JSON del lessico.")
+    parser.add_argument("--path", nargs=2, metavar=("DA", "A"), help="Cammino minimo fra due termini.")
+    parser.add_argument("--weighted", action="store_true", help="Cammino pesato per tipo di relazione.")
+    parser.add_argument("--relations", default=None, help="Relazioni ammesse, separate da virgola.")
+    parser.add_argument("--central", type=int, metavar="K", help="Le K emozioni più centrali.")
+    parser.add_argument("--measure", choices=("degree", "pagerank", "betweenness"), default="pagerank",
+                        help="Misura di centralità.")
+    parser.add_argument("--components", action="store_true", help="Componenti connesse.")
+    args = parser.parse_args(argv)
+
+    model = EmotionModel()
+    try:
+        model.load_from_json(args.lexicon)
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+    analytics = analytics_for(model)
+
+    if args.path:
+        relations = args.relations.split(",") if args.relations else None
+        try:
+            path = analytics.shortest_path(args.path[0], args.path[1], relations, args.weighted)
+        except ValueError as e:
+            print(f"Errore: {e}", file=sys.stderr)
+            return 2
+        print(describe_path(path) + f"  (costo {path.cost:g})" if path else "Nessun cammino.")
+    if args.central:
+        scores = {"degree": analytics.degree_centrality, "pagerank": analytics.pagerank,
+                  "betweenness": analytics.betweenness}[args.measure]()
+        for term, score in analytics.top(scores, args.central):
+            print(f"{score:.6f}  {term}")
+    if args.components:
+        components = analytics.components()
+        print(f"{len(components)} componenti; le più grandi: "
+              + ", ".join(str(len(component)) for component in components[:10]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
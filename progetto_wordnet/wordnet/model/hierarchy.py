@@ -0,0 +1,364 @@
+# hierarchy.py
+import sys
+import argparse
+import itertools
+from array import array
+from bisect import bisect_right
+
+
+"""
+Chiusura transitiva della gerarchia iperonimi/iponimi del lessico.
+
+Gli archi "a hypernyms b" e "b hyponyms a" indicano entrambi che a è un tipo di b
+(b è il genitore di a). La chiusura è calcolata una sola volta per lessico caricato:
+
+1. i cicli (errori del lessico, es. a iperonimo di b e b iperonimo di a) sono trovati
+   con l'algoritmo di Tarjan e i loro termini raccolti in un'unica classe;
+2. sul grafo aciclico delle classi ogni nodo riceve un numero in post-ordine di una
+   foresta di copertura, e a ogni classe è associata la lista compressa di intervalli
+   di post-ordine che copre tutti i suoi discendenti (etichettatura a intervalli di
+   Agrawal, Borgida e Jagadish); lo stesso avviene sul grafo inverso per gli antenati.
+
+Nelle gerarchie ad albero ogni classe ha un solo intervallo: "x è un tipo di y" è un
+confronto fra interi e i discendenti sono una fetta contigua dell'ordine di visita,
+quindi le interrogazioni costano O(1) (O(log k) con k intervalli) e O(risultato).
+
+Uso da riga di comando (dalla cartella dell'applicazione):
+    python -m model.hierarchy --descendants "emozione negativa"
+    python -m model.hierarchy --is-a gioia "emozione positiva"
+"""
+
+DEFAULT_LEXICON = "data/default_wordnet.json"
+
+
+class _Labelling:
+    """
+    Etichettatura a intervalli di un grafo aciclico: post-ordine di ogni classe, classi
+    in post-ordine e, per ogni classe, intervalli [inizio, fine] dei post-ordini raggiunti.
+    """
+    __slots__ = ("post", "order", "offsets", "starts", "ends")
+
+    def __init__(self, children, emission_order):
+        """
+        :param children: Lista dei figli (classi) di ogni classe.
+        :param emission_order: Classi ordinate con i figli prima dei genitori.
+        """
+        n = len(children)
+        has_parent = bytearray(n)
+        for kids in children:
+            for kid in kids:
+                has_parent[kid] = 1
+
+        # Post-ordine di una foresta di copertura: ogni classe entra nell'albero del
+        # primo genitore che la visita, quindi i suoi discendenti nell'albero sono contigui
+        post = array("I", bytes(4 * n))
+        low = array("I", bytes(4 * n))
+        order = array("I")
+        visited = bytearray(n)
+        for root in reversed(emission_order):
+            if has_parent[root] or visited[root]:
+                continue
+            visited[root] = 1
+            low[root] = len(order)
+            stack = [(root, iter(children[root]))]
+            while stack:
+                node, pending = stack[-1]
+                for kid in pending:
+                    if not visited[kid]:
+                        visited[kid] = 1
+                        low[kid] = len(order)
+                        stack.append((kid, iter(children[kid])))
+                        break
+                else:
+                    stack.pop()
+                    post[node] = len(order)
+                    order.append(node)
+
+        # Intervalli dei discendenti, dai figli verso i genitori: il proprio intervallo
+        # nell'albero più quelli dei figli, ordinati e fusi se contigui o sovrapposti
+        intervals = [None] * n
+        for node in emission_order:
+            kids = children[node]
+            own = (low[node], post[node])
+            if not kids:
+                intervals[node] = (own,)
+                continue
+            collected = [own]
+            for kid in kids:
+                collected.extend(intervals[kid])
+            collected.sort()
+            merged = [collected[0]]
+            for start, end in collected[1:]:
+                last_start, last_end = merged[-1]
+                if start <= last_end + 1:
+                    if end > last_end:
+                        merged[-1] = (last_start, end)
+                else:
+                    merged.append((start, end))
+            intervals[node] = tuple(merged)
+
+        self.post = post
+        self.order = order
+        self.offsets = array("I", [0])
+        self.offsets.extend(itertools.accumulate(len(node_intervals) for node_intervals in intervals))
+        flat = [bounds for node_intervals in intervals for bounds in node_intervals]
+        self.starts = array("I", [start for start, _ in flat])
+        self.ends = array("I", [end for _, end in flat])
+
+    def reaches(self, source: int, target: int) -> bool:
+        """
+        True se `target` è raggiungibile da `source` (o coincide).
+        """
+        position = self.post[target]
+        first, last = self.offsets[source], self.offsets[source + 1]
+        if last - first == 1:
+            return self.starts[first] <= position <= self.ends[first]
+        i = bisect_right(self.starts, position, first, last) - 1
+        return i >= first and position <= self.ends[i]
+
+    def reached(self, source: int):
+        """
+        Classi raggiungibili da `source` (compresa), nell'ordine di visita.
+        """
+        for i in range(self.offsets[source], self.offsets[source + 1]):
+            yield from self.order[self.starts[i]:self.ends[i] + 1]
+
+    def interval_count(self) -> int:
+        return len(self.starts)
+
+
+class Hierarchy:
+    """
+    Gerarchia iperonimi/iponimi di un EmotionIndex con la sua chiusura transitiva.
+    L'indice non deve essere modificato dopo la costruzione.
+    """
+    def __init__(self, index):
+        """
+        :param index: EmotionIndex del modello caricato.
+        """
+        self.index = index
+        n = len(index)
+
+        # Figli di ogni termine (senza duplicati e senza anelli)
+        children = [[] for _ in range(n)]
+        for node_id in range(n):
+            for parent in index.neighbours(node_id, "hypernyms"):
+                if parent != node_id:
+                    children[parent].append(node_id)
+            for child in index.neighbours(node_id, "hyponyms"):
+                if child != node_id:
+                    children[node_id].append(child)
+        self._child_offsets = array("I", [0])
+        self._children = array("I")
+        for node_id, kids in enumerate(children):
+            if len(kids) > 1:
+                kids = children[node_id] = list(dict.fromkeys(kids))
+            self._children.extend(kids)
+            self._child_offsets.append(len(self._children))
+
+        # Classi (componenti fortemente connesse) e grafo aciclico fra le classi
+        self.component, sizes = _strongly_connected(children)
+        n_components = len(sizes)
+        # Termine di ogni classe e, per le classi con più termini (i cicli), tutti i termini
+        self._node_of = array("I", bytes(4 * n_components))
+        self._members = {}
+        for node_id in range(n):
+            component = self.component[node_id]
+            self._node_of[component] = node_id
+            if sizes[component] > 1:
+                self._members.setdefault(component, []).append(node_id)
+        component_children = [[] for _ in range(n_components)]
+        for node_id, kids in enumerate(children):
+            source = self.component[node_id]
+            for kid in kids:
+                target = self.component[kid]
+                if target != source:
+                    component_children[source].append(target)
+        component_parents = [[] for _ in range(n_components)]
+        for source, kids in enumerate(component_children):
+            if len(kids) > 1:
+                kids = component_children[source] = list(dict.fromkeys(kids))
+            for kid in kids:
+                component_parents[kid].append(source)
+
+        # Le classi sono numerate con i discendenti prima degli antenati
+        emission_order = range(n_components)
+        self._descendants = _Labelling(component_children, emission_order)
+        self._ancestors = _Labelling(component_parents, emission_order[::-1])
+
+    @property
+    def cycles(self):
+        """
+        Gruppi di termini che sono a vicenda iperonimi l'uno dell'altro (cicli nel lessico).
+        """
+        return [[self.index.term(node_id) for node_id in members] for members in self._members.values()]
+
+    def _id(self, term: str) -> int:
+        term_id = self.index.id_of(term)
+        if term_id is None:
+            raise ValueError(f"Termine non presente nel lessico: {term}")
+        return term_id
+
+    def _expand(self, components, exclude: int):
+        for component in components:
+            members = self._members.get(component)
+            if members is None:
+                node_id = self._node_of[component]
+                if node_id != exclude:
+                    yield node_id
+            else:
+                yield from (member for member in members if member != exclude)
+
+    def is_a(self, term: str, ancestor: str) -> bool:
+        """
+        True se `term` è un tipo (diretto o indiretto) di `ancestor`. Due termini dello
+        stesso ciclo sono ciascuno un tipo dell'altro; un termine non è un tipo di sé stesso.
+        """
+        term_id, ancestor_id = self._id(term), self._id(ancestor)
+        if term_id == ancestor_id:
+            return False
+        return self._descendants.reaches(self.component[ancestor_id], self.component[term_id])
+
+    def descendant_ids(self, term_id: int):
+        """
+        Id dei discendenti (iponimi diretti e indiretti) di un termine, escluso il termine.
+        """
+        return list(self._expand(self._descendants.reached(self.component[term_id]), term_id))
+
+    def ancestor_ids(self, term_id: int):
+        """
+        Id degli antenati (iperonimi diretti e indiretti) di un termine, escluso il termine.
+        """
+        return list(self._expand(self._ancestors.reached(self.component[term_id]), term_id))
+
+    def descendants(self, term: str):
+        """
+        Discendenti di un termine (tutti i suoi tipi, a ogni livello).
+        """
+        return [self.index.term(node_id) for node_id in self.descendant_ids(self._id(term))]
+
+    def ancestors(self, term: str):
+        """
+        Antenati di un termine (tutti i termini di cui è un tipo, a ogni livello).
+        """
+        return [self.index.term(node_id) for node_id in self.ancestor_ids(self._id(term))]
+
+    def children_ids(self, term_id: int):
+        """
+        Id dei figli diretti di un termine nella gerarchia.
+        """
+        return self._children[self._child_offsets[term_id]:self._child_offsets[term_id + 1]]
+
+    def subtree_edges(self, term_ids):
+        """
+        Archi (genitore, figlio) della gerarchia sotto i termini indicati: i figli di ogni
+        termine del sottoalbero appartengono anch'essi al sottoalbero, quindi gli archi
+        si leggono direttamente, senza visite.
+
+        :param term_ids: Termini del sottoalbero (radici e discendenti).
+        :return: Generatore di coppie di id.
+        """
+        for parent in term_ids:
+            for child in self.children_ids(parent):
+                yield parent, child
+
+    def interval_count(self) -> int:
+        """
+        Numero totale di intervalli memorizzati (misura della dimensione della chiusura).
+        """
+        return self._descendants.interval_count() + self._ancestors.interval_count()
+
+
+def _strongly_connected(children):
+    """
+    Componenti fortemente connesse (algoritmo di Tarjan, iterativo).
+
+    :param children: Lista dei figli di ogni nodo.
+    :return: Coppia (componente di ogni nodo come array('I'), numero di nodi di ogni
+             componente). Le componenti sono numerate nell'ordine in cui vengono chiuse:
+             ognuna segue tutte quelle che raggiunge.
+    """
+    n = len(children)
+    unvisited = 0xFFFFFFFF
+    number = array("I", [unvisited]) * n
+    lowlink = array("I", bytes(4 * n))
+    component = array("I", [unvisited]) * n
+    on_stack = bytearray(n)
+    stack = []
+    emitted = []
+    counter = 0
+    for root in range(n):
+        if number[root] != unvisited:
+            continue
+        number[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, iter(children[root]))]
+        while work:
+            node, pending = work[-1]
+            descended = False
+            for kid in pending:
+                if number[kid] == unvisited:
+                    number[kid] = lowlink[kid] = counter
+                    counter += 1
+                    stack.append(kid)
+                    on_stack[kid] = 1
+                    work.append((kid, iter(children[kid])))
+                    descended = True
+                    break
+                if on_stack[kid] and number[kid] < lowlink[node]:
+                    lowlink[node] = number[kid]
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            if lowlink[node] == number[node]:
+                component_id = len(emitted)
+                size = 0
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component[member] = component_id
+                    size += 1
+                    if member == node:
+                        break
+                emitted.append(size)
+    return component, emitted
+
+
+def main(argv=None):
+    from model.emotion_model import EmotionModel
+
+    parser = argparse.ArgumentParser(description="Interrogazioni sulla gerarchia iperonimi/iponimi.")
+    parser.add_argument("-l", "--lexicon", default=DEFAULT_LEXICON, help="File JSON del lessico.")
+    parser.add_argument("--descendants", metavar="TERMINE", help="Tutti i tipi di un termine.")
+    parser.add_argument("--ancestors", metavar="TERMINE", help="Tutti i termini di cui è un tipo.")
+    parser.add_argument("--is-a", nargs=2, metavar=("TERMINE", "ANTENATO"), help="Verifica se è un tipo.")
+    parser.add_argument("--cycles", action="store_true", help="Cicli presenti nel lessico.")
+    args = parser.parse_args(argv)
+
+    model = EmotionModel()
+    try:
+        model.load_from_json(args.lexicon)
+        hierarchy = model.hierarchy
+        if args.descendants:
+            print("\n".join(hierarchy.descendants(args.descendants)))
+        if args.ancestors:
+            print("\n".join(hierarchy.ancestors(args.ancestors)))
+        if args.is_a:
+            print("sì" if hierarchy.is_a(*args.is_a) else "no")
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+    if args.cycles:
+        for cycle in hierarchy.cycles:
+            print(", ".join(cycle))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# json_stream.py
+import os
+import re
+import sys
+import json
+import codecs
+
+
+"""
+Lettura in streaming dei file WordNet in formato JSON.
+
+Il file viene letto a blocchi e le voci dell'oggetto "emozioni" vengono restituite una
+alla volta, man mano che sono complete: il documento intero non è mai in memoria come
+testo e ogni voce può essere validata e indicizzata appena arriva.
+"""
+
+# Dimensione dei blocchi letti dal file
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_INVALID_MESSAGE = "Il file JSON non contiene la chiave 'emozioni' valida."
+
+
+class _StreamReader:
+    """
+    Buffer di testo alimentato a blocchi, con i pochi primitivi necessari
+    per scorrere un oggetto JSON senza caricarlo tutto.
+    """
+    def __init__(self, f, total_size, on_chunk=None, progress=None, chunk_size=CHUNK_SIZE):
+        self._file = f
+        self._total_size = total_size
+        self._on_chunk = on_chunk
+        self._progress = progress
+        self._chunk_size = chunk_size
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._read = 0
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=None):
+        """
+        Legge un nuovo blocco dal file, scartando la parte di buffer già consumata.
+        """
+        raw = self._file.read(size or self._chunk_size)
+        if self._on_chunk is not None:
+            self._on_chunk(raw)
+        self._read += len(raw)
+        self.eof = not raw
+        self.buffer = self.buffer[self.pos:] + self._text_decoder.decode(raw, final=self.eof)
+        self.pos = 0
+        if self._progress is not None and self._total_size:
+            self._progress(min(self._read / self._total_size, 1.0))
+
+    def peek(self) -> str:
+        """
+        Salta gli spazi e restituisce il prossimo carattere senza consumarlo ('' a fine file).
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.fill()
+
+    def next_char(self) -> str:
+        """
+        Consuma e restituisce il prossimo carattere significativo.
+        """
+        char = self.peek()
+        self.pos += 1
+        return char
+
+    def expect(self, char: str):
+        """
+        Consuma il carattere atteso, altrimenti solleva ValueError.
+        """
+        if self.next_char() != char:
+            raise ValueError(f"JSON non valido: atteso '{char}' nel file.")
+
+    def value(self):
+        """
+        Decodifica il prossimo valore JSON completo. Se il valore non è ancora tutto nel
+        buffer vengono letti altri blocchi (di dimensione crescente).
+        """
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+                # Un valore che termina a fine buffer (es. un numero) potrebbe essere troncato
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"JSON non valido: {e.msg}.") from None
+            self.fill(size)
+            size *= 2
+
+
+def iter_emotions(file_path: str, on_chunk=None, progress=None, chunk_size: int = CHUNK_SIZE):
+    """
+    Restituisce una alla volta le voci dell'oggetto "emozioni" di un file WordNet.
+
+    :param file_path: Percorso al file JSON.
+    :param on_chunk: Funzione chiamata con i bytes di ogni blocco letto (es. per l'hash).
+    :param progress: Funzione chiamata con la frazione di file letta (0.0 - 1.0).
+    :param chunk_size: Dimensione dei blocchi letti.
+    :return: Generatore di coppie (nome emozione, dati).
+    :raises ValueError: Se il file non è un JSON valido o manca la chiave 'emozioni'.
+    """
+    with open(file_path, "rb") as f:
+        reader = _StreamReader(f, os.fstat(f.fileno()).st_size, on_chunk, progress, chunk_size)
+        reader.fill()
+        if reader.buffer.startswith("\ufeff"):
+            reader.pos = 1
+        if reader.peek() != "{":
+            raise ValueError(_INVALID_MESSAGE)
+        reader.pos += 1
+
+        found = False
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                key = reader.value()
+                if not isinstance(key, str):
+                    raise ValueError("JSON non valido: le chiavi devono essere stringhe.")
+                reader.expect(":")
+
+                if key == "emozioni" and not found:
+                    if reader.peek() != "{":
+                        raise ValueError(_INVALID_MESSAGE)
+                    reader.pos += 1
+                    found = True
+                    if reader.peek() == "}":
+                        reader.pos += 1
+                    else:
+                        while True:
+                            name = reader.value()
+                            if not isinstance(name, str):
+                                raise ValueError("JSON non valido: le chiavi devono essere stringhe.")
+                            reader.expect(":")
+                            data = reader.value()
+                            if isinstance(data, dict):
+                                # Ogni voce è decodificata a parte: si condividono le chiavi
+                                # ("synonyms", "details", ...) come farebbe json.load
+                                data = {sys.intern(k): v for k, v in data.items()}
+                            yield name, data
+                            separator = reader.next_char()
+                            if separator == "}":
+                                break
+                            if separator != ",":
+                                raise ValueError("JSON non valido: atteso ',' o '}' nel file.")
+                else:
+                    reader.value()  # Altre chiavi: il valore viene solo saltato
+
+                separator = reader.next_char()
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise ValueError("JSON non valido: atteso ',' o '}' nel file.")
+
+        if reader.peek() != "":
+            raise ValueError("JSON non valido: contenuto inatteso dopo l'oggetto principale.")
+        if not found:
+            raise ValueError(_INVALID_MESSAGE)
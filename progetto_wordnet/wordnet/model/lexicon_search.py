@@ -0,0 +1,187 @@
+# lexicon_search.py
+import bisect
+from array import array
+from collections import Counter
+
+from model.search_index import fold, max_typos, bounded_edit_distance
+
+
+"""
+Motore di ricerca sull'intero lessico (emozioni e destinazioni di tutte le relazioni).
+
+Le parole vengono normalizzate (minuscolo, senza accenti) e indicizzate in tre modi:
+- dizionario delle chiavi per le corrispondenze esatte;
+- chiavi ordinate per la ricerca per prefisso (ricerca binaria);
+- cancellazioni simmetriche (stile SymSpell, sui primi PREFIX_LENGTH caratteri) per
+  gli errori singoli e trigrammi per i due errori delle parole più lunghe;
+- chiavi con pochi trigrammi distinti raggruppate per lunghezza, verificate quando
+  anche la query ne ha pochi (es. "bbbbee") e il filtro dei trigrammi non la esclude.
+I candidati sono sempre verificati con una distanza di Levenshtein limitata.
+"""
+
+# Lunghezza del prefisso su cui vengono generate le cancellazioni
+PREFIX_LENGTH = 7
+# Numero massimo di risultati restituiti
+MAX_RESULTS = 20
+# Trigrammi che due errori possono eliminare (tre per errore, vedi max_typos): le chiavi
+# che ne hanno al più tanti possono corrispondere senza condividerne nessuno
+FEW_TRIGRAMS = 3 * 2
+
+
+def _deletes(key: str):
+    """
+    Varianti del prefisso della chiave ottenute cancellando al più un carattere.
+    """
+    prefix = key[:PREFIX_LENGTH]
+    variants = {prefix}
+    for i in range(len(prefix)):
+        variants.add(prefix[:i] + prefix[i + 1:])
+    return variants
+
+
+def _trigrams(key: str):
+    """
+    Trigrammi della chiave con i delimitatori di inizio e fine parola.
+    """
+    padded = f"$${key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LexiconSearch:
+    """
+    Ricerca esatta, per prefisso e tollerante agli errori su tutti i termini di un EmotionIndex.
+    """
+    def __init__(self, index):
+        """
+        :param index: EmotionIndex di cui indicizzare i termini.
+        """
+        self.index = index
+
+        # Chiave normalizzata -> id dei termini (più termini possono avere la stessa chiave)
+        self._by_key = {}
+        for term_id, term in enumerate(index.terms):
+            self._by_key.setdefault(fold(term), []).append(term_id)
+        self._keys = sorted(self._by_key)
+
+        # Cancellazioni simmetriche e trigrammi, riferiti alla posizione della chiave in _keys
+        deletes = {}
+        trigrams = {}
+        self._gram_counts = array("H")
+        for key_id, key in enumerate(self._keys):
+            for variant in _deletes(key):
+                deletes.setdefault(variant, []).append(key_id)
+            grams = _trigrams(key)
+            for gram in grams:
+                trigrams.setdefault(gram, []).append(key_id)
+            self._gram_counts.append(min(len(grams), 0xFFFF))
+        self._deletes = deletes
+        self._trigrams = {gram: array("I", ids) for gram, ids in trigrams.items()}
+
+        # Lunghezza -> posizioni in _keys delle chiavi con al più FEW_TRIGRAMS trigrammi
+        few_grams = {}
+        for key_id, key in enumerate(self._keys):
+            if self._gram_counts[key_id] <= FEW_TRIGRAMS:
+                few_grams.setdefault(len(key), array("I")).append(key_id)
+        self._few_grams = few_grams
+
+    def _rank(self, key_ids, distances=None):
+        """
+        Ordina le chiavi trovate: distanza, poi emozioni prima delle altre parole, poi lunghezza.
+        """
+        index = self.index
+
+        def sort_key(key_id):
+            key = self._keys[key_id]
+            is_emotion = any(index.is_emotion(t) for t in self._by_key[key])
+            return (distances[key_id] if distances else 0, not is_emotion, len(key), key)
+
+        return sorted(key_ids, key=sort_key)
+
+    def _prefix_ids(self, query, limit):
+        start = bisect.bisect_left(self._keys, query)
+        end = bisect.bisect_left(self._keys, query + "\uffff", lo=start)
+        key_ids = range(start, end)
+        # Con troppi candidati si ordinano solo i più corti, che sono i più probabili
+        if len(key_ids) > limit * 10:
+            key_ids = sorted(key_ids, key=lambda k: len(self._keys[k]))[:limit * 10]
+        return self._rank(key_ids)[:limit]
+
+    def _fuzzy_ids(self, query, limit):
+        max_distance = max_typos(query)
+        candidates = set()
+        for variant in _deletes(query):
+            candidates.update(self._deletes.get(variant, ()))
+
+        if max_distance >= 2:
+            # Lemma dei q-grammi: con k errori due parole condividono almeno
+            # max(trigrammi della query, trigrammi della chiave) - 3k trigrammi
+            grams = _trigrams(query)
+            slack = 3 * max_distance
+            counts = Counter()
+            for gram in grams:
+                counts.update(self._trigrams.get(gram, ()))
+            threshold = len(grams) - slack
+            gram_counts = self._gram_counts
+            candidates.update(
+                k for k, c in counts.items()
+                if c >= threshold and c >= gram_counts[k] - slack
+            )
+            if threshold <= 0:
+                # Il limite della query è nullo: anche le chiavi senza trigrammi in comune
+                # sono possibili, se ne hanno pochi (verificate solo quelle di lunghezza utile)
+                for length in range(len(query) - max_distance, len(query) + max_distance + 1):
+                    candidates.update(self._few_grams.get(length, ()))
+
+        distances = {}
+        for key_id in candidates:
+            distance = bounded_edit_distance(query, self._keys[key_id], max_distance)
+            if distance <= max_distance:
+                distances[key_id] = distance
+        return self._rank(distances, distances)[:limit]
+
+    def search(self, query: str, limit: int = MAX_RESULTS):
+        """
+        Cerca una parola nel lessico.
+
+        I risultati sono ordinati: corrispondenza esatta, poi per prefisso, poi con errori
+        di battitura (al più `max_typos(query)`), senza duplicati.
+
+        :param query: Parola cercata (maiuscole e accenti sono ignorati).
+        :param limit: Numero massimo di risultati.
+        :return: Lista dei termini trovati.
+        """
+        query = fold(query).strip()
+        if not query:
+            return []
+
+        key_ids = []
+        exact = bisect.bisect_left(self._keys, query)
+        if exact < len(self._keys) and self._keys[exact] == query:
+            key_ids.append(exact)
+        for key_id in self._prefix_ids(query, limit) + self._fuzzy_ids(query, limit):
+            if key_id not in key_ids:
+                key_ids.append(key_id)
+
+        results = []
+        for key_id in key_ids:
+            results.extend(self.index.term(t) for t in self._by_key[self._keys[key_id]])
+        return results[:limit]
+
+    def related_emotions(self, query: str, limit: int = MAX_RESULTS):
+        """
+        Emozioni legate alla parola cercata: quelle trovate direttamente e quelle che hanno
+        fra le loro relazioni un termine trovato (tramite gli archi entranti dell'indice).
+
+        :param query: Parola cercata.
+        :param limit: Numero massimo di termini cercati.
+        :return: Lista delle emozioni, nell'ordine dei risultati.
+        """
+        index = self.index
+        emotions = {}
+        for term in self.search(query, limit):
+            term_id = index.id_of(term)
+            if index.is_emotion(term_id):
+                emotions.setdefault(term, None)
+            for _, source_id in index.in_edges(term_id):
+                emotions.setdefault(index.term(source_id), None)
+        return list(emotions)
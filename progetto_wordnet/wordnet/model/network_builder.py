@@ -0,0 +1,307 @@
+# network_builder.py
+
+# Colori per i vari tipi di relazioni
+MAIN_COLOR = "#CDB4DB"
+RELATION_COLORS = {
+    "synonyms": "#A7C957",   # Sinonimi
+    "antonyms": "#BF3100",   # Contrari
+    "hyponyms": "#F5BB00",   # Iponimi
+    "hypernyms": "#1982C4",  # Iperonimi
+    "related": "#E2E2E2",    # Relazionati
+}
+
+# Nome delle relazioni mostrato nei dettagli dei percorsi
+RELATION_NAMES = {
+    "synonyms": "sinonimo",
+    "antonyms": "contrario",
+    "hyponyms": "iponimo",
+    "hypernyms": "iperonimo",
+    "related": "relazionato",
+}
+
+# Distanza dal nodo precedente dei nodi aggiunti da un percorso (reti con posizioni fisse)
+PATH_NODE_OFFSET = 40
+
+# Limiti di default per l'espansione su più livelli
+MAX_DEPTH = 5
+MAX_NODES = 2000
+MAX_EDGES = 6000
+# Ogni quanti nodi (o archi) la costruzione riporta l'avanzamento: la callback può
+# interrompere una costruzione annullata (vedi background_tasks.py)
+PROGRESS_INTERVAL = 256
+
+# Opzioni di vis.js usate di default per la rete (disposizione calcolata nel browser)
+DEFAULT_OPTIONS = {
+    "physics": {"enabled": True},
+    "layout": {"improvedLayout": True},
+    "interaction": {"hover": True},
+}
+
+
+class NetworkData:
+    """
+    Nodi e archi di una rete, nel formato atteso dai DataSet di vis.js.
+    I nodi sono indicizzati per id e gli archi (non orientati) per coppia di estremi,
+    così i duplicati vengono scartati in O(1) e due reti si confrontano con `diff`.
+    """
+    def __init__(self):
+        self.nodes = {}
+        self.edges = {}
+        # True se la costruzione è stata interrotta dai limiti di nodi o archi
+        self.truncated = False
+        # Opzioni di vis.js per la rete (vedi model/layout.py per le reti grandi)
+        self.options = DEFAULT_OPTIONS
+
+    def add_node(self, term: str, color: str = MAIN_COLOR):
+        """
+        Aggiunge un nodo se non è già presente.
+
+        :param term: Termine (usato come id del nodo).
+        :param color: Colore del nodo.
+        """
+        if term not in self.nodes:
+            self.nodes[term] = {"id": term, "label": term.capitalize(), "color": color, "shape": "dot"}
+
+    def add_edge(self, source: str, target: str, relation: str, width: int = 3):
+        """
+        Aggiunge un arco non orientato se tra i due nodi non ne esiste già uno.
+        L'arco riporta il tipo di relazione e il colore corrispondente.
+
+        :param source: Id del nodo di partenza.
+        :param target: Id del nodo di arrivo.
+        :param relation: Tipo di relazione (chiave di RELATION_COLORS).
+        :param width: Spessore dell'arco.
+        """
+        key = (source, target) if source <= target else (target, source)
+        if key not in self.edges:
+            self.edges[key] = {
+                "id": edge_id(*key), "from": source, "to": target, "relation": relation,
+                "color": RELATION_COLORS[relation], "width": width,
+            }
+
+    def node_list(self):
+        """
+        Restituisce la lista dei nodi nell'ordine di inserimento.
+        """
+        return list(self.nodes.values())
+
+    def edge_list(self):
+        """
+        Restituisce la lista degli archi nell'ordine di inserimento.
+        """
+        return list(self.edges.values())
+
+    def diff(self, new):
+        """
+        Calcola le modifiche per passare da questa rete a `new`, nel formato
+        atteso da `applyNetworkDiff` nella pagina (id da rimuovere, elementi da
+        aggiungere o aggiornare).
+
+        :param new: NetworkData di destinazione.
+        :return: Dizionario con remove_nodes, upsert_nodes, remove_edges, upsert_edges
+                 e, solo se cambiano, le nuove options.
+        """
+        old_nodes, new_nodes = self.nodes, new.nodes
+        old_edges, new_edges = self.edges, new.edges
+        diff = {
+            "remove_nodes": [n for n in old_nodes if n not in new_nodes],
+            "upsert_nodes": [v for n, v in new_nodes.items() if old_nodes.get(n) != v],
+            "remove_edges": [v["id"] for k, v in old_edges.items() if k not in new_edges],
+            "upsert_edges": [v for k, v in new_edges.items() if old_edges.get(k) != v],
+        }
+        if self.options != new.options:
+            diff["options"] = new.options
+        return diff
+
+
+def edge_id(a: str, b: str) -> str:
+    """
+    Id stabile di un arco non orientato tra due termini (ordinati).
+    """
+    return f"{a}\x1f{b}"
+
+
+def build_selected_network(model, selected_emotions, depth: int = 1, include_incoming: bool = False,
+                           max_nodes: int = MAX_NODES, max_edges: int = MAX_EDGES, progress=None) -> NetworkData:
+    """
+    Costruisce la rete delle emozioni selezionate espandendo le relazioni fino a `depth`
+    livelli, con una visita in ampiezza sull'indice compilato. Ogni termine viene visitato
+    una sola volta; i termini che sono a loro volta emozioni vengono espansi al livello
+    successivo tramite i propri archi uscenti (e, se richiesto, entranti).
+
+    :param model: EmotionModel con l'indice compilato.
+    :param selected_emotions: Lista delle emozioni selezionate (in minuscolo).
+    :param depth: Numero di livelli di relazioni da espandere (1 = solo relazioni dirette).
+    :param include_incoming: Se True segue anche gli archi entranti (emozioni che citano il termine).
+    :param max_nodes: Numero massimo di nodi della rete.
+    :param max_edges: Numero massimo di archi della rete.
+    :param progress: Funzione chiamata con la frazione completata a ogni livello e ogni
+                     PROGRESS_INTERVAL nodi espansi; può sollevare un'eccezione per interrompere.
+    :return: NetworkData con nodi e archi della rete (`truncated` indica se i limiti sono stati raggiunti).
+    """
+    index = model.index
+    network = NetworkData()
+    visited = bytearray(len(index))
+
+    frontier = []
+    for emotion in selected_emotions:
+        network.add_node(emotion)
+        emotion_id = index.id_of(emotion)
+        if emotion_id is not None and not visited[emotion_id]:
+            visited[emotion_id] = 1
+            frontier.append(emotion_id)
+
+    for level in range(depth):
+        if progress is not None:
+            progress(level / depth)
+        next_frontier = []
+        for position, node_id in enumerate(frontier):
+            if progress is not None and position and position % PROGRESS_INTERVAL == 0:
+                progress((level + position / len(frontier)) / depth)
+            node = index.term(node_id)
+            neighbours = list(index.out_edges(node_id))
+            if include_incoming:
+                neighbours.extend(index.in_edges(node_id))
+
+            for relation, other_id in neighbours:
+                # Il limite degli archi va controllato prima di aggiungere il nodo,
+                # altrimenti il nodo resterebbe isolato nella rete
+                if len(network.edges) >= max_edges:
+                    network.truncated = True
+                    break
+                if not visited[other_id]:
+                    if len(network.nodes) >= max_nodes:
+                        network.truncated = True
+                        continue
+                    visited[other_id] = 1
+                    next_frontier.append(other_id)
+                    network.add_node(index.term(other_id))
+                network.add_edge(node, index.term(other_id), relation)
+            if len(network.edges) >= max_edges:
+                break
+
+        frontier = next_frontier
+        if not frontier or network.truncated:
+            break
+    return network
+
+
+def build_subtree_network(model, roots, max_nodes: int = MAX_NODES, max_edges: int = MAX_EDGES,
+                          progress=None) -> NetworkData:
+    """
+    Costruisce la rete del sottoalbero completo dei termini indicati: i termini, tutti i
+    loro discendenti nella gerarchia (iponimi a ogni livello) e gli archi genitore-figlio.
+    I discendenti vengono dalla chiusura transitiva del modello (vedi model/hierarchy.py),
+    quindi il costo dipende solo dalla dimensione del sottoalbero.
+
+    :param model: EmotionModel con l'indice compilato.
+    :param roots: Termini radice (in minuscolo).
+    :param max_nodes: Numero massimo di nodi della rete.
+    :param max_edges: Numero massimo di archi della rete.
+    :param progress: Funzione chiamata con la frazione completata ogni PROGRESS_INTERVAL
+                     nodi o archi; può sollevare un'eccezione per interrompere.
+    :return: NetworkData con nodi e archi del sottoalbero.
+    """
+    index = model.index
+    hierarchy = model.hierarchy
+    network = NetworkData()
+    node_ids = {}
+    for root in roots:
+        network.add_node(root)
+        root_id = index.id_of(root)
+        if root_id is None:
+            continue
+        node_ids[root_id] = None
+        for node_id in hierarchy.descendant_ids(root_id):
+            node_ids[node_id] = None
+    # Nodi e archi valgono metà dell'avanzamento ciascuno (gli archi sono circa quanti i nodi)
+    for position, node_id in enumerate(node_ids):
+        if len(network.nodes) >= max_nodes:
+            network.truncated = True
+            break
+        if progress is not None and position % PROGRESS_INTERVAL == 0:
+            progress(position / len(node_ids) / 2)
+        network.add_node(index.term(node_id))
+
+    for position, (parent, child) in enumerate(hierarchy.subtree_edges(node_ids)):
+        if progress is not None and position % PROGRESS_INTERVAL == 0:
+            progress(0.5 + min(position / max(len(network.nodes), 1), 1.0) / 2)
+        parent_term, child_term = index.term(parent), index.term(child)
+        if parent_term not in network.nodes or child_term not in network.nodes:
+            continue
+        if len(network.edges) >= max_edges:
+            network.truncated = True
+            break
+        network.add_edge(parent_term, child_term, "hyponyms")
+    return network
+
+
+def add_path_to_network(network: NetworkData, path) -> NetworkData:
+    """
+    Restituisce una copia della rete con in più i nodi e gli archi di un cammino, senza
+    modificare l'originale (che può essere condivisa con la cache delle reti).
+    Se la rete ha posizioni precalcolate (vedi model/layout.py), i nodi nuovi sono
+    collocati accanto al nodo che li precede nel cammino.
+
+    :param network: NetworkData mostrata.
+    :param path: GraphPath di model/graph_analytics.py.
+    :return: Nuova NetworkData.
+    """
+    extended = NetworkData()
+    extended.nodes = dict(network.nodes)
+    extended.edges = dict(network.edges)
+    extended.truncated = network.truncated
+    extended.options = network.options
+
+    previous = None
+    for term in path.terms:
+        if term not in extended.nodes:
+            extended.add_node(term)
+            anchor = extended.nodes.get(previous, {})
+            if "x" in anchor:
+                extended.nodes[term]["x"] = anchor["x"] + PATH_NODE_OFFSET
+                extended.nodes[term]["y"] = anchor["y"] + PATH_NODE_OFFSET
+        previous = term
+    for source, target, relation in path.edges():
+        extended.add_edge(source, target, relation)
+    return extended
+
+
+def path_edge_ids(path):
+    """
+    Id degli archi della rete che compongono un cammino (GraphPath).
+    """
+    return [edge_id(*sorted((source, target))) for source, target, _ in path.edges()]
+
+
+def build_path_html(path) -> str:
+    """
+    Costruisce l'HTML dell'area dei dettagli per un cammino fra due termini.
+
+    :param path: GraphPath di model/graph_analytics.py.
+    :return: Stringa HTML.
+    """
+    first, last = path.terms[0].capitalize(), path.terms[-1].capitalize()
+    parts = [f"<h2>Percorso da {first} a {last}:</h2><br>"]
+    parts.append(f"<b>{first}</b>")
+    for _, term, relation in path.edges():
+        color = RELATION_COLORS[relation]
+        parts.append(f" &rarr; <span style='color: {color}'>{RELATION_NAMES[relation]}</span>"
+                     f" &rarr; <b>{term.capitalize()}</b>")
+    parts.append(f"<br><br>{len(path)} passi, costo {path.cost:g}<br>")
+    return "".join(parts)
+
+
+def build_details_html(model, selected_emotions) -> str:
+    """
+    Costruisce l'HTML dell'area dei dettagli per le emozioni selezionate.
+
+    :param model: EmotionModel con i dati delle emozioni.
+    :param selected_emotions: Lista delle emozioni selezionate (in minuscolo).
+    :return: Stringa HTML.
+    """
+    parts = ["<h2>Dettagli delle emozioni selezionate:</h2><br><br>"]
+    for emotion in selected_emotions:
+        emotion_data = model.emotions.get(emotion, {})
+        parts.append(f"<b>{emotion.capitalize()}:</b> {emotion_data.get('details', 'N/A')}<br><br>")
+    return "".join(parts)
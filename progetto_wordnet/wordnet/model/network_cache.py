@@ -0,0 +1,79 @@
+# network_cache.py
+import threading
+from collections import OrderedDict
+
+
+"""
+Cache delle reti già generate, per selezione di emozioni.
+
+La chiave comprende la versione del modello, l'insieme (non ordinato) delle emozioni
+selezionate e le opzioni di espansione; il valore è tutto ciò che serve per mostrare la
+rete (nodi e archi con la disposizione, dettagli HTML, indice di ricerca, pagina HTML).
+Tornare su una selezione recente non richiede quindi alcun ricalcolo.
+"""
+
+# Numero di reti mantenute in cache
+CACHE_SIZE = 16
+
+
+def network_key(model_version: int, selected_emotions, depth: int, include_incoming: bool):
+    """
+    Costruisce la chiave di cache per una selezione.
+
+    :param model_version: Versione del modello (cambia a ogni caricamento).
+    :param selected_emotions: Emozioni selezionate (l'ordine non conta).
+    :param depth: Profondità di espansione.
+    :param include_incoming: Se sono seguiti anche gli archi entranti.
+    :return: Tupla hashable.
+    """
+    return model_version, frozenset(selected_emotions), depth, include_incoming
+
+
+class NetworkCache:
+    """
+    Cache LRU di dimensione limitata. Può essere letta dal thread della GUI e scritta
+    dai thread di lavoro.
+    """
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        """
+        :param maxsize: Numero massimo di voci; le meno usate di recente vengono scartate.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Restituisce il valore associato alla chiave (segnandolo come usato di recente),
+        oppure None se assente.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Inserisce un valore, scartando le voci meno usate oltre `maxsize`.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Svuota la cache (es. dopo il caricamento di un nuovo WordNet).
+        """
+        with self._lock:
+            self._entries.clear()
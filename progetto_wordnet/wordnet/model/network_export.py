@@ -0,0 +1,94 @@
+# network_export.py
+import json
+from xml.sax.saxutils import escape, quoteattr
+
+from view.network_html import render_network_html
+
+
+"""
+Serializzazione di una rete (NetworkData) nei formati di esportazione: pagina HTML
+(la stessa mostrata dall'applicazione), JSON con nodi e archi, GraphML e DOT.
+Nessuno dei formati richiede PyQt5.
+"""
+
+
+def to_html(network) -> str:
+    """
+    Pagina HTML interattiva della rete (richiede la cartella `lib/` accanto al file).
+    """
+    return render_network_html(network.node_list(), network.edge_list(), network.options)
+
+
+def to_json(network) -> str:
+    """
+    Nodi e archi nel formato dei DataSet di vis.js, con la relazione di ogni arco.
+    """
+    return json.dumps(
+        {"nodes": network.node_list(), "edges": network.edge_list(), "truncated": network.truncated},
+        ensure_ascii=False,
+    )
+
+
+def to_graphml(network) -> str:
+    """
+    Grafo non orientato in formato GraphML, con etichetta, colore ed eventuale posizione
+    dei nodi e relazione e colore degli archi.
+    """
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+        '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+        '  <key id="color" for="all" attr.name="color" attr.type="string"/>\n'
+        '  <key id="x" for="node" attr.name="x" attr.type="double"/>\n'
+        '  <key id="y" for="node" attr.name="y" attr.type="double"/>\n'
+        '  <key id="relation" for="edge" attr.name="relation" attr.type="string"/>\n'
+        '  <graph id="emozioni" edgedefault="undirected">\n'
+    ]
+    for node in network.nodes.values():
+        parts.append(f'    <node id={quoteattr(node["id"])}>')
+        parts.append(f'<data key="label">{escape(node["label"])}</data>')
+        parts.append(f'<data key="color">{escape(node["color"])}</data>')
+        if "x" in node:
+            parts.append(f'<data key="x">{node["x"]}</data><data key="y">{node["y"]}</data>')
+        parts.append("</node>\n")
+    # Gli id degli archi della rete contengono un carattere di controllo, non ammesso in XML
+    for i, edge in enumerate(network.edges.values()):
+        parts.append(
+            f'    <edge id="e{i}" source={quoteattr(edge["from"])} target={quoteattr(edge["to"])}>'
+            f'<data key="relation">{escape(edge["relation"])}</data>'
+            f'<data key="color">{escape(edge["color"])}</data></edge>\n'
+        )
+    parts.append("  </graph>\n</graphml>\n")
+    return "".join(parts)
+
+
+def _dot_id(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def to_dot(network) -> str:
+    """
+    Grafo non orientato in linguaggio DOT (Graphviz).
+    """
+    lines = ["graph emozioni {", '  node [shape=circle, style=filled];']
+    for node in network.nodes.values():
+        attributes = f'label={_dot_id(node["label"])}, fillcolor={_dot_id(node["color"])}'
+        if "x" in node:
+            attributes += f', pos="{node["x"]},{-node["y"]}"'
+        lines.append(f"  {_dot_id(node['id'])} [{attributes}];")
+    for edge in network.edges.values():
+        lines.append(
+            f"  {_dot_id(edge['from'])} -- {_dot_id(edge['to'])} "
+            f"[color={_dot_id(edge['color'])}, label={_dot_id(edge['relation'])}];"
+        )
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+# Formato -> (estensione, funzione di serializzazione)
+FORMATS = {
+    "html": (".html", to_html),
+    "json": (".json", to_json),
+    "graphml": (".graphml", to_graphml),
+    "dot": (".dot", to_dot),
+}
@@ -0,0 +1,331 @@
+# phrase_matcher.py
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from collections import deque
+
+from model.dataset_ingest import DATASET_DIR, read_file, normalize_label
+from model.search_index import fold
+
+
+"""
+Riconoscimento di frasi di crisi (e delle altre frasi note) nel testo, con un automa
+di Aho-Corasick.
+
+I pattern sono le frasi dei file di intenti di `dataset_DialogFlow` (suicidio, depressione,
+ansia) e i sinonimi di `entity.json`. Testo e pattern sono normalizzati allo stesso modo
+(minuscolo, senza accenti, apostrofi e punteggiatura) e divisi in parole: l'automa lavora
+sulle parole, quindi ogni pattern corrisponde solo a parole intere e il tempo di
+riconoscimento è lineare nel numero di parole del testo, qualunque sia il numero di pattern.
+
+Uso da riga di comando (dalla cartella dell'applicazione):
+    python -m model.phrase_matcher messaggi.txt
+    python -m model.phrase_matcher --benchmark 5000
+"""
+
+# File di frasi (il formato di ciascuno è riconosciuto da model/dataset_ingest.py)
+PHRASE_FILES = (
+    "Suicide_Intent_Phrases.csv",
+    "Depression_intent_dataset.csv",
+    "Depression_200_phrases.csv",
+    "Anxiety_intent_dataset.csv",
+    "ansia_Intent_Phrases.csv",
+)
+ENTITY_FILE = "entity.json"
+
+# Etichette che indicano un rischio per la persona
+CRISIS_LABELS = frozenset({"suicide"})
+
+_WORD = re.compile(r"\w+")
+_APOSTROPHES = re.compile(r"['’‘`´]")
+# Parola eventualmente interrotta alla fine di un blocco
+_TRAILING_WORD = re.compile(r"[\w'’‘`´]+$")
+
+
+def normalize_words(text: str):
+    """
+    Divide un testo nelle parole normalizzate usate per il riconoscimento
+    ("I don’t want to LIVE!" -> ["i", "dont", "want", "to", "live"]).
+    """
+    return _WORD.findall(_APOSTROPHES.sub("", fold(text)))
+
+
+class PhraseMatch:
+    """
+    Occorrenza di un pattern: etichetta, frase originale e posizione (in parole,
+    dall'inizio del testo o del flusso) della prima e dell'ultima parola più uno.
+    """
+    __slots__ = ("label", "phrase", "start", "end")
+
+    def __init__(self, label, phrase, start, end):
+        self.label = label
+        self.phrase = phrase
+        self.start = start
+        self.end = end
+
+    @property
+    def is_crisis(self) -> bool:
+        return self.label in CRISIS_LABELS
+
+    def __eq__(self, other):
+        return (isinstance(other, PhraseMatch)
+                and (self.label, self.phrase, self.start, self.end) == (other.label, other.phrase, other.start, other.end))
+
+    def __repr__(self):
+        return f"PhraseMatch({self.label!r}, {self.phrase!r}, {self.start}, {self.end})"
+
+
+class PhraseMatcher:
+    """
+    Automa di Aho-Corasick sulle parole. Gli stati sono interi; per ognuno si memorizzano
+    le transizioni (id parola -> stato), il collegamento di fallimento e i pattern che
+    terminano in quello stato (compresi quelli raggiunti seguendo i fallimenti).
+    """
+    def __init__(self, patterns=()):
+        """
+        :param patterns: Coppie (etichetta, frase).
+        """
+        self._word_ids = {}
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [()]
+        self._patterns = []  # (etichetta, frase, numero di parole)
+        for label, phrase in patterns:
+            self._add(label, phrase)
+        self._build_failure_links()
+
+    def __len__(self):
+        return len(self._patterns)
+
+    def _add(self, label, phrase):
+        words = normalize_words(phrase)
+        if not words:
+            return
+        state = 0
+        for word in words:
+            word_id = self._word_ids.setdefault(word, len(self._word_ids))
+            next_state = self._goto[state].get(word_id)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word_id] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append(())
+            state = next_state
+        pattern_id = len(self._patterns)
+        self._patterns.append((label, phrase, len(words)))
+        self._outputs[state] += (pattern_id,)
+
+    def _build_failure_links(self):
+        """
+        Calcola i collegamenti di fallimento con una visita in ampiezza del trie.
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word_id, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word_id not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word_id, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] += self._outputs[self._fail[child]]
+
+    def _step(self, state, word_ids, offset, matches):
+        """
+        Fa avanzare l'automa sulle parole indicate, aggiungendo le occorrenze a `matches`.
+
+        :return: Stato finale.
+        """
+        goto, fail, outputs, patterns = self._goto, self._fail, self._outputs, self._patterns
+        for position, word_id in enumerate(word_ids, offset + 1):
+            if word_id is None:
+                # Parola assente da tutti i pattern: ritorno diretto alla radice
+                state = 0
+                continue
+            while state and word_id not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word_id, 0)
+            for pattern_id in outputs[state]:
+                label, phrase, length = patterns[pattern_id]
+                matches.append(PhraseMatch(label, phrase, position - length, position))
+        return state
+
+    def find_all(self, text: str):
+        """
+        Restituisce tutte le occorrenze dei pattern nel testo, nell'ordine in cui terminano.
+        """
+        matches = []
+        get = self._word_ids.get
+        self._step(0, [get(word) for word in normalize_words(text)], 0, matches)
+        return matches
+
+    def labels(self, text: str):
+        """
+        Restituisce l'insieme delle etichette riconosciute nel testo.
+        """
+        return {match.label for match in self.find_all(text)}
+
+    def is_crisis(self, text: str) -> bool:
+        """
+        Indica se il testo contiene almeno una frase di crisi.
+        """
+        return any(match.is_crisis for match in self.find_all(text))
+
+    def stream(self):
+        """
+        Crea un riconoscitore per un testo che arriva a blocchi (es. un messaggio in chat
+        ricevuto a pezzi). Vedi MatchStream.
+        """
+        return MatchStream(self)
+
+
+class MatchStream:
+    """
+    Riconoscimento incrementale: lo stato dell'automa e l'eventuale parola interrotta
+    alla fine di un blocco sono mantenuti tra un blocco e il successivo, così il risultato
+    coincide con quello di `find_all` sul testo completo.
+    """
+    def __init__(self, matcher: PhraseMatcher):
+        self._matcher = matcher
+        self._state = 0
+        self._position = 0
+        self._pending = ""
+
+    def feed(self, chunk: str):
+        """
+        Elabora un blocco di testo.
+
+        :return: Occorrenze completate in questo blocco.
+        """
+        text = self._pending + chunk
+        tail = _TRAILING_WORD.search(text)
+        self._pending = tail.group() if tail else ""
+        return self._consume(text[:tail.start()] if tail else text)
+
+    def close(self):
+        """
+        Elabora l'ultima parola rimasta in sospeso e chiude il flusso.
+
+        :return: Occorrenze completate dall'ultima parola.
+        """
+        text, self._pending = self._pending, ""
+        matches = self._consume(text)
+        self._state = 0
+        return matches
+
+    def _consume(self, text):
+        matches = []
+        get = self._matcher._word_ids.get
+        word_ids = [get(word) for word in normalize_words(text)]
+        self._state = self._matcher._step(self._state, word_ids, self._position, matches)
+        self._position += len(word_ids)
+        return matches
+
+
+def load_patterns(dataset_dir: str = DATASET_DIR):
+    """
+    Legge i pattern dai file di frasi e dai sinonimi di entity.json.
+
+    :return: Lista di coppie (etichetta, frase).
+    """
+    patterns = []
+    for name in PHRASE_FILES:
+        batch = read_file(os.path.join(dataset_dir, name))
+        if batch is not None:
+            patterns.extend(zip(batch.labels(), batch.texts()))
+
+    with open(os.path.join(dataset_dir, ENTITY_FILE), encoding="utf-8") as f:
+        entities = json.load(f)
+    for category, data in entities.items():
+        label = normalize_label(category)
+        patterns.extend((label, synonym) for synonym in data.get("synonyms", []))
+    return patterns
+
+
+def default_matcher(dataset_dir: str = DATASET_DIR) -> PhraseMatcher:
+    """
+    Costruisce l'automa con i pattern di `dataset_dir`.
+    """
+    return PhraseMatcher(load_patterns(dataset_dir))
+
+
+def benchmark(n_patterns: int, dataset_dir: str = DATASET_DIR, n_messages: int = 20000, seed: int = 0):
+    """
+    Misura la latenza per messaggio con almeno `n_patterns` pattern: a quelli reali si
+    aggiungono frasi sintetiche di 2-6 parole prese dal vocabolario dei messaggi.
+    I messaggi sono le frasi di dataset.csv.
+
+    :return: Dizionario con numero di pattern, messaggi, latenze (µs) e messaggi al secondo.
+    """
+    rng = random.Random(seed)
+    patterns = load_patterns(dataset_dir)
+    messages = read_file(os.path.join(dataset_dir, "dataset.csv")).texts()[:n_messages]
+    vocabulary = sorted({word for message in messages[:2000] for word in normalize_words(message)})
+    while len(patterns) < n_patterns:
+        phrase = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 6)))
+        patterns.append(("synthetic", phrase))
+
+    start = time.perf_counter()
+    matcher = PhraseMatcher(patterns)
+    build_time = time.perf_counter() - start
+
+    latencies = []
+    total_matches = 0
+    clock = time.perf_counter
+    for message in messages:
+        begin = clock()
+        total_matches += len(matcher.find_all(message))
+        latencies.append(clock() - begin)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "patterns": len(matcher),
+        "messages": len(messages),
+        "matches": total_matches,
+        "build_s": build_time,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "messages_per_s": len(messages) / total if total else 0.0,
+    }
+
+
+def main(argv=None):
+    """
+    Cerca le frasi note nei messaggi di uno o più file (uno per riga) e stampa le
+    occorrenze, oppure esegue il benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Riconosce frasi di crisi ed entità nei messaggi.")
+    parser.add_argument("inputs", nargs="*", default=["-"], help="File di testo, un messaggio per riga ('-' = stdin).")
+    parser.add_argument("--dataset-dir", default=DATASET_DIR, help="Cartella dei file di frasi.")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="Misura la latenza con almeno N pattern.")
+    args = parser.parse_args(argv)
+
+    if args.benchmark is not None:
+        result = benchmark(args.benchmark, args.dataset_dir)
+        print(f"{result['patterns']} pattern (costruiti in {result['build_s']:.3f} s), "
+              f"{result['messages']} messaggi, {result['matches']} occorrenze")
+        print(f"latenza p50 {result['p50_us']:.1f} µs, p99 {result['p99_us']:.1f} µs, "
+              f"{result['messages_per_s']:.0f} messaggi/s")
+        return
+
+    matcher = default_matcher(args.dataset_dir)
+    for path in args.inputs:
+        f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+        try:
+            for line_number, line in enumerate(f, 1):
+                for match in matcher.find_all(line):
+                    flag = " [CRISI]" if match.is_crisis else ""
+                    print(f"{path}:{line_number}: {match.label}: {match.phrase}{flag}")
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+if __name__ == "__main__":
+    main()
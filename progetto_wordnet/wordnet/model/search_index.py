@@ -0,0 +1,132 @@
+# search_index.py
+import bisect
+import unicodedata
+
+
+"""
+Indice di ricerca sui nodi della rete generata.
+
+È il corrispettivo Python dell'indice costruito nella pagina (`window.searchNetwork`):
+stessa normalizzazione (minuscolo, senza accenti) e stesso ordine di ricerca
+(corrispondenza esatta, poi per prefisso, poi con errori di battitura), così il
+controller può scartare una parola assente senza interrogare la pagina.
+"""
+
+# Numero massimo di risultati restituiti per prefisso o con errori
+MAX_RESULTS = 50
+
+
+def fold(text: str) -> str:
+    """
+    Normalizza un testo per la ricerca: minuscolo e senza accenti ("Felicità" -> "felicita").
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def max_typos(query: str) -> int:
+    """
+    Numero di errori di battitura tollerati in base alla lunghezza della parola cercata.
+    """
+    return 1 if len(query) <= 5 else 2
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Distanza di Levenshtein tra `a` e `b`, interrotta non appena supera `limit`.
+    Si calcolano solo le diagonali entro `limit` dalla principale (algoritmo di Ukkonen).
+
+    :return: La distanza, oppure limit + 1 se è maggiore di `limit`.
+    """
+    if a == b:
+        return 0
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        ca = a[i - 1]
+        low = max(1, i - limit)
+        high = min(len_b, i + limit)
+        current = [over] * (len_b + 1)
+        if i <= limit:
+            current[0] = i
+        best = current[0]
+        for j in range(low, high + 1):
+            value = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return over
+        previous = current
+    return previous[len_b] if previous[len_b] <= limit else over
+
+
+class SearchIndex:
+    """
+    Mappa termine normalizzato -> id dei nodi, con le chiavi ordinate per la ricerca
+    per prefisso tramite ricerca binaria.
+    """
+    def __init__(self, terms=()):
+        """
+        :param terms: Id dei nodi da indicizzare.
+        """
+        self._exact = {}
+        for term in terms:
+            self._exact.setdefault(fold(term), []).append(term)
+        self._keys = sorted(self._exact)
+
+    def __contains__(self, query):
+        return bool(self.lookup(query))
+
+    def exact(self, query: str):
+        """
+        Nodi il cui id normalizzato coincide con la parola cercata.
+        """
+        return list(self._exact.get(fold(query).strip(), ()))
+
+    def prefix(self, query: str, limit: int = MAX_RESULTS):
+        """
+        Nodi il cui id normalizzato inizia con la parola cercata.
+        """
+        query = fold(query).strip()
+        results = []
+        start = bisect.bisect_left(self._keys, query)
+        for key in self._keys[start:]:
+            if not key.startswith(query) or len(results) >= limit:
+                break
+            results.extend(self._exact[key])
+        return results[:limit]
+
+    def fuzzy(self, query: str, limit: int = MAX_RESULTS):
+        """
+        Nodi il cui id normalizzato dista al più `max_typos(query)` modifiche dalla parola cercata,
+        ordinati per distanza.
+        """
+        query = fold(query).strip()
+        max_distance = max_typos(query)
+        scored = []
+        for key in self._keys:
+            distance = bounded_edit_distance(query, key, max_distance)
+            if distance <= max_distance:
+                scored.append((distance, key))
+        scored.sort()
+        results = [term for _, key in scored for term in self._exact[key]]
+        return results[:limit]
+
+    def lookup(self, query: str, limit: int = MAX_RESULTS):
+        """
+        Cerca una parola come la pagina: prima esatta, poi per prefisso, poi con errori.
+
+        :param query: Parola cercata.
+        :return: Lista degli id dei nodi trovati (vuota se nessuno).
+        """
+        if not fold(query).strip():
+            return []
+        return self.exact(query) or self.prefix(query, limit) or self.fuzzy(query, limit)
@@ -0,0 +1,135 @@
+# snapshot.py
+import os
+import array
+import struct
+import marshal
+import hashlib
+
+from model.emotion_index import EmotionIndex
+
+
+"""
+Snapshot binari del WordNet compilato.
+
+Lo snapshot viene scritto accanto al file JSON sorgente (con estensione `.snapshot`)
+e contiene il dizionario delle emozioni e lo stato dell'EmotionIndex già costruito.
+All'avvio successivo, se dimensione e data di modifica del sorgente coincidono
+(oppure, in caso contrario, se ne coincide l'hash), lo snapshot viene riusato
+saltando completamente parsing, validazione e compilazione.
+"""
+
+SNAPSHOT_SUFFIX = ".snapshot"
+
+_MAGIC = b"EWNS"
+_FORMAT_VERSION = 1
+# magic, versione formato, itemsize degli array, dimensione sorgente, mtime_ns, hash sorgente
+_HEADER = struct.Struct("<4sHHQq32s")
+
+
+def snapshot_path(source_path: str) -> str:
+    """
+    Restituisce il percorso dello snapshot associato a un file sorgente.
+    """
+    return source_path + SNAPSHOT_SUFFIX
+
+
+def new_hasher():
+    """
+    Crea un hash incrementale (BLAKE2b, 32 byte) per il contenuto letto a blocchi.
+    """
+    return hashlib.blake2b(digest_size=32)
+
+
+def hash_bytes(raw: bytes) -> bytes:
+    """
+    Calcola l'hash (BLAKE2b, 32 byte) del contenuto di un file sorgente.
+    """
+    hasher = new_hasher()
+    hasher.update(raw)
+    return hasher.digest()
+
+
+def load_snapshot(source_path: str):
+    """
+    Carica lo snapshot associato al file sorgente, se esiste ed è ancora valido.
+
+    :param source_path: Percorso al file JSON sorgente.
+    :return: Coppia (emotions, index) oppure None se lo snapshot manca o è obsoleto.
+    """
+    try:
+        stat = os.stat(source_path)
+        with open(snapshot_path(source_path), "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+
+    if len(blob) < _HEADER.size:
+        return None
+    magic, version, itemsize, size, mtime_ns, digest = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _FORMAT_VERSION or itemsize != array.array("I").itemsize:
+        return None
+
+    if size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        # Metadati cambiati (es. file copiato o "toccato"): decide l'hash del contenuto
+        if size != stat.st_size:
+            return None
+        hasher = new_hasher()
+        try:
+            with open(source_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(block)
+        except OSError:
+            return None
+        if digest != hasher.digest():
+            return None
+        _write(source_path, stat, digest, blob[_HEADER.size:])
+
+    try:
+        emotions, index_state = marshal.loads(memoryview(blob)[_HEADER.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return emotions, EmotionIndex.from_state(index_state)
+
+
+def save_snapshot(source_path: str, stat, digest: bytes, emotions: dict, index: EmotionIndex) -> bool:
+    """
+    Scrive lo snapshot del modello compilato accanto al file sorgente.
+    Gli errori di scrittura (es. cartella in sola lettura) sono ignorati: lo snapshot
+    è solo una cache.
+
+    :param source_path: Percorso al file JSON sorgente.
+    :param stat: Risultato di os.stat sul sorgente, preso prima della lettura.
+    :param digest: Hash del contenuto letto (vedi `hash_bytes`).
+    :param emotions: Dizionario delle emozioni validato.
+    :param index: Indice compilato delle emozioni.
+    :return: True se lo snapshot è stato scritto.
+    """
+    try:
+        payload = marshal.dumps((emotions, index.to_state()))
+    except ValueError:
+        return False
+    return _write(source_path, stat, digest, payload)
+
+
+def _write(source_path, stat, digest, payload) -> bool:
+    """
+    Scrive header e payload in modo atomico (file temporaneo + rename).
+    """
+    target = snapshot_path(source_path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    header = _HEADER.pack(
+        _MAGIC, _FORMAT_VERSION, array.array("I").itemsize,
+        stat.st_size, stat.st_mtime_ns, digest,
+    )
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        os.replace(tmp, target)
+        return True
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
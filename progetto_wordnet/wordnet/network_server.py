@@ -0,0 +1,317 @@
+# network_server.py
+import os
+import gzip
+import hashlib
+import mimetypes
+import threading
+import http.client
+import http.server
+
+from instrumentation import tracer, span
+
+
+"""
+Server HTTP locale che fornisce alla QWebEngineView la pagina della rete e le librerie JS.
+
+Il server è multi-thread (ThreadingHTTPServer), parla HTTP/1.1 con connessioni
+keep-alive e serve tutto dalla memoria: gli asset in `lib/` sono precaricati
+all'avvio e già compressi con gzip, con ETag e Cache-Control per le richieste successive.
+Su METRICS_PATH sono esposte le misure dell'applicazione in formato Prometheus
+(vedi instrumentation.py).
+"""
+
+# Pagina della rete servita dalla memoria
+PAGE_PATH = "/emotion_network.html"
+# Endpoint usato dai controlli di stato del server
+HEALTH_PATH = "/health"
+# Metriche delle fasi dell'applicazione, in formato testuale Prometheus
+METRICS_PATH = "/metrics"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Cartelle precaricate in memoria all'avvio del server
+ASSET_DIRS = (
+    os.path.join("lib", "vis-9.1.2"),
+    os.path.join("lib", "tom-select"),
+    os.path.join("lib", "bindings"),
+)
+
+# Gli asset non cambiano durante l'esecuzione: il browser può tenerli in cache
+ASSET_CACHE_CONTROL = "public, max-age=86400"
+PAGE_CACHE_CONTROL = "no-cache"
+
+
+class Asset:
+    """
+    Risorsa servita dalla memoria: corpo, tipo, ETag e versione compressa con gzip.
+    """
+    def __init__(self, body: bytes, content_type: str, cache_control: str, precompress: bool = True):
+        """
+        :param body: Contenuto della risorsa.
+        :param content_type: Valore dell'header Content-Type.
+        :param cache_control: Valore dell'header Cache-Control.
+        :param precompress: Se True la versione gzip viene calcolata subito,
+                            altrimenti alla prima richiesta che la accetta.
+        """
+        self.body = body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self._gzip_body = self._compress() if precompress else None
+
+    def _compress(self):
+        compressed = gzip.compress(self.body, compresslevel=6, mtime=0)
+        # Se la compressione non conviene si serve solo il corpo originale
+        return compressed if len(compressed) < len(self.body) else b""
+
+    @property
+    def gzip_body(self) -> bytes:
+        """
+        Corpo compresso con gzip (vuoto se la compressione non riduce la dimensione).
+        """
+        if self._gzip_body is None:
+            self._gzip_body = self._compress()
+        return self._gzip_body
+
+
+def load_assets(root: str = ".", asset_dirs=ASSET_DIRS) -> dict:
+    """
+    Precarica in memoria tutti i file delle cartelle indicate.
+
+    :param root: Cartella di base dell'applicazione.
+    :param asset_dirs: Cartelle (relative a `root`) da precaricare.
+    :return: Dizionario percorso URL -> Asset.
+    """
+    assets = {}
+    for asset_dir in asset_dirs:
+        base = os.path.join(root, asset_dir)
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, "rb") as f:
+                    body = f.read()
+                content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                if content_type.startswith("text/") or content_type.endswith("javascript"):
+                    content_type += "; charset=utf-8"
+                url = "/" + os.path.relpath(path, root).replace(os.sep, "/")
+                assets[url] = Asset(body, content_type, ASSET_CACHE_CONTROL)
+    return assets
+
+
+class NetworkRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Handler HTTP/1.1 (keep-alive) che risponde solo dalla memoria del server.
+    """
+    protocol_version = "HTTP/1.1"
+    # Header e corpo sono scritti separatamente: senza TCP_NODELAY la seconda scrittura
+    # attende l'ACK ritardato del client (circa 40 ms) sulle connessioni keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        with span(_request_span_name(self.path)):
+            self._send_asset(head_only=False)
+
+    def do_HEAD(self):
+        with span(_request_span_name(self.path)):
+            self._send_asset(head_only=True)
+
+    def _send_asset(self, head_only):
+        path = self.path.split("?", 1)[0]
+        if path == HEALTH_PATH:
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if path == METRICS_PATH:
+            body = tracer.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", METRICS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            if not head_only:
+                self.wfile.write(body)
+            return
+
+        asset = self.server.get_asset(path)
+        if asset is None:
+            self.send_error(404)
+            return
+
+        if self.headers.get("If-None-Match") == asset.etag:
+            self.send_response(304)
+            self.send_header("ETag", asset.etag)
+            self.send_header("Cache-Control", asset.cache_control)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = asset.body
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "") and asset.gzip_body
+        if use_gzip:
+            body = asset.gzip_body
+
+        self.send_response(200)
+        self.send_header("Content-Type", asset.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", asset.etag)
+        self.send_header("Cache-Control", asset.cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Non stampiamo nulla
+
+
+def _request_span_name(path: str) -> str:
+    """
+    Nome dello span di una richiesta: pochi nomi fissi, non il percorso, per non
+    moltiplicare le serie delle metriche.
+    """
+    path = path.split("?", 1)[0]
+    if path == PAGE_PATH:
+        return "http.page"
+    if path in (HEALTH_PATH, METRICS_PATH):
+        return "http" + path.replace("/", ".")
+    return "http.asset"
+
+
+class NetworkHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    Server multi-thread con gli asset precaricati e la pagina della rete corrente.
+    """
+    daemon_threads = True
+
+    def __init__(self, server_address, root: str = "."):
+        """
+        :param server_address: Coppia (host, porta) su cui mettersi in ascolto.
+        :param root: Cartella di base dell'applicazione (contenente `lib/`).
+        """
+        self.assets = load_assets(root)
+        self.page = None
+        super().__init__(server_address, NetworkRequestHandler)
+
+    def set_page(self, html: bytes):
+        """
+        Sostituisce la pagina della rete servita su PAGE_PATH.
+        La compressione viene fatta alla prima richiesta, fuori dal thread della GUI.
+
+        :param html: Pagina HTML codificata in UTF-8.
+        """
+        self.page = Asset(html, "text/html; charset=utf-8", PAGE_CACHE_CONTROL, precompress=False)
+
+    def get_asset(self, path: str):
+        """
+        Restituisce la risorsa associata al percorso, oppure None.
+        """
+        if path == PAGE_PATH:
+            return self.page
+        return self.assets.get(path)
+
+
+class NetworkServerManager:
+    """
+    Gestisce il ciclo di vita del server HTTP locale.
+
+    Il server viene associato in modo sincrono a una porta effimera scelta dal sistema
+    operativo (porta 0) prima di avviare il thread di servizio: quando `start` ritorna,
+    indirizzo e porta sono già definitivi e possono essere usati per costruire l'URL.
+    """
+    def __init__(self, root: str = ".", host: str = "127.0.0.1"):
+        """
+        :param root: Cartella di base dell'applicazione (contenente `lib/`).
+        :param host: Indirizzo su cui mettersi in ascolto (di default solo locale).
+        """
+        self.root = root
+        self.host = host
+        self._server = None
+        self._thread = None
+        self._page = None
+        self._lock = threading.Lock()
+
+    @property
+    def address(self):
+        """
+        Coppia (host, porta) effettivamente associata, oppure None se il server è fermo.
+        """
+        return self._server.server_address[:2] if self._server else None
+
+    @property
+    def port(self):
+        """
+        Porta effettivamente associata, oppure None se il server è fermo.
+        """
+        return self._server.server_address[1] if self._server else None
+
+    def url(self, path: str = PAGE_PATH) -> str:
+        """
+        Restituisce l'URL completo di una risorsa del server avviato.
+        """
+        host, port = self.address
+        return f"http://{host}:{port}{path}"
+
+    def start(self) -> int:
+        """
+        Avvia il server se non è già in esecuzione.
+
+        :return: Porta su cui il server è in ascolto.
+        """
+        with self._lock:
+            if self._server is None:
+                server = NetworkHTTPServer((self.host, 0), root=self.root)
+                if self._page is not None:
+                    server.set_page(self._page)
+                self._thread = threading.Thread(target=server.serve_forever, daemon=True)
+                self._server = server
+                self._thread.start()
+                print(f"Server avviato su {self.url('/')}")
+            return self.port
+
+    def stop(self):
+        """
+        Arresta il server e rilascia la socket. Non fa nulla se il server è fermo.
+        """
+        with self._lock:
+            server, thread = self._server, self._thread
+            self._server = self._thread = None
+        if server is None:
+            return
+        server.shutdown()      # Interrompe serve_forever()
+        server.server_close()  # Rilascia la socket
+        thread.join()
+
+    def set_page(self, html: bytes):
+        """
+        Imposta la pagina della rete servita su PAGE_PATH (anche prima dell'avvio).
+        """
+        self._page = html
+        if self._server is not None:
+            self._server.set_page(html)
+
+    def is_running(self) -> bool:
+        """
+        Indica se il thread di servizio è attivo.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def health_check(self, timeout: float = 1.0) -> bool:
+        """
+        Verifica che il server risponda effettivamente alle richieste.
+
+        :param timeout: Tempo massimo di attesa in secondi.
+        :return: True se l'endpoint HEALTH_PATH risponde correttamente.
+        """
+        if not self.is_running():
+            return False
+        host, port = self.address
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        try:
+            conn.request("HEAD", HEALTH_PATH)
+            return conn.getresponse().status == 204
+        except OSError:
+            return False
+        finally:
+            conn.close()
@@ -0,0 +1,342 @@
+# network_service.py
+import os
+import sys
+import json
+import asyncio
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+from model.emotion_model import EmotionModel
+from model.network_builder import build_selected_network, MAX_DEPTH
+from model.layout import apply_layout
+from model.network_cache import NetworkCache, network_key
+from model.network_export import FORMATS
+from network_server import load_assets, HEALTH_PATH
+
+
+"""
+Servizio HTTP senza interfaccia grafica per generare le reti su richiesta, per molti
+client contemporaneamente.
+
+Ogni richiesta costruisce la propria rete in memoria a partire da un unico modello
+condiviso in sola lettura e la restituisce nella risposta: nessun file viene scritto e
+richieste diverse non si sovrascrivono a vicenda. Il servizio gira su un solo processo
+con asyncio (connessioni HTTP/1.1 keep-alive); la costruzione delle reti avviene su un
+piccolo pool di thread, così il ciclo degli eventi continua a servire le altre richieste.
+Le richieste identiche in corso contemporaneamente condividono la stessa costruzione e le
+reti già generate sono riprese da una cache LRU.
+
+Endpoint:
+    GET /network?emotions=gioia,rabbia&depth=1&incoming=0&format=html
+        Rete della selezione (format: html, json, graphml, dot; di default html).
+    GET /emotions   Elenco JSON delle emozioni del lessico.
+    GET /health     Stato del servizio (204).
+    GET /lib/...    Librerie JS richieste dalle pagine HTML.
+
+Esempio (dalla cartella dell'applicazione):
+    python network_service.py --port 8000
+    curl "http://127.0.0.1:8000/network?emotions=gioia,rabbia&depth=2&format=json"
+"""
+
+DEFAULT_LEXICON = os.path.join("data", "default_wordnet.json")
+DEFAULT_PORT = 8000
+
+# Thread per la costruzione delle reti e reti mantenute in cache
+BUILD_WORKERS = 4
+SERVICE_CACHE_SIZE = 256
+# Connessioni in attesa di essere accettate (molti client si collegano insieme)
+BACKLOG = 1024
+# Dimensione massima di riga di richiesta e header
+MAX_HEADER_SIZE = 16 * 1024
+
+CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "json": "application/json; charset=utf-8",
+    "graphml": "application/xml; charset=utf-8",
+    "dot": "text/vnd.graphviz; charset=utf-8",
+}
+
+_REASONS = {
+    200: "OK", 204: "No Content", 304: "Not Modified", 400: "Bad Request",
+    404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error",
+}
+
+
+class BadRequest(Exception):
+    """
+    Parametri della richiesta non validi; il messaggio è restituito al client.
+    """
+
+
+class Response:
+    """
+    Risposta HTTP già pronta da inviare: stato, header aggiuntivi e corpo.
+    """
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, body: bytes = b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    @classmethod
+    def error(cls, status: int, message: str):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return cls(status, body, {"Content-Type": CONTENT_TYPES["json"]})
+
+
+def parse_network_query(query: str, emotions) -> tuple:
+    """
+    Legge i parametri di /network.
+
+    :param query: Query string della richiesta.
+    :param emotions: Emozioni del lessico.
+    :return: Tupla (emozioni selezionate, profondità, archi entranti, formato).
+    :raises BadRequest: Se un parametro manca o non è valido.
+    """
+    params = parse_qs(query)
+
+    def single(name, default):
+        values = params.get(name)
+        return values[-1] if values else default
+
+    selection = []
+    for value in params.get("emotions", []):
+        for name in value.split(","):
+            name = name.strip().lower()
+            if name and name not in selection:
+                selection.append(name)
+    if not selection:
+        raise BadRequest("Parametro 'emotions' mancante.")
+    unknown = [name for name in selection if name not in emotions]
+    if unknown:
+        raise BadRequest(f"Emozioni non presenti nel lessico: {', '.join(unknown)}")
+
+    try:
+        depth = int(single("depth", "1"))
+    except ValueError:
+        raise BadRequest("Il parametro 'depth' deve essere un intero.") from None
+    if not 1 <= depth <= MAX_DEPTH:
+        raise BadRequest(f"Il parametro 'depth' deve essere compreso fra 1 e {MAX_DEPTH}.")
+
+    include_incoming = single("incoming", "0").lower() in ("1", "true", "yes")
+    fmt = single("format", "html").lower()
+    if fmt not in FORMATS:
+        raise BadRequest(f"Formato non supportato: {fmt} (ammessi: {', '.join(sorted(FORMATS))}).")
+    return selection, depth, include_incoming, fmt
+
+
+class NetworkService:
+    """
+    Logica del servizio, indipendente dal trasporto: trasforma percorso e query in una
+    Response. Il modello non viene mai modificato dopo il caricamento.
+    """
+    def __init__(self, model: EmotionModel, root: str = ".", workers: int = BUILD_WORKERS,
+                 cache_size: int = SERVICE_CACHE_SIZE):
+        """
+        :param model: EmotionModel già caricato, condiviso da tutte le richieste.
+        :param root: Cartella di base dell'applicazione (contenente `lib/`).
+        :param workers: Thread per la costruzione delle reti.
+        :param cache_size: Numero di risposte mantenute in cache.
+        """
+        self.model = model
+        self.assets = load_assets(root)
+        self.cache = NetworkCache(cache_size)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="network")
+        # Costruzioni in corso, condivise dalle richieste identiche
+        self._pending = {}
+        self._emotions_body = json.dumps(list(model.emotions), ensure_ascii=False).encode("utf-8")
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _render(self, selection, depth, include_incoming, fmt) -> bytes:
+        # Eseguita su un thread del pool: la rete è creata e serializzata per questa richiesta
+        network = build_selected_network(self.model, selection, depth, include_incoming)
+        apply_layout(network)
+        return FORMATS[fmt][1](network).encode("utf-8")
+
+    async def network(self, query: str) -> Response:
+        """
+        Risposta di /network per la query indicata.
+        """
+        try:
+            selection, depth, include_incoming, fmt = parse_network_query(query, self.model.emotions)
+        except BadRequest as e:
+            return Response.error(400, str(e))
+
+        # L'ordine delle emozioni determina l'ordine dei nodi nella risposta: fa parte della chiave
+        key = network_key(self.model.version, selection, depth, include_incoming) + (fmt, tuple(selection))
+        body = self.cache.get(key)
+        if body is None:
+            future = self._pending.get(key)
+            if future is None:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(self._executor, self._render, selection, depth, include_incoming, fmt)
+                self._pending[key] = future
+                future.add_done_callback(lambda _: self._pending.pop(key, None))
+            body = await asyncio.shield(future)
+            self.cache.put(key, body)
+        return Response(200, body, {"Content-Type": CONTENT_TYPES[fmt], "Cache-Control": "no-cache"})
+
+    def asset(self, path: str, request_headers) -> Response:
+        """
+        Risposta per un asset statico, con ETag e compressione gzip se accettata.
+        """
+        asset = self.assets.get(path)
+        if asset is None:
+            return Response.error(404, "Risorsa non trovata.")
+        headers = {"ETag": asset.etag, "Cache-Control": asset.cache_control}
+        if request_headers.get("if-none-match") == asset.etag:
+            return Response(304, b"", headers)
+        headers["Content-Type"] = asset.content_type
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request_headers.get("accept-encoding", "") and asset.gzip_body:
+            headers["Content-Encoding"] = "gzip"
+            return Response(200, asset.gzip_body, headers)
+        return Response(200, asset.body, headers)
+
+    async def handle(self, method: str, target: str, request_headers) -> Response:
+        """
+        Instrada una richiesta.
+
+        :param method: Metodo HTTP.
+        :param target: Percorso con l'eventuale query string.
+        :param request_headers: Header della richiesta (nomi in minuscolo).
+        """
+        if method not in ("GET", "HEAD"):
+            return Response.error(405, "Metodo non consentito.")
+        url = urlsplit(target)
+        if url.path == "/network":
+            return await self.network(url.query)
+        if url.path == "/emotions":
+            return Response(200, self._emotions_body, {"Content-Type": CONTENT_TYPES["json"]})
+        if url.path == HEALTH_PATH:
+            return Response(204)
+        return self.asset(url.path, request_headers)
+
+
+async def _read_request(reader):
+    """
+    Legge riga di richiesta e header.
+
+    :return: Tupla (metodo, percorso, versione, header) oppure None a connessione chiusa.
+    :raises BadRequest: Se la richiesta non è valida.
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise BadRequest("Richiesta incompleta.") from None
+    except asyncio.LimitOverrunError:
+        raise BadRequest("Header troppo lunghi.") from None
+
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+        raise BadRequest("Riga di richiesta non valida.")
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    # Eventuale corpo (non usato) scartato per mantenere allineata la connessione
+    length = headers.get("content-length")
+    if length:
+        if not length.isdigit():
+            raise BadRequest("Content-Length non valido.")
+        await reader.readexactly(int(length))
+    return parts[0], parts[1], parts[2], headers
+
+
+def _encode_response(response: Response, keep_alive: bool, head_only: bool) -> bytes:
+    lines = [f"HTTP/1.1 {response.status} {_REASONS.get(response.status, '')}"]
+    for name, value in response.headers.items():
+        lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(response.body)}")
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head if head_only else head + response.body
+
+
+async def serve_connection(service: NetworkService, reader, writer):
+    """
+    Serve le richieste di una connessione finché il client non la chiude.
+    """
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except BadRequest as e:
+                writer.write(_encode_response(Response.error(400, str(e)), False, False))
+                break
+            if request is None:
+                break
+            method, target, version, headers = request
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+            try:
+                response = await service.handle(method, target, headers)
+            except Exception as e:
+                response = Response.error(500, f"Errore interno: {e}")
+            writer.write(_encode_response(response, keep_alive, method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_service(service: NetworkService, host: str = "127.0.0.1", port: int = DEFAULT_PORT, ready=None):
+    """
+    Avvia il servizio e lo mantiene attivo fino all'annullamento.
+
+    :param ready: Funzione chiamata con (host, porta) quando il servizio è in ascolto.
+    """
+    server = await asyncio.start_server(
+        lambda reader, writer: serve_connection(service, reader, writer),
+        host, port, backlog=BACKLOG, limit=MAX_HEADER_SIZE,
+    )
+    async with server:
+        if ready is not None:
+            ready(*server.sockets[0].getsockname()[:2])
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servizio HTTP che genera le reti delle emozioni su richiesta.")
+    parser.add_argument("-l", "--lexicon", default=DEFAULT_LEXICON, help="File JSON del lessico.")
+    parser.add_argument("--host", default="127.0.0.1", help="Indirizzo su cui mettersi in ascolto.")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT, help="Porta (0 = scelta dal sistema).")
+    parser.add_argument("-j", "--workers", type=int, default=BUILD_WORKERS, help="Thread per la costruzione delle reti.")
+    args = parser.parse_args(argv)
+
+    model = EmotionModel()
+    try:
+        model.load_from_json(args.lexicon)
+    except (OSError, ValueError) as e:
+        print(f"Errore: {e}", file=sys.stderr)
+        return 2
+
+    service = NetworkService(model, root=os.path.dirname(os.path.abspath(__file__)), workers=args.workers)
+
+    def ready(host, port):
+        print(f"Servizio avviato su http://{host}:{port}/", flush=True)
+
+    try:
+        asyncio.run(run_service(service, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
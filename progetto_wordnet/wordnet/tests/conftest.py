@@ -0,0 +1,71 @@
+# conftest.py
+
+import json
+import os
+import sys
+
+import pytest
+
+# I test importano i moduli dell'applicazione come se fossero eseguiti da questa cartella
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+# Finestre Qt create senza display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Importato dopo aver aggiunto APP_DIR al path
+from model.emotion_model import EmotionModel
+
+
+# Piccolo lessico usato dai test del modello: due emozioni opposte con le loro
+# gerarchie, un'emozione che cita "gioia" e una componente separata dal resto
+LEXICON = {
+    "gioia": {
+        "synonyms": ["felicità"],
+        "antonyms": ["tristezza"],
+        "hyponyms": ["entusiasmo", "serenità"],
+        "hypernyms": ["emozione positiva"],
+        "related": ["amore"],
+    },
+    "tristezza": {
+        "synonyms": ["malinconia"],
+        "antonyms": ["gioia"],
+        "hyponyms": ["nostalgia"],
+        "hypernyms": ["emozione negativa"],
+        "related": [],
+    },
+    "amore": {
+        "synonyms": [],
+        "antonyms": [],
+        "hyponyms": ["affetto"],
+        "hypernyms": ["emozione positiva"],
+        "related": ["gioia"],
+    },
+    "entusiasmo": {
+        "synonyms": [],
+        "antonyms": [],
+        "hyponyms": ["euforia"],
+        "hypernyms": [],
+        "related": [],
+    },
+    "solitudine": {
+        "synonyms": ["isolamento"],
+        "antonyms": [],
+        "hyponyms": [],
+        "hypernyms": [],
+        "related": [],
+    },
+}
+
+
+@pytest.fixture
+def model(tmp_path):
+    """
+    EmotionModel caricato da un file JSON con il lessico di prova.
+    """
+    path = tmp_path / "lessico.json"
+    path.write_text(json.dumps({"emozioni": LEXICON}, ensure_ascii=False), encoding="utf-8")
+    emotion_model = EmotionModel()
+    emotion_model.load_from_json(str(path))
+    return emotion_model
@@ -0,0 +1,71 @@
+# test_background_tasks.py
+
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtWidgets import QApplication
+
+from background_tasks import TaskRunner
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def wait_for(app, condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+def test_private_pool_with_spare_thread():
+    runner = TaskRunner()
+    assert runner.pool is not QThreadPool.globalInstance()
+    assert runner.pool.maxThreadCount() >= 2
+
+
+def test_newer_request_stops_the_stale_one(app):
+    runner = TaskRunner()
+    started = threading.Event()
+    steps = []
+
+    def stale(progress):
+        started.set()
+        for step in range(1000):
+            steps.append(step)
+            progress(step / 1000)
+            time.sleep(0.001)
+        return "stale"
+
+    results, fractions = [], []
+    runner.submit("network", stale, results.append, on_progress=fractions.append)
+    assert started.wait(5)
+    runner.submit("network", lambda progress: "current", results.append)
+
+    assert runner.wait(5000)
+    assert wait_for(app, lambda: results)
+    assert results == ["current"]
+    assert len(steps) < 1000
+    assert all(0.0 <= fraction < 1.0 for fraction in fractions)
+
+
+def test_queued_request_is_dropped(app):
+    runner = TaskRunner()
+    release = threading.Event()
+    calls = []
+
+    # Occupa tutti i thread del pool, così le richieste successive restano in coda
+    for i in range(runner.pool.maxThreadCount()):
+        runner.submit(f"busy{i}", lambda progress: release.wait(5), lambda _: None)
+    runner.submit("network", lambda progress: calls.append("stale"), lambda _: None)
+    runner.submit("network", lambda progress: calls.append("current"), lambda _: None)
+    release.set()
+
+    assert runner.wait(5000)
+    app.processEvents()
+    assert calls == ["current"]
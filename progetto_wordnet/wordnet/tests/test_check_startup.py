@@ -0,0 +1,24 @@
+# test_check_startup.py
+
+import os
+
+import pytest
+
+import check_startup
+
+
+def test_heavy_modules_not_imported_before_start():
+    """
+    A splash visibile i moduli pesanti non sono ancora stati importati.
+    """
+    _, modules = check_startup.measure_first_paint()
+    assert [name for name in check_startup.FORBIDDEN_MODULES if name in modules] == []
+
+
+@pytest.mark.skipif(os.environ.get("CHECK_STARTUP") != "1",
+                    reason="misura di tempo: eseguita solo con CHECK_STARTUP=1")
+def test_startup_within_budget():
+    """
+    Il tempo di 'import main' e del primo disegno dello splash restano entro i budget.
+    """
+    assert check_startup.main([]) == 0
@@ -0,0 +1,42 @@
+# test_dataset_ingest.py
+
+from model.dataset_ingest import load_records, read_file, sniff_format
+
+
+def write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_single_column_strips_quotes(tmp_path):
+    path = write(tmp_path, "Joy_Phrases.csv",
+                 'joy\n"I am so happy, really"\nwhat a day, wow\n\n"a quoted\nsentence"\n"plain"\n')
+    file_format = sniff_format(path)
+    assert file_format.delimiter is None and file_format.has_header
+    texts, labels = load_records([path], use_cache=False)
+    assert texts == ["I am so happy, really", "what a day, wow", "a quoted\nsentence", "plain"]
+    assert set(labels) == {"joy"}
+
+
+def test_label_from_file_name(tmp_path):
+    path = write(tmp_path, "Joy_Phrases.csv", "I feel great today\nwhat a lovely morning\n")
+    texts, labels = load_records([path], use_cache=False)
+    assert texts == ["I feel great today", "what a lovely morning"]
+    assert labels == ["joy", "joy"]
+
+
+def test_columns_aliases_and_duplicates(tmp_path):
+    path = write(tmp_path, "emotions.csv",
+                 'text;label\n"Ciao; come stai";Happiness\n"Ciao; come stai";joy\nche rabbia;anger\n;anger\n')
+    texts, labels = load_records([path], use_cache=False)
+    assert texts == ["Ciao; come stai", "che rabbia"]
+    assert labels == ["joy", "anger"]
+
+
+def test_cache_round_trip(tmp_path):
+    path = write(tmp_path, "emotions.csv", "text,label\nbello,joy\nbrutto,sadness\n")
+    parsed = read_file(path)
+    cached = read_file(path)
+    assert list(cached.texts()) == list(parsed.texts()) == ["bello", "brutto"]
+    assert list(cached.labels()) == list(parsed.labels())
@@ -0,0 +1,56 @@
+# test_emotion_index.py
+
+import pytest
+
+from model.emotion_index import EmotionIndex, EmotionIndexBuilder, RELATIONS
+from conftest import LEXICON
+
+
+def terms(index, ids):
+    return sorted(index.term(i) for i in ids)
+
+
+def test_emotions_come_first_in_file_order(model):
+    index = model.index
+    assert index.n_emotions == len(LEXICON)
+    assert [index.term(i) for i in range(index.n_emotions)] == list(LEXICON)
+    assert index.is_emotion(index.id_of("amore"))
+    assert not index.is_emotion(index.id_of("felicità"))
+    assert index.id_of("inesistente") is None
+    assert "euforia" in index and "inesistente" not in index
+
+
+@pytest.mark.parametrize("relation", RELATIONS)
+def test_neighbours_match_lexicon(model, relation):
+    index = model.index
+    for name, data in LEXICON.items():
+        assert terms(index, index.neighbours(index.id_of(name), relation)) == sorted(data[relation])
+
+
+def test_incoming_edges_and_degrees(model):
+    index = model.index
+    gioia = index.id_of("gioia")
+    incoming = sorted((relation, index.term(source)) for relation, source in index.in_edges(gioia))
+    assert incoming == [("antonyms", "tristezza"), ("related", "amore")]
+    assert index.in_degree(gioia) == 2
+    assert index.out_degree(gioia) == 6
+    assert index.out_degree(gioia, "hyponyms") == 2
+    assert index.in_degree(index.id_of("emozione positiva"), "hypernyms") == 2
+    assert index.edge_count() == sum(len(data[r]) for data in LEXICON.values() for r in RELATIONS)
+
+
+def test_state_round_trip(model):
+    index = model.index
+    restored = EmotionIndex.from_state(index.to_state())
+    assert restored.terms == index.terms
+    assert restored.n_emotions == index.n_emotions
+    for node_id in range(len(index)):
+        assert list(restored.out_edges(node_id)) == list(index.out_edges(node_id))
+        assert list(restored.in_edges(node_id)) == list(index.in_edges(node_id))
+
+
+def test_duplicate_emotion_is_rejected():
+    builder = EmotionIndexBuilder()
+    builder.add("gioia", LEXICON["gioia"])
+    with pytest.raises(ValueError):
+        builder.add("gioia", LEXICON["gioia"])
@@ -0,0 +1,61 @@
+# test_graph_analytics.py
+
+import numpy as np
+import pytest
+
+from model.emotion_index import EmotionIndex
+from model.graph_analytics import GraphAnalytics, analytics_for, describe_path
+
+
+@pytest.fixture
+def analytics(model):
+    return GraphAnalytics(model.index)
+
+
+def test_shortest_path(analytics):
+    path = analytics.shortest_path("malinconia", "amore")
+    assert path.terms == ["malinconia", "tristezza", "gioia", "amore"]
+    assert path.relations == ["synonyms", "antonyms", "related"]
+    assert path.cost == len(path) == 3
+    assert path.edges()[0] == ("malinconia", "tristezza", "synonyms")
+
+
+def test_path_follows_edges_backwards(analytics):
+    # L'arco è gioia -> entusiasmo (iponimo): al contrario entusiasmo ha gioia come iperonimo
+    path = analytics.shortest_path("entusiasmo", "gioia")
+    assert path.terms == ["entusiasmo", "gioia"]
+    assert path.relations == ["hypernyms"]
+
+
+def test_relation_filter_and_unconnected_terms(analytics):
+    assert analytics.shortest_path("gioia", "solitudine") is None
+    assert analytics.shortest_path("malinconia", "amore", relations=["synonyms", "related"]) is None
+    path = analytics.shortest_path("euforia", "emozione positiva", relations=["hyponyms", "hypernyms"])
+    assert path.terms == ["euforia", "entusiasmo", "gioia", "emozione positiva"]
+    with pytest.raises(ValueError):
+        analytics.shortest_path("gioia", "inesistente")
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_one_directional_relation_filter(analytics, weighted):
+    # Da gioia si scende negli iponimi, da euforia si risale negli iperonimi
+    path = analytics.shortest_path("gioia", "euforia", relations=["hyponyms"], weighted=weighted)
+    assert path.terms == ["gioia", "entusiasmo", "euforia"]
+    assert path.relations == ["hyponyms", "hyponyms"]
+    path = analytics.shortest_path("euforia", "gioia", relations=["hypernyms"], weighted=weighted)
+    assert path.terms == ["euforia", "entusiasmo", "gioia"]
+    assert path.relations == ["hypernyms", "hypernyms"]
+    assert analytics.shortest_path("gioia", "euforia", relations=["hypernyms"], weighted=weighted) is None
+    assert analytics.shortest_path("euforia", "gioia", relations=["hyponyms"], weighted=weighted) is None
+
+
+def test_both_directions_of_an_edge_agree():
+    # a e b sono iponimi l'uno dell'altro: fra i due resta una sola relazione, letta al
+    # contrario nell'altro verso
+    analytics = GraphAnalytics(EmotionIndex.from_emotions({
+        "a": {"hyponyms": ["b"]},
+        "b": {"hyponyms": ["a"]},
+    }))
+    forward = analytics.shortest_path("a", "b").relations[0]
+    backward = analytics.shortest_path("b", "a").relations[0]
+    assert {forward, backward} == {"hyponyms", "hypernyms"}
@@ -0,0 +1,35 @@
+# test_hierarchy.py
+
+import json
+
+from model.emotion_model import EmotionModel
+
+
+def test_descendants_and_ancestors(model):
+    hierarchy = model.hierarchy
+    assert sorted(hierarchy.descendants("emozione positiva")) == [
+        "affetto", "amore", "entusiasmo", "euforia", "gioia", "serenità"]
+    assert sorted(hierarchy.ancestors("euforia")) == ["emozione positiva", "entusiasmo", "gioia"]
+    assert hierarchy.is_a("euforia", "gioia")
+    assert not hierarchy.is_a("gioia", "euforia")
+    assert not hierarchy.is_a("nostalgia", "emozione positiva")
+    assert hierarchy.descendants("solitudine") == []
+    assert hierarchy.cycles == []
+
+
+def test_cycles_are_collapsed(tmp_path):
+    lexicon = {
+        "a": {"hyponyms": ["b"]},
+        "b": {"hyponyms": ["c"]},
+        "c": {"hyponyms": ["a", "d"]},
+    }
+    path = tmp_path / "ciclo.json"
+    path.write_text(json.dumps({"emozioni": lexicon}), encoding="utf-8")
+    model = EmotionModel()
+    model.load_from_json(str(path))
+
+    hierarchy = model.hierarchy
+    assert [sorted(cycle) for cycle in hierarchy.cycles] == [["a", "b", "c"]]
+    assert sorted(hierarchy.descendants("a")) == ["b", "c", "d"]
+    assert sorted(hierarchy.ancestors("d")) == ["a", "b", "c"]
+    assert hierarchy.is_a("a", "c") and hierarchy.is_a("c", "a")
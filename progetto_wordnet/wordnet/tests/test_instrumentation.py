@@ -0,0 +1,58 @@
+# test_instrumentation.py
+
+import pytest
+from PyQt5.QtWidgets import QApplication, QPushButton
+
+from instrumentation import Tracer
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.enable()
+    yield tracer
+    tracer.disable()
+
+
+def test_traced_keeps_function_metadata(tracer):
+    @tracer.traced("test.slot")
+    def slot():
+        """Documentazione."""
+
+    assert slot.__name__ == "slot"
+    assert slot.__doc__ == "Documentazione."
+
+
+def test_traced_slot_connected_to_clicked(app, tracer):
+    class Controller:
+        def __init__(self):
+            self.calls = []
+
+        @tracer.traced("test.click")
+        def generate(self):
+            self.calls.append(True)
+
+    controller = Controller()
+    button = QPushButton("Genera")
+    # Come in view/emotion_view.py: la lambda scarta l'argomento `checked` di clicked
+    button.clicked.connect(lambda: controller.generate())
+    button.click()
+    button.click()
+
+    assert controller.calls == [True, True]
+    assert tracer.summary()["test.click"]["count"] == 2
+    assert tracer.summary()["test.click"]["errors"] == 0
+
+
+def test_controller_slots_are_traced_and_wrapped():
+    from controller_model import MainController
+
+    for name in ("generate_selected_network", "show_subtree", "filter_emotions", "search_word"):
+        slot = getattr(MainController, name)
+        assert slot.__name__ == name
+        assert slot.__wrapped__.__qualname__ == f"MainController.{name}"
@@ -0,0 +1,36 @@
+# test_lexicon_search.py
+
+import random
+
+from model.emotion_index import EmotionIndex
+from model.lexicon_search import LexiconSearch
+from model.search_index import bounded_edit_distance, max_typos
+
+
+def search_for(words):
+    return LexiconSearch(EmotionIndex.from_emotions({word: {} for word in words}))
+
+
+def test_exact_prefix_and_accents(model):
+    search = model.lexicon_search
+    assert search.search("Felicita")[0] == "felicità"
+    assert set(search.search("emozione")) == {"emozione positiva", "emozione negativa"}
+    assert search.search("tristeza")[0] == "tristezza"
+    assert "gioia" in search.related_emotions("entusiasmo")
+
+
+def test_two_typos_in_query_with_repeated_letters():
+    # "bbbbee" ha solo sei trigrammi distinti: il filtro dei trigrammi non esclude nulla
+    assert search_for(["bacbee", "gioia"]).search("bbbbee") == ["bacbee"]
+
+
+def test_fuzzy_matches_all_keys_within_range():
+    rnd = random.Random(1)
+    for alphabet in ("ab", "abce", "abcdefgh"):
+        words = {"".join(rnd.choice(alphabet) for _ in range(rnd.randint(3, 9))) for _ in range(300)}
+        search = search_for(words)
+        for _ in range(30):
+            query = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(6, 9)))
+            k = max_typos(query)
+            found = {search._keys[key_id] for key_id in search._fuzzy_ids(query, len(words))}
+            assert found == {word for word in words if bounded_edit_distance(query, word, k) <= k}
@@ -0,0 +1,99 @@
+# test_network_builder.py
+
+import pytest
+
+from model.network_builder import (RELATION_COLORS, NetworkData, build_selected_network,
+                                   build_subtree_network, edge_id)
+
+
+def endpoints(network):
+    return {term for key in network.edges for term in key}
+
+
+def test_direct_relations(model):
+    network = build_selected_network(model, ["gioia"])
+    assert set(network.nodes) == {"gioia", "felicità", "tristezza", "entusiasmo", "serenità",
+                                  "emozione positiva", "amore"}
+    assert len(network.edges) == 6
+    assert not network.truncated
+    for edge in network.edge_list():
+        assert edge["color"] == RELATION_COLORS[edge["relation"]]
+    edge = network.edges[("gioia", "tristezza")]
+    assert edge["relation"] == "antonyms"
+    assert edge["id"] == edge_id("gioia", "tristezza")
+
+
+def test_depth_expands_emotions_only(model):
+    network = build_selected_network(model, ["gioia"], depth=2)
+    # Al secondo livello si espandono tristezza, amore ed entusiasmo (emozioni), non felicità
+    assert {"malinconia", "affetto", "euforia"} <= set(network.nodes)
+    # L'arco gioia-amore compare in entrambi i versi nel lessico ma una sola volta nella rete
+    assert sum(1 for key in network.edges if set(key) == {"gioia", "amore"}) == 1
+
+
+def test_incoming_edges(model):
+    network = build_selected_network(model, ["emozione positiva"], include_incoming=True)
+    assert set(network.nodes) == {"emozione positiva", "gioia", "amore"}
+    assert {edge["relation"] for edge in network.edge_list()} == {"hypernyms"}
+
+
+@pytest.mark.parametrize("max_edges", [1, 2, 5, 8])
+def test_edge_limit_leaves_no_orphan_nodes(model, max_edges):
+    network = build_selected_network(model, ["gioia", "tristezza"], depth=3, max_edges=max_edges)
+    assert network.truncated
+    assert len(network.edges) == max_edges
+    assert set(network.nodes) - {"gioia", "tristezza"} <= endpoints(network)
+
+
+def test_node_limit(model):
+    network = build_selected_network(model, ["gioia"], depth=3, max_nodes=4)
+    assert network.truncated
+    assert len(network.nodes) == 4
+    assert set(network.nodes) - {"gioia"} <= endpoints(network)
+
+
+def test_progress_and_interruption(model):
+    fractions = []
+    build_selected_network(model, ["gioia"], depth=3, progress=fractions.append)
+    assert fractions == sorted(fractions) and fractions[0] == 0.0 and fractions[-1] < 1.0
+
+    class Cancelled(Exception):
+        pass
+
+    def cancel(fraction):
+        if fraction > 0:
+            raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        build_selected_network(model, ["gioia"], depth=3, progress=cancel)
+
+    fractions = []
+    build_subtree_network(model, ["emozione positiva"], progress=fractions.append)
+    assert fractions == sorted(fractions) and fractions[0] == 0.0 and fractions[-1] <= 1.0
+
+
+def test_subtree(model):
+    network = build_subtree_network(model, ["emozione positiva"])
+    assert set(network.nodes) == {"emozione positiva", "gioia", "amore", "entusiasmo", "serenità",
+                                  "euforia", "affetto"}
+    assert len(network.edges) == len(network.nodes) - 1
+    assert {edge["relation"] for edge in network.edge_list()} == {"hyponyms"}
+
+
+def test_diff():
+    old, new = NetworkData(), NetworkData()
+    for term in ("a", "b", "c"):
+        old.add_node(term)
+    old.add_edge("a", "b", "synonyms")
+    old.add_edge("b", "c", "related")
+    for term in ("a", "b", "d"):
+        new.add_node(term)
+    new.add_edge("a", "b", "synonyms")
+    new.add_edge("a", "d", "antonyms")
+
+    diff = old.diff(new)
+    assert diff["remove_nodes"] == ["c"]
+    assert [node["id"] for node in diff["upsert_nodes"]] == ["d"]
+    assert diff["remove_edges"] == [edge_id("b", "c")]
+    assert [edge["id"] for edge in diff["upsert_edges"]] == [edge_id("a", "d")]
+    assert "options" not in diff
@@ -0,0 +1,28 @@
+# test_network_export.py
+
+import json
+import xml.etree.ElementTree as ET
+
+from model.network_builder import build_selected_network
+from model.network_export import to_dot, to_graphml, to_json
+
+GRAPHML = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+def test_exports_carry_edge_relations(model):
+    network = build_selected_network(model, ["gioia"])
+    relations = {frozenset((edge["from"], edge["to"])): edge["relation"] for edge in network.edge_list()}
+
+    data = json.loads(to_json(network))
+    assert len(data["nodes"]) == len(network.nodes)
+    assert {frozenset((e["from"], e["to"])): e["relation"] for e in data["edges"]} == relations
+
+    graph = ET.fromstring(to_graphml(network)).find(f"{GRAPHML}graph")
+    exported = {}
+    for edge in graph.findall(f"{GRAPHML}edge"):
+        relation = next(d.text for d in edge.findall(f"{GRAPHML}data") if d.get("key") == "relation")
+        exported[frozenset((edge.get("source"), edge.get("target")))] = relation
+    assert exported == relations
+
+    dot = to_dot(network)
+    assert '"gioia" -- "tristezza" [color="#BF3100", label="antonyms"];' in dot
@@ -0,0 +1,144 @@
+# emotion_list_model.py
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+"""
+Modelli Qt per la lista delle emozioni della finestra principale.
+
+EmotionListModel espone direttamente i termini internati dell'EmotionIndex: le emozioni
+occupano gli id 0..n_emotions-1, quindi la riga coincide con l'id del termine, che resta
+stabile finché il lessico non viene ricaricato. Non viene creato alcun elemento per riga:
+il testo è calcolato in data() solo per le righe che la vista disegna.
+
+EmotionFilterProxyModel mostra un sottoinsieme delle righe come un QSortFilterProxyModel,
+ma invece di interrogare ogni riga della sorgente riceve direttamente gli id visibili
+(già calcolati dalla ricerca sul lessico): applicare un filtro costa quanto il numero
+di righe che restano visibili, non quanto la lista intera.
+"""
+
+# Ruolo con l'id stabile del termine (coincide con la riga della sorgente)
+IdRole = Qt.UserRole
+# Ruolo con la chiave dell'emozione (in minuscolo, come nel modello)
+KeyRole = Qt.UserRole + 1
+
+
+class EmotionListModel(QAbstractListModel):
+    """
+    Lista in sola lettura delle emozioni di un EmotionIndex.
+    """
+    def __init__(self, index, parent=None):
+        """
+        :param index: EmotionIndex del modello caricato.
+        :param parent: QObject genitore.
+        """
+        super().__init__(parent)
+        self._terms = index.terms
+        self._count = index.n_emotions
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self.row_data(index.row(), role)
+
+    def row_data(self, row: int, role=Qt.DisplayRole):
+        """
+        Dato di una riga per il ruolo indicato (DisplayRole, KeyRole o IdRole).
+        """
+        if role == Qt.DisplayRole:
+            return self._terms[row].capitalize()
+        if role == KeyRole:
+            return self._terms[row]
+        if role == IdRole:
+            return row
+        return None
+
+    def key(self, emotion_id: int) -> str:
+        """
+        Restituisce la chiave dell'emozione con l'id indicato.
+        """
+        return self._terms[emotion_id]
+
+
+class EmotionFilterProxyModel(QAbstractListModel):
+    """
+    Vista filtrata di EmotionListModel: tutte le righe, oppure solo gli id indicati
+    (nell'ordine della sorgente).
+
+    È un modello a lista e non un QAbstractProxyModel: QListView chiede l'indice di ogni
+    riga durante il layout, e con QAbstractListModel la creazione degli indici resta in
+    C++ (in Python viene chiamato solo rowCount, che restituisce un valore precalcolato).
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source = None
+        # Righe della sorgente visibili (None = tutte) e mappa inversa, calcolata su richiesta
+        self._rows = None
+        self._proxy_rows = None
+        self._row_count = 0
+
+    def sourceModel(self):
+        return self._source
+
+    def setSourceModel(self, source: EmotionListModel):
+        self.beginResetModel()
+        self._source = source
+        self._rows = self._proxy_rows = None
+        self._row_count = source.rowCount() if source is not None else 0
+        self.endResetModel()
+
+    def set_visible_ids(self, ids):
+        """
+        Mostra solo le righe con gli id indicati.
+
+        :param ids: Id delle emozioni da mostrare (anche non ordinati), oppure None per tutte.
+        """
+        self.beginResetModel()
+        self._rows = None if ids is None else sorted(set(ids))
+        self._proxy_rows = None
+        self._row_count = self._source.rowCount() if self._rows is None else len(self._rows)
+        self.endResetModel()
+
+    def is_filtered(self) -> bool:
+        return self._rows is not None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        return self._source.row_data(self.emotion_id(index.row()), role)
+
+    def mapToSource(self, proxy_index):
+        """
+        Indice della sorgente corrispondente a una riga visibile.
+        """
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self._source.index(self.emotion_id(proxy_index.row()), 0)
+
+    def mapFromSource(self, source_index):
+        """
+        Indice visibile corrispondente a una riga della sorgente (non valido se filtrata).
+        """
+        row = self.proxy_row(source_index.row()) if source_index.isValid() else None
+        return QModelIndex() if row is None else self.index(row, 0)
+
+    def proxy_row(self, emotion_id: int):
+        """
+        Riga visibile dell'emozione con l'id indicato, oppure None se è filtrata.
+        """
+        if self._rows is None:
+            return emotion_id
+        if self._proxy_rows is None:
+            self._proxy_rows = {source_row: row for row, source_row in enumerate(self._rows)}
+        return self._proxy_rows.get(emotion_id)
+
+    def emotion_id(self, row: int) -> int:
+        """
+        Id stabile dell'emozione nella riga visibile indicata.
+        """
+        return row if self._rows is None else self._rows[row]
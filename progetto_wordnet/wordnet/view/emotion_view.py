@@ -1,13 +1,17 @@
 import sys
 from PyQt5.QtWidgets import (
     QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
-    QListWidget, QPushButton, QTextEdit, QLabel, QLineEdit,
-    QMessageBox,
+    QListView, QPushButton, QTextEdit, QLabel, QLineEdit,
+    QMessageBox, QProgressBar, QSpinBox, QCheckBox,
 )
 from PyQt5.QtWebEngineWidgets import QWebEngineView  # Per visualizzare il file HTML della rete
-from PyQt5.QtCore import QUrl  # Per gestire i percorsi dei file
+from PyQt5.QtCore import QUrl, QItemSelection, QItemSelectionModel  # Percorsi e selezione della lista
 from PyQt5.QtGui import QIcon,QPalette, QColor
-from pyvis.network import Network  # Per creare e gestire reti interattive
+
+from view.network_html import to_js_literal
+from instrumentation import start_span
+from view.emotion_list_model import EmotionListModel, EmotionFilterProxyModel, IdRole
+from model.network_builder import MAX_DEPTH
 
 
 class EmotionAppView(QMainWindow):
@@ -32,14 +36,46 @@ class EmotionAppView(QMainWindow):
         self.setGeometry(100, 100, 1400, 900)
 
         # --- Colonna sinistra ---
-        # Lista delle emozioni (multi-selezione)
-        self.list_widget = QListWidget()
-        self.list_widget.setSelectionMode(QListWidget.MultiSelection)
-        self.list_widget.setStyleSheet("font-size: 24px; padding: 10px;")
-
-        # Riempie la lista con le emozioni dal modello
-        for e in self.model.emotions.keys():
-            self.list_widget.addItem(e.capitalize())
+        # Filtro della lista (ricerca su emozioni e relazioni, tollerante agli errori)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtra emozioni...")
+        self.filter_input.setStyleSheet("font-size: 18px; padding: 6px; color: white;")
+        self.filter_input.textChanged.connect(self.controller.filter_emotions)
+
+        # Lista delle emozioni (multi-selezione): un modello Qt sopra l'indice del lessico,
+        # con le righe disegnate solo quando visibili, anche con decine di migliaia di voci
+        self.emotion_list_model = EmotionListModel(self.model.index, self)
+        self.emotion_filter = EmotionFilterProxyModel(self)
+        self.emotion_filter.setSourceModel(self.emotion_list_model)
+        self.list_view = QListView()
+        self.list_view.setModel(self.emotion_filter)
+        self.list_view.setSelectionMode(QListView.MultiSelection)
+        self.list_view.setUniformItemSizes(True)
+        # Layout delle righe a blocchi, così la finestra resta reattiva con liste enormi
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(2000)
+        self.list_view.setStyleSheet("font-size: 24px; padding: 10px;")
+
+        # Id delle emozioni selezionate, nell'ordine di selezione: restano selezionate
+        # anche quando il filtro le nasconde
+        self._selected_ids = {}
+        self._filtering = False
+        self.list_view.selectionModel().selectionChanged.connect(self._on_selection_changed)
+
+        # Controlli per l'espansione su più livelli
+        self.depth_input = QSpinBox()
+        self.depth_input.setRange(1, MAX_DEPTH)
+        self.depth_input.setValue(1)
+        self.depth_input.setStyleSheet("font-size: 18px; padding: 4px;")
+        self.incoming_checkbox = QCheckBox("Includi relazioni entranti")
+        self.incoming_checkbox.setStyleSheet("font-size: 16px;")
+
+        depth_layout = QHBoxLayout()
+        depth_label = QLabel("Profondità:")
+        depth_label.setStyleSheet("font-size: 18px;")
+        depth_layout.addWidget(depth_label)
+        depth_layout.addWidget(self.depth_input)
+        depth_layout.addWidget(self.incoming_checkbox)
 
         # Pulsante per generare la rete
         self.plot_button = QPushButton("Genera Rete")
@@ -53,7 +89,27 @@ class EmotionAppView(QMainWindow):
             border: none;
         """)
         # Collega il pulsante al metodo nel controller
-        self.plot_button.clicked.connect(self.controller.generate_selected_network)
+        self.plot_button.clicked.connect(lambda: self.controller.generate_selected_network())
+
+        # Pulsante per mostrare tutti gli iponimi (a ogni livello) delle emozioni selezionate
+        self.subtree_button = QPushButton("Mostra sottoalbero completo")
+        self.subtree_button.setFixedHeight(40)
+        self.subtree_button.setStyleSheet("""
+            font-size: 16px; 
+            background-color: #7B2CBF; 
+            color: white; 
+            border-radius: 10px; 
+            padding: 8px;
+            border: none;
+        """)
+        self.subtree_button.clicked.connect(lambda: self.controller.show_subtree())
+
+        # Indicatore di attività durante la costruzione della rete in background
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)  # Modalità indeterminata
+        self.busy_bar.setTextVisible(False)
+        self.busy_bar.setFixedHeight(6)
+        self.busy_bar.hide()
 
         # Legenda per i colori e le relazioni
         self.legend = QTextEdit()
@@ -78,8 +134,12 @@ class EmotionAppView(QMainWindow):
 
         # Layout per la colonna sinistra
         left_layout = QVBoxLayout()
-        left_layout.addWidget(self.list_widget, stretch=3)
+        left_layout.addWidget(self.filter_input)
+        left_layout.addWidget(self.list_view, stretch=3)
+        left_layout.addLayout(depth_layout)
         left_layout.addWidget(self.plot_button, stretch=2)
+        left_layout.addWidget(self.subtree_button)
+        left_layout.addWidget(self.busy_bar)
         left_layout.addWidget(self.legend, stretch=4)
 
         # --- Colonna destra ---
@@ -100,15 +160,48 @@ class EmotionAppView(QMainWindow):
         """)
         
         # Collega il pulsante al metodo di ricerca nel controller
-        self.search_button.clicked.connect(self.controller.search_word)
+        self.search_button.clicked.connect(lambda: self.controller.search_word())
 
         # Layout per la barra di ricerca
         search_layout = QHBoxLayout()
         search_layout.addWidget(self.search_input)
         search_layout.addWidget(self.search_button)
 
+        # Percorso minimo fra due parole del lessico
+        self.path_source_input = QLineEdit()
+        self.path_source_input.setPlaceholderText("Da...")
+        self.path_target_input = QLineEdit()
+        self.path_target_input.setPlaceholderText("A...")
+        for path_input in (self.path_source_input, self.path_target_input):
+            path_input.setStyleSheet("font-size: 18px; padding: 6px; color: white;")
+        self.path_weighted_checkbox = QCheckBox("Pesa le relazioni")
+        self.path_weighted_checkbox.setStyleSheet("font-size: 16px;")
+
+        self.path_button = QPushButton("Trova percorso")
+        self.path_button.setFixedHeight(40)
+        self.path_button.setStyleSheet("""
+            font-size: 18px;
+            background-color: #9D4EDD; 
+            color: white; 
+            border-radius: 8px; 
+            padding: 8px;
+            border: none;
+        """)
+        self.path_button.clicked.connect(lambda: self.controller.find_path())
+
+        path_layout = QHBoxLayout()
+        path_layout.addWidget(self.path_source_input)
+        path_layout.addWidget(self.path_target_input)
+        path_layout.addWidget(self.path_weighted_checkbox)
+        path_layout.addWidget(self.path_button)
+
         # Visualizzatore HTML per la rete
         self.web_view = QWebEngineView()
+        # Diventa True quando la pagina della rete è caricata e accetta aggiornamenti via JS
+        self.network_ready = False
+        # Misura del caricamento della pagina in corso (vedi instrumentation.py)
+        self._page_load_span = None
+        self.web_view.loadFinished.connect(self._on_load_finished)
 
         # Area dei dettagli della rete
         self.details = QTextEdit()
@@ -127,6 +220,7 @@ class EmotionAppView(QMainWindow):
         # Layout per la colonna destra
         right_layout = QVBoxLayout()
         right_layout.addLayout(search_layout)
+        right_layout.addLayout(path_layout)
         right_layout.addWidget(self.web_view, stretch=7)
         right_layout.addWidget(self.details, stretch=3)
 
@@ -147,7 +241,32 @@ class EmotionAppView(QMainWindow):
         Restituisce le emozioni selezionate nella lista.
         :return: Lista di emozioni selezionate (in minuscolo).
         """
-        return [item.text().lower() for item in self.list_widget.selectedItems()]
+        return [self.emotion_list_model.key(emotion_id) for emotion_id in self._selected_ids]
+
+    def get_selected_ids(self):
+        """
+        Restituisce gli id (nell'indice del lessico) delle emozioni selezionate.
+        :return: Lista di id, nell'ordine di selezione.
+        """
+        return list(self._selected_ids)
+
+    def _on_selection_changed(self, selected, deselected):
+        """
+        Aggiorna gli id selezionati quando l'utente cambia la selezione nella lista.
+        """
+        if self._filtering:
+            return
+        for index in deselected.indexes():
+            self._selected_ids.pop(index.data(IdRole), None)
+        for index in selected.indexes():
+            self._selected_ids.setdefault(index.data(IdRole), None)
+
+    def get_expansion_options(self):
+        """
+        Restituisce le opzioni di espansione della rete scelte dall'utente.
+        :return: Coppia (profondità, includi archi entranti).
+        """
+        return self.depth_input.value(), self.incoming_checkbox.isChecked()
 
     def alert_no_emotions_selected(self):
         """
@@ -155,6 +274,23 @@ class EmotionAppView(QMainWindow):
         """
         QMessageBox.information(self, "Info", "Nessuna emozione selezionata!")
 
+    def set_busy(self, busy):
+        """
+        Mostra o nasconde l'indicatore di costruzione della rete in corso.
+        :param busy: True mentre la rete viene costruita in background.
+        """
+        if busy:
+            self.busy_bar.setRange(0, 0)  # Indeterminata fino al primo avanzamento
+        self.busy_bar.setVisible(busy)
+
+    def set_progress(self, fraction):
+        """
+        Mostra l'avanzamento della costruzione della rete in corso.
+        :param fraction: Frazione completata (0.0 - 1.0).
+        """
+        self.busy_bar.setRange(0, 100)
+        self.busy_bar.setValue(int(fraction * 100))
+
     def set_details_html(self, html):
         """
         Imposta l'HTML dell'area dei dettagli.
@@ -164,14 +300,37 @@ class EmotionAppView(QMainWindow):
 
     def load_html_in_view(self, path):
         """
-        Carica l'HTML (della rete PyVis) nella QWebEngineView.
+        Carica l'HTML (della rete vis.js) nella QWebEngineView.
         :param path: Percorso del file HTML.
         """
+        self.network_ready = False
+        self._page_load_span = start_span("view.page_load")
         if isinstance(path, QUrl):
             self.web_view.setUrl(path)
         else:
             self.web_view.setUrl(QUrl.fromLocalFile(path))
 
+    def _on_load_finished(self, ok):
+        """
+        Segnala che la pagina della rete è pronta a ricevere aggiornamenti incrementali.
+        :param ok: True se il caricamento è andato a buon fine.
+        """
+        self.network_ready = ok
+        if self._page_load_span is not None:
+            self._page_load_span.end(ok=ok)
+            self._page_load_span = None
+
+    def apply_network_diff(self, diff):
+        """
+        Applica alla rete già caricata le modifiche calcolate dal controller
+        (nodi e archi da aggiungere, aggiornare o rimuovere), senza ricaricare la pagina.
+        :param diff: Dizionario prodotto da NetworkData.diff.
+        """
+        diff_span = start_span("view.apply_diff", nodes=len(diff["upsert_nodes"]), edges=len(diff["upsert_edges"]))
+        # La callback arriva quando la pagina ha applicato il diff
+        self.web_view.page().runJavaScript(f"window.applyNetworkDiff({to_js_literal(diff)});",
+                                           lambda _: diff_span.end())
+
 
     def get_search_text(self):
         """
@@ -189,50 +348,78 @@ class EmotionAppView(QMainWindow):
 
     def highlight_word_in_view(self, word):
         """
-        Esegue uno script JS per cercare e colorare il nodo corrispondente.
+        Esegue uno script JS per cercare, colorare e inquadrare i nodi corrispondenti,
+        usando l'indice di ricerca precalcolato nella pagina (esatta, prefisso, errori).
         :param word: Parola da evidenziare nella rete.
         """
         highlight_js = f"""
-        var found = false;
-        var target = '{word}'.toLowerCase();
-
-        // Controlliamo tutti i nodi
-        window.nodes.get().forEach(function(n) {{
-            if (n.id.toLowerCase() === target) {{
-                n.color = 'red';
-                window.nodes.update(n);
-                found = true;
-            }}
-        }});
-
-        if (!found) {{
+        if (window.searchNetwork({to_js_literal(word)}).length === 0) {{
             window.network.fit();
-            alert("La parola '{word}' non è presente nella rete corrente.");
         }}
         """
         # Esegue lo script JS nella pagina caricata
         self.web_view.page().runJavaScript(highlight_js)
 
-    def patch_html_for_javascript_globals(self, html_content: str) -> str:
+    def alert_word_not_found(self, word, suggestions=()):
         """
-        Inietta variabili globali nel file HTML per manipolare i nodi via JS.
-        Questo rende accessibili 'nodes', 'edges' e 'network' a livello globale.
-
-        :param html_content: Contenuto HTML originale.
-        :return: Contenuto HTML modificato.
+        Mostra un avviso se la parola cercata non è presente nella rete corrente.
+        :param word: Parola cercata.
+        :param suggestions: Emozioni del lessico legate alla parola, da suggerire.
         """
-        snippet_nodes = "var nodes = new vis.DataSet("
-        replace_nodes = "var nodes = new vis.DataSet(\nwindow.nodes = nodes;\n"
+        message = f"La parola '{word}' non è presente nella rete corrente."
+        if suggestions:
+            names = ", ".join(e.capitalize() for e in suggestions[:5])
+            message += f"<br><br>Prova a selezionare: {names}"
+        QMessageBox.information(self, "Info", message)
 
-        snippet_edges = "var edges = new vis.DataSet("
-        replace_edges = "var edges = new vis.DataSet(\nwindow.edges = edges;\n"
+    def get_path_endpoints(self):
+        """
+        Restituisce le parole di partenza e di arrivo del percorso e se pesare le relazioni.
+        :return: Tupla (partenza, arrivo, pesato), con le parole in minuscolo.
+        """
+        return (self.path_source_input.text().strip().lower(),
+                self.path_target_input.text().strip().lower(),
+                self.path_weighted_checkbox.isChecked())
 
-        snippet_network = "var network = new vis.Network("
-        replace_network = "var network = new vis.Network(\nwindow.network = network;\n"
+    def highlight_path(self, node_ids, edge_ids):
+        """
+        Evidenzia un percorso nella rete caricata e lo inquadra.
+        :param node_ids: Id dei nodi del percorso, in ordine.
+        :param edge_ids: Id degli archi del percorso, in ordine.
+        """
+        self.web_view.page().runJavaScript(
+            f"window.highlightPath({to_js_literal(node_ids)}, {to_js_literal(edge_ids)});")
 
-        new_html = html_content
-        new_html = new_html.replace(snippet_nodes, replace_nodes)
-        new_html = new_html.replace(snippet_edges, replace_edges)
-        new_html = new_html.replace(snippet_network, replace_network)
+    def alert_path_not_found(self, source, target):
+        """
+        Mostra un avviso se le due parole non sono collegate nel lessico.
+        :param source: Parola di partenza.
+        :param target: Parola di arrivo.
+        """
+        QMessageBox.information(self, "Info",
+                                f"Nessun percorso collega '{source}' e '{target}' nel lessico.")
 
-        return new_html
+    def show_emotions(self, emotions):
+        """
+        Mostra nella lista solo le emozioni indicate, nell'ordine della lista.
+        Il costo dipende dal numero di emozioni mostrate e selezionate, non dalla lista intera.
+        :param emotions: Emozioni da mostrare (in minuscolo), oppure None per mostrarle tutte.
+        """
+        ids = None
+        if emotions is not None:
+            index = self.model.index
+            ids = [i for i in map(index.id_of, emotions) if i is not None and index.is_emotion(i)]
+
+        # Il reset del modello azzera la selezione della vista: viene ripristinata dagli id
+        self._filtering = True
+        try:
+            self.emotion_filter.set_visible_ids(ids)
+            selection = QItemSelection()
+            for emotion_id in self._selected_ids:
+                row = self.emotion_filter.proxy_row(emotion_id)
+                if row is not None:
+                    proxy_index = self.emotion_filter.index(row)
+                    selection.select(proxy_index, proxy_index)
+            self.list_view.selectionModel().select(selection, QItemSelectionModel.Select)
+        finally:
+            self._filtering = False
@@ -0,0 +1,282 @@
+# network_html.py
+import json
+
+from model.network_builder import DEFAULT_OPTIONS, MAIN_COLOR
+
+
+"""
+Generazione in memoria della pagina HTML della rete.
+
+Il template viene suddiviso una sola volta, al caricamento del modulo, nei punti di
+iniezione fissi (nodi, archi, opzioni): ogni rendering è quindi un unico join di
+stringhe, senza passaggi su disco né sostituzioni sull'intera pagina.
+"""
+
+# Stile personalizzato per adattare la rete alla finestra
+CUSTOM_STYLE = """
+        <style>
+        html, body {
+            margin: 0;
+            padding: 0;
+            height: 100vh;
+            overflow: hidden;
+        }
+        #mynetwork {
+            width: 100% !important;
+            height: calc(100vh - 10px) !important;
+            background-color: white;
+            position: relative;
+        }
+        </style>
+"""
+
+_NODES = "@@NODES@@"
+_EDGES = "@@EDGES@@"
+_OPTIONS = "@@OPTIONS@@"
+
+_TEMPLATE = """<html>
+    <head>
+        <meta charset="utf-8">
+""" + CUSTOM_STYLE + """
+        <link rel="stylesheet" href="lib/vis-9.1.2/vis-network.css" />
+        <script src="lib/vis-9.1.2/vis-network.min.js"></script>
+        <script src="lib/bindings/utils.js"></script>
+    </head>
+
+    <body>
+        <div id="mynetwork"></div>
+
+        <script type="text/javascript">
+              // Nodi, archi e rete sono esposti come variabili globali (window.*)
+              // per poterli manipolare dalla vista tramite runJavaScript
+              var container = document.getElementById('mynetwork');
+              var nodes = new vis.DataSet(""" + _NODES + """);
+              var edges = new vis.DataSet(""" + _EDGES + """);
+              var options = """ + _OPTIONS + """;
+              var network = new vis.Network(container, {nodes: nodes, edges: edges}, options);
+
+              window.nodes = nodes;
+              window.edges = edges;
+              window.network = network;
+
+              // --- Livello di dettaglio ---
+              // Nelle reti grandi le foglie (nodi con un solo arco) sono raccolte nel nodo a cui
+              // sono collegate finché la vista non viene ingrandita oltre LOD_OPEN_SCALE
+              var LOD_NODE_THRESHOLD = 300;
+              var LOD_OPEN_SCALE = 1.2;
+              var clustered = false;
+
+              function openAllClusters() {
+                  network.body.nodeIndices.slice().forEach(function(id) {
+                      if (network.isCluster(id)) network.openCluster(id);
+                  });
+                  clustered = false;
+              }
+
+              function updateLevelOfDetail() {
+                  var detailed = nodes.length <= LOD_NODE_THRESHOLD || network.getScale() >= LOD_OPEN_SCALE;
+                  if (!detailed && !clustered) {
+                      network.clusterOutliers({
+                          clusterNodeProperties: {shape: 'dot', color: '""" + MAIN_COLOR + """', borderWidth: 3},
+                          processProperties: function(clusterOptions, childNodes) {
+                              clusterOptions.label = '+' + (childNodes.length - 1);
+                              return clusterOptions;
+                          }
+                      });
+                      clustered = true;
+                  } else if (detailed && clustered) {
+                      openAllClusters();
+                  }
+              }
+
+              // Applica un diff calcolato lato Python senza ricaricare la pagina:
+              // la simulazione fisica (se attiva) prosegue dallo stato corrente
+              window.applyNetworkDiff = function(diff) {
+                  if (clustered) openAllClusters();
+                  if (diff.options) network.setOptions(diff.options);
+                  edges.remove(diff.remove_edges);
+                  nodes.remove(diff.remove_nodes);
+                  nodes.update(diff.upsert_nodes);
+                  edges.update(diff.upsert_edges);
+                  updateLevelOfDetail();
+              };
+
+              // --- Indice di ricerca ---
+              // Mappa id normalizzato (minuscolo, senza accenti) -> id dei nodi e trie dei
+              // prefissi, costruiti una volta al caricamento e aggiornati con i DataSet
+              var MAX_RESULTS = 50;
+              var searchExact = new Map();
+              var searchTrie = {children: new Map(), ids: new Set()};
+              var highlighted = new Map();
+
+              function foldText(text) {
+                  return String(text).normalize('NFD').replace(/[\\u0300-\\u036f]/g, '').toLowerCase();
+              }
+
+              function indexNode(id) {
+                  var key = foldText(id);
+                  if (!searchExact.has(key)) searchExact.set(key, new Set());
+                  searchExact.get(key).add(id);
+                  var node = searchTrie;
+                  for (var i = 0; i < key.length; i++) {
+                      if (!node.children.has(key[i])) node.children.set(key[i], {children: new Map(), ids: new Set()});
+                      node = node.children.get(key[i]);
+                  }
+                  node.ids.add(id);
+              }
+
+              function unindexNode(id) {
+                  var key = foldText(id);
+                  if (searchExact.has(key)) searchExact.get(key).delete(id);
+                  var node = searchTrie;
+                  for (var i = 0; i < key.length && node; i++) node = node.children.get(key[i]);
+                  if (node) node.ids.delete(id);
+                  highlighted.delete(id);
+              }
+
+              function prefixSearch(query) {
+                  var node = searchTrie;
+                  for (var i = 0; i < query.length && node; i++) node = node.children.get(query[i]);
+                  var results = [];
+                  var stack = node ? [node] : [];
+                  while (stack.length && results.length < MAX_RESULTS) {
+                      var current = stack.pop();
+                      current.ids.forEach(function(id) { results.push(id); });
+                      current.children.forEach(function(child) { stack.push(child); });
+                  }
+                  return results.slice(0, MAX_RESULTS);
+              }
+
+              // Distanza di Levenshtein calcolata riga per riga lungo il trie,
+              // potando i rami che superano già la distanza massima
+              function fuzzySearch(query) {
+                  var maxDistance = query.length <= 5 ? 1 : 2;
+                  var scored = [];
+                  var firstRow = [];
+                  for (var i = 0; i <= query.length; i++) firstRow.push(i);
+
+                  function walk(node, ch, previousRow) {
+                      var row = [previousRow[0] + 1];
+                      for (var j = 1; j <= query.length; j++) {
+                          var cost = query[j - 1] === ch ? 0 : 1;
+                          row.push(Math.min(row[j - 1] + 1, previousRow[j] + 1, previousRow[j - 1] + cost));
+                      }
+                      var distance = row[query.length];
+                      if (distance <= maxDistance) {
+                          node.ids.forEach(function(id) { scored.push([distance, id]); });
+                      }
+                      if (Math.min.apply(null, row) <= maxDistance) {
+                          node.children.forEach(function(child, next) { walk(child, next, row); });
+                      }
+                  }
+                  searchTrie.children.forEach(function(child, ch) { walk(child, ch, firstRow); });
+                  scored.sort(function(a, b) { return a[0] - b[0]; });
+                  return scored.slice(0, MAX_RESULTS).map(function(item) { return item[1]; });
+              }
+
+              // Archi evidenziati da un percorso, con colore e spessore originali
+              var highlightedEdges = new Map();
+              var PATH_COLOR = 'red';
+              var PATH_WIDTH = 6;
+
+              function clearHighlight() {
+                  var restore = [];
+                  highlighted.forEach(function(color, id) { restore.push({id: id, color: color}); });
+                  highlighted.clear();
+                  nodes.update(restore);
+                  restore = [];
+                  highlightedEdges.forEach(function(style, id) {
+                      restore.push({id: id, color: style.color, width: style.width});
+                  });
+                  highlightedEdges.clear();
+                  edges.update(restore);
+              }
+
+              // Cerca una parola (esatta, poi per prefisso, poi con errori), evidenzia
+              // i nodi trovati e sposta la vista su di essi. Restituisce gli id trovati.
+              window.searchNetwork = function(text) {
+                  var query = foldText(text).trim();
+                  clearHighlight();
+                  if (!query) return [];
+                  var ids = searchExact.has(query) ? Array.from(searchExact.get(query)) : [];
+                  if (!ids.length) ids = prefixSearch(query);
+                  if (!ids.length) ids = fuzzySearch(query);
+                  if (!ids.length) return ids;
+
+                  if (clustered) openAllClusters();
+                  nodes.get(ids).forEach(function(n) { highlighted.set(n.id, n.color); });
+                  nodes.update(ids.map(function(id) { return {id: id, color: 'red'}; }));
+                  network.selectNodes(ids);
+                  if (ids.length === 1) {
+                      network.focus(ids[0], {scale: 1.5, animation: true});
+                  } else {
+                      network.fit({nodes: ids, animation: true});
+                  }
+                  return ids;
+              };
+
+              // Evidenzia un percorso (nodi e archi nell'ordine del cammino) e lo inquadra
+              window.highlightPath = function(nodeIds, edgeIds) {
+                  clearHighlight();
+                  if (clustered) openAllClusters();
+                  nodes.get(nodeIds).forEach(function(n) { highlighted.set(n.id, n.color); });
+                  edges.get(edgeIds).forEach(function(e) {
+                      highlightedEdges.set(e.id, {color: e.color, width: e.width});
+                  });
+                  nodes.update(nodeIds.map(function(id) { return {id: id, color: PATH_COLOR}; }));
+                  edges.update(edgeIds.map(function(id) { return {id: id, color: PATH_COLOR, width: PATH_WIDTH}; }));
+                  network.selectNodes(nodeIds);
+                  network.fit({nodes: nodeIds, animation: true});
+              };
+
+              nodes.getIds().forEach(indexNode);
+              nodes.on('add', function(event, properties) { properties.items.forEach(indexNode); });
+              nodes.on('remove', function(event, properties) { properties.items.forEach(unindexNode); });
+              edges.on('remove', function(event, properties) {
+                  properties.items.forEach(function(id) { highlightedEdges.delete(id); });
+              });
+
+              network.on('zoom', updateLevelOfDetail);
+              updateLevelOfDetail();
+        </script>
+    </body>
+</html>
+"""
+
+
+def _split_template(template):
+    """
+    Suddivide il template nei segmenti statici compresi tra i punti di iniezione.
+    """
+    head, rest = template.split(_NODES)
+    middle, rest = rest.split(_EDGES)
+    before_options, tail = rest.split(_OPTIONS)
+    return head, middle, before_options, tail
+
+
+_SEGMENTS = _split_template(_TEMPLATE)
+
+
+def to_js_literal(value) -> str:
+    """
+    Serializza un valore Python come letterale JSON sicuro da inserire in un tag <script>.
+    """
+    return json.dumps(value, ensure_ascii=False).replace("</", "<\\/")
+
+
+def render_network_html(nodes, edges, options=None) -> str:
+    """
+    Genera la pagina HTML completa della rete.
+
+    :param nodes: Lista dei nodi (dizionari nel formato di vis.js).
+    :param edges: Lista degli archi (dizionari nel formato di vis.js).
+    :param options: Opzioni di vis.js (di default DEFAULT_OPTIONS).
+    :return: Pagina HTML come stringa.
+    """
+    head, middle, before_options, tail = _SEGMENTS
+    return "".join((
+        head, to_js_literal(nodes),
+        middle, to_js_literal(edges),
+        before_options, to_js_literal(options if options is not None else DEFAULT_OPTIONS),
+        tail,
+    ))
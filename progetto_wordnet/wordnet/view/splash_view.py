@@ -3,7 +3,7 @@ import os
 from PyQt5.QtWidgets import (
     QMainWindow, QVBoxLayout, QWidget, QHBoxLayout,
     QPushButton, QLabel, QGraphicsDropShadowEffect, QFileDialog,
-    QMessageBox, QApplication
+    QMessageBox, QApplication, QProgressBar
 )
 from PyQt5.QtCore import Qt  # Per controllare flag delle finestre
 from PyQt5.QtGui import QIcon  # Per gestire le icone delle finestre
@@ -161,6 +161,15 @@ class SplashScreenView(QMainWindow):
         # Aggiunge i pulsanti al layout centrale
         central_layout.addLayout(buttons_layout)
 
+        # --- Barra di avanzamento del caricamento (visibile solo durante la lettura) ---
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setTextVisible(True)
+        self.progress_bar.setFormat("Caricamento WordNet... %p%")
+        self.progress_bar.setStyleSheet("font-size: 14px; color: white;")
+        self.progress_bar.hide()
+        central_layout.addWidget(self.progress_bar)
+
         # --- Composizione finale ---
         container = QWidget()
         container_layout = QVBoxLayout(container)
@@ -218,6 +227,23 @@ class SplashScreenView(QMainWindow):
         """
         self.controller.show_info()
 
+    # -------------------
+    # Avanzamento del caricamento
+    # -------------------
+    def show_progress(self, fraction):
+        """
+        Mostra l'avanzamento della lettura del file WordNet.
+        :param fraction: Frazione del file letta (0.0 - 1.0).
+        """
+        self.progress_bar.show()
+        self.progress_bar.setValue(int(fraction * 100))
+
+    def hide_progress(self):
+        """
+        Nasconde la barra di avanzamento al termine del caricamento.
+        """
+        self.progress_bar.hide()
+
     # -------------------
     # Metodi per mostrare messaggi modali
     # -------------------